@@ -0,0 +1,117 @@
+"""
+Benchmark: vectorized BatchEnv steps vs stepping one Session per world
+
+Drives N worlds with a scripted policy - roll a ball to a random size,
+carry it to one of a few drop spots, release - and reports env-steps per
+second (worlds x ticks), next to a single Session driven by BotInput.
+
+    python benchmarks/bench_batch.py --worlds 256 1024 4096 16384 --ticks 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.batch import BatchEnv
+from game.controls import BotInput
+from game.session import Session
+
+STEPS_PER_SECOND_TARGET = 100000  # Env-steps/s every batch size should reach
+
+class ScriptedPolicy:
+    """A BotInput-like policy computed for every world at once"""
+    def __init__(self, env, seed=0, drop_spots=4):
+        self.env = env
+        self.rng = np.random.default_rng(seed)
+        rolling, building = env.rolling_rects[0], env.building_rects[0]
+        self.rolling = rolling
+        # Few drop spots per zone, so carried balls often land in reach of each other
+        self.spots = self._points(building, drop_spots)
+        n = env.n
+        self.roll_x, self.roll_y = self._points(rolling, n).T
+        self.drop = self.rng.integers(0, drop_spots, n)
+        self.goal = self.rng.uniform(22, 60, n)
+        self.actions = np.zeros((n, 3), dtype=np.int64)
+
+    def _points(self, rect, count):
+        left, top, right, bottom = rect
+        return np.stack([self.rng.integers(left + 20, right - 20, count),
+                         self.rng.integers(top + 20, bottom - 20, count)], axis=1).astype(np.float64)
+
+    def __call__(self):
+        env = self.env
+        carrying = env.rolling & (env.rsize >= self.goal)
+        drop_x, drop_y = self.spots[self.drop].T
+        tx = np.where(carrying, drop_x, self.roll_x)
+        ty = np.where(carrying, drop_y, self.roll_y)
+        dx = (tx > env.px + 2).astype(np.int64) - (tx < env.px - 2)
+        dy = (ty > env.py + 2).astype(np.int64) - (ty < env.py - 2)
+        arrived = (dx == 0) & (dy == 0)
+
+        # Wander to a fresh spot while rolling; release on reaching the drop spot
+        wander = arrived & ~carrying
+        if wander.any():
+            self.roll_x[wander], self.roll_y[wander] = self._points(self.rolling, wander.sum()).T
+        release = arrived & carrying
+        if release.any():
+            self.drop[release] = self.rng.integers(0, len(self.spots), release.sum())
+            self.goal[release] = self.rng.uniform(22, 60, release.sum())
+        actions = self.actions
+        actions[:, 0] = dx
+        actions[:, 1] = dy
+        actions[:, 2] = ~release
+        return actions
+
+def bench_batch(worlds, ticks, seed=0):
+    """(env-steps per second, balls placed, snowmen completed) for a BatchEnv of worlds"""
+    env = BatchEnv(worlds, max_balls=64, max_ticks=10 ** 9)
+    policy = ScriptedPolicy(env, seed)
+    placed = completed = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        _, _, done, info = env.step(policy())
+        if done.any():
+            final = info['final_observation'][done]
+            placed += int(final[:, 4].sum())
+            completed += int(final[:, 6].sum())
+    elapsed = time.perf_counter() - start
+    placed += int(env.count.sum())
+    completed += int(env.completed.sum())
+    return worlds * ticks / elapsed, placed, completed
+
+def bench_session(ticks, seed=0):
+    """Steps per second of one Session with a BotInput player"""
+    session = Session()
+    player = session.add_player(0)
+    bot = BotInput(session.world, player.position, seed)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        session.step({0: bot.poll()})
+    return ticks / (time.perf_counter() - start)
+
+def bench(worlds=(256, 1024, 4096, 16384), ticks=2000, seed=0):
+    """{'session': steps/s, worlds: (env-steps/s, placed, completed)}"""
+    results = {'session': bench_session(ticks, seed)}
+    for count in worlds:
+        results[count] = bench_batch(count, ticks, seed)
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--worlds', type=int, nargs='+', default=[256, 1024, 4096, 16384])
+    parser.add_argument('--ticks', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args()
+    results = bench(options.worlds, options.ticks, options.seed)
+    session = results.pop('session')
+    print(f"Session + BotInput: {session:12,.0f} steps/s")
+    for worlds, (rate, placed, completed) in results.items():
+        print(f"BatchEnv x{worlds:<6}: {rate:12,.0f} env-steps/s ({rate / session:5.0f}x), "
+              f"{placed} balls placed, {completed} snowmen")
+    if any(rate < STEPS_PER_SECOND_TARGET for rate, _, _ in results.values()):
+        print(f"Below the target of {STEPS_PER_SECOND_TARGET:,} env-steps/s")
+        sys.exit(1)
@@ -0,0 +1,72 @@
+"""
+Benchmark: full repaint + flip against dirty-rect redraw + update
+
+    python benchmarks/bench_dirty_rects.py --balls 500 --frames 300
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+import main
+from game.snowman import Snowball
+
+def populate(balls, seed=0):
+    """Start a game with a number of placed balls in the building zone"""
+    rng = random.Random(seed)
+    main.init_game()
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.start_game()
+    zone = main.world.building_zone
+    for _ in range(balls):
+        ball = Snowball(rng.uniform(zone.left, zone.right), rng.uniform(zone.top, zone.bottom))
+        ball.size = rng.uniform(ball.min_size, ball.max_size)
+        main.add_placed_snowball(ball)
+
+def time_frames(frames, draw, motion):
+    """Average milliseconds per frame; motion moves the player every frame"""
+    start = time.perf_counter()
+    for frame in range(frames):
+        if motion:
+            main.player.move(1 if frame % 100 < 50 else -1, 0)
+        draw()
+    return (time.perf_counter() - start) * 1000 / frames
+
+def bench(balls=500, frames=300):
+    pygame.init()
+    screen = main.init_screen()
+    populate(balls)
+
+    def full():
+        main.draw_game(screen)
+        pygame.display.flip()
+
+    def dirty():
+        pygame.display.update(main.draw_game_dirty(screen))
+
+    results = {}
+    for motion in (False, True):
+        scene = 'moving' if motion else 'idle'
+        main.dirty_renderer.invalidate()
+        full_ms = time_frames(frames, full, motion)
+        main.dirty_renderer.invalidate()
+        dirty_ms = time_frames(frames, dirty, motion)
+        results[scene] = (full_ms, dirty_ms)
+        print(f"{scene:>6} scene, {balls} balls: full {full_ms:7.3f} ms/frame, "
+              f"dirty {dirty_ms:7.3f} ms/frame ({dirty_ms / full_ms:.0%} of full)")
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--balls', type=int, default=500)
+    parser.add_argument('--frames', type=int, default=300)
+    options = parser.parse_args()
+    bench(options.balls, options.frames)
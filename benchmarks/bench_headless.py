@@ -0,0 +1,53 @@
+"""
+Benchmark: simulation ticks/sec with and without rendering
+
+    python benchmarks/bench_headless.py --ticks 5000
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+import main
+from game.controls import BotInput
+from graphics.renderer import NullRenderer, ScreenRenderer
+
+def run(renderer, ticks, seed):
+    """Run a seeded bot for a number of ticks and return ticks/sec"""
+    main.init_game()
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.start_game()
+        controls = BotInput(main.world, main.player.position, seed)
+        start = time.perf_counter()
+        done = main.run_simulation(controls, renderer, ticks, keep_playing=True)
+        elapsed = time.perf_counter() - start
+    return done / elapsed, len(main.placed_snowballs)
+
+def bench(ticks=5000, seed=0):
+    """Compare the null renderer against drawing every tick"""
+    pygame.init()
+    screen = main.init_screen()
+    results = {}
+    for name, renderer in [
+        ('headless', NullRenderer()),
+        ('rendered', ScreenRenderer(screen, main.draw_screen)),
+    ]:
+        rate, balls = run(renderer, ticks, seed)
+        results[name] = rate
+        print(f"{name:>9}: {rate:10.0f} ticks/sec ({balls} balls placed)")
+    print(f"  speedup: {results['headless'] / results['rendered']:.1f}x")
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args()
+    bench(options.ticks, options.seed)
@@ -0,0 +1,92 @@
+"""
+Benchmark: loading a large level from the binary format vs its JSON form
+
+Generates a level with hundreds of thousands of balls and targets over a
+big world, then times opening the memory-mapped file, streaming in the
+regions around the spawn point, streaming in everything, and parsing the
+same level from JSON.
+
+    python benchmarks/bench_level.py --balls 300000 --targets 50000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pygame import Rect
+from game.level import Level, LevelFile, LevelStream, load_json, save_json
+from game.world import generate_world
+
+def make_level(balls=300000, targets=50000, width=50000, height=50000, seed=0):
+    """A generated world's zones with random balls, a third of them stacked"""
+    rng = random.Random(seed)
+    world = generate_world(width, height, seed)
+    level = Level(width, height)
+    for zone in world.zones:
+        level.add_zone(zone.kind, zone.rect)
+    while len(level.balls) < balls:
+        x, y = rng.uniform(0, width), rng.uniform(0, height)
+        below = level.add_ball(x, y, rng.uniform(45, 60))
+        if rng.random() < 0.33 and len(level.balls) < balls:
+            level.add_ball(x, y, rng.uniform(30, 40), below)
+    for _ in range(targets):
+        level.add_target(rng.uniform(0, width), rng.uniform(0, height), 60)
+    return level
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def bench(balls=300000, targets=50000, seed=0):
+    """Load timings in milliseconds, plus file sizes in bytes"""
+    level = make_level(balls, targets, seed=seed)
+    with tempfile.TemporaryDirectory() as directory:
+        binary = os.path.join(directory, 'level.ssl')
+        text = os.path.join(directory, 'level.json')
+        _, write_ms = timed(level.write, binary)
+        save_json(level, text)
+        results = {
+            'write_ms': write_ms,
+            'binary_bytes': os.path.getsize(binary),
+            'json_bytes': os.path.getsize(text),
+        }
+
+        level_file, results['open_ms'] = timed(LevelFile, binary)
+        _, results['zones_ms'] = timed(level_file.build_world)
+        stream = LevelStream(level_file)
+        view = Rect(0, 0, 800, 600)
+        view.center = (int(level_file.spawn[0]), int(level_file.spawn[1]))
+        (first, _), results['first_view_ms'] = timed(stream.load, view.inflate(2048, 2048))
+        results['first_view_balls'] = len(first)
+        (rest, _), results['stream_all_ms'] = timed(stream.load, Rect(0, 0, level_file.width, level_file.height))
+        results['all_balls'] = len(first) + len(rest)
+        stream.reset()
+        level_file.close()
+
+        _, results['json_ms'] = timed(load_json, text)
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--balls', type=int, default=300000)
+    parser.add_argument('--targets', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args()
+    r = bench(options.balls, options.targets, options.seed)
+    print(f"{r['all_balls']} balls, {options.targets} targets: "
+          f"{r['binary_bytes'] / 1e6:.1f} MB binary, {r['json_bytes'] / 1e6:.1f} MB JSON")
+    rows = [
+        ('write', r['write_ms'], ''),
+        ('open (mmap)', r['open_ms'], ''),
+        ('build zones', r['zones_ms'], ''),
+        ('first view', r['first_view_ms'], f" ({r['first_view_balls']} balls)"),
+        ('stream the rest', r['stream_all_ms'], ' (every ball as a Snowball)'),
+        ('parse JSON', r['json_ms'], ' (records only, no Snowballs)'),
+    ]
+    for name, ms, note in rows:
+        print(f"  {name:>15}: {ms:9.2f} ms{note}")
@@ -0,0 +1,71 @@
+"""
+Benchmark: multiplayer load test over localhost
+
+Starts a GameServer and dozens of bot clients in one event loop and
+reports the bytes each client receives per second and per tick, and the
+tick latency (input sent to the resulting snapshot received) percentiles.
+
+    python benchmarks/bench_multiplayer.py --clients 32 --ticks 300
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from net.client import bot_client
+from net.server import GameServer
+
+def percentile(values, fraction):
+    """The value below which fraction of values fall (nearest rank)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def load_test(clients=32, ticks=300, tick_rate=None, seed=0):
+    """Run clients bots for ticks snapshots each; returns the figures as a dict"""
+    server = await GameServer(tick_rate=tick_rate).start()
+    bots = [bot_client(server.host, server.port, seed + i) for i in range(clients)]
+    try:
+        for bot in bots:
+            await bot.connect()
+        start = time.perf_counter()
+        await asyncio.gather(*(bot.run(ticks) for bot in bots))
+        elapsed = time.perf_counter() - start
+    finally:
+        for bot in bots:
+            await bot.close()
+        await server.stop()
+    received = [bot.bytes_received for bot in bots]
+    latencies = [latency for bot in bots for latency in bot.latencies]
+    return {
+        'clients': clients,
+        'ticks': server.session.tick,
+        'ticks_per_sec': server.session.tick / elapsed,
+        'placed': server.session.store.count,
+        'bytes_per_client_per_sec': statistics.mean(received) / elapsed,
+        'bytes_per_client_per_tick': statistics.mean(received) / ticks,
+        'delta_fraction': sum(bot.deltas for bot in bots) / sum(bot.snapshots for bot in bots),
+        'latency_p50_ms': percentile(latencies, 0.50) * 1000,
+        'latency_p95_ms': percentile(latencies, 0.95) * 1000,
+        'latency_p99_ms': percentile(latencies, 0.99) * 1000,
+        'server_tick_ms': statistics.mean(server.tick_times) * 1000,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--ticks', type=int, default=300)
+    parser.add_argument('--tick-rate', type=int, default=None, help="Cap on ticks/sec (default: as fast as clients answer)")
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args()
+    results = asyncio.run(load_test(options.clients, options.ticks, options.tick_rate, options.seed))
+    print(f"{results['clients']} clients, {results['ticks']} ticks at {results['ticks_per_sec']:.0f} ticks/sec, "
+          f"{results['placed']} balls placed")
+    print(f"  bandwidth per client: {results['bytes_per_client_per_sec'] / 1024:8.1f} KiB/s, "
+          f"{results['bytes_per_client_per_tick']:6.0f} B/tick ({results['delta_fraction']:.0%} deltas)")
+    print(f"  tick latency: p50 {results['latency_p50_ms']:.2f} ms, "
+          f"p95 {results['latency_p95_ms']:.2f} ms, p99 {results['latency_p99_ms']:.2f} ms")
+    print(f"  server time per tick: {results['server_tick_ms']:.2f} ms")
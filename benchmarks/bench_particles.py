@@ -0,0 +1,61 @@
+"""
+Benchmark: updating and drawing a full budget of celebration particles
+
+Fills a particle system with falling snow and a confetti burst, then
+times update + draw per frame against the budget the celebration screen
+was designed for (a quarter of a 60 Hz frame).
+
+    python benchmarks/bench_particles.py --particles 5000 --frames 300
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from pygame import Rect
+from graphics.particles import ParticleSystem, emit_confetti, emit_snowfall
+
+FRAME_BUDGET_MS = 0.25 * 1000 / 60
+
+def celebration(particles=5000, seed=0):
+    """A full ParticleSystem: 60% snow spread over the screen, 40% confetti"""
+    rng = np.random.default_rng(seed)
+    system = ParticleSystem(capacity=particles)
+    snow = particles * 3 // 5
+    emit_snowfall(system, Rect(0, 0, 800, 600), snow, rng)
+    system.y[:snow] = rng.uniform(0, 600, snow)
+    emit_confetti(system, (400, 300), particles - snow, rng)
+    return system
+
+def bench(particles=5000, frames=300, seed=0):
+    """Milliseconds per frame of update + draw, and what the last frame drew"""
+    pygame.init()
+    surface = pygame.Surface((800, 600))
+    system = celebration(particles, seed)
+    drawn = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        system.update(1 / 60)
+        drawn = system.draw(surface)
+    return {
+        'frame_ms': (time.perf_counter() - start) * 1000 / frames,
+        'alive': len(system),
+        'drawn': drawn,
+        'dropped': system.dropped,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--particles', type=int, default=5000)
+    parser.add_argument('--frames', type=int, default=300)
+    options = parser.parse_args()
+    r = bench(options.particles, options.frames)
+    verdict = 'within' if r['frame_ms'] < FRAME_BUDGET_MS else 'OVER'
+    print(f"{r['alive']} particles ({r['drawn']} on screen): {r['frame_ms']:.3f} ms/frame, "
+          f"{verdict} the {FRAME_BUDGET_MS:.2f} ms budget")
+    sys.exit(0 if verdict == 'within' else 1)
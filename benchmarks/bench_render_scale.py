@@ -0,0 +1,73 @@
+"""
+Benchmark: frame time at lower internal render resolutions
+
+Draws the same busy game scene at several render scales and presents
+each frame on an 800x600 display, so the time saved drawing fewer pixels
+is weighed against the cost of scaling the frame up.
+
+    python benchmarks/bench_render_scale.py --balls 500 --frames 300 --scales 1 0.75 0.5
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+import main
+from bench_dirty_rects import populate
+from graphics.particles import emit_confetti
+from graphics.viewport import Viewport
+
+def time_frames(display, viewport, frames):
+    """Average milliseconds per frame spent drawing and spent scaling + presenting"""
+    main.viewport = viewport
+    draw = present = 0.0
+    for frame in range(frames):
+        main.player.move(1 if frame % 100 < 50 else -1, 0)
+        start = time.perf_counter()
+        main.draw_screen(viewport.target(display))
+        drawn = time.perf_counter()
+        viewport.present(display)
+        pygame.display.flip()
+        draw += drawn - start
+        present += time.perf_counter() - drawn
+    return draw * 1000 / frames, present * 1000 / frames
+
+def bench(balls=500, frames=300, scales=(1.0, 0.75, 0.5), smooth=False, confetti=True):
+    """{render scale: (draw ms, present ms) per frame} for a scene with balls placed (and confetti)"""
+    pygame.init()
+    display = main.init_screen()
+    populate(balls)
+    if confetti:
+        main.particles.clear()
+        emit_confetti(main.particles, main.player.position, main.CONFETTI_BURST, main.particle_rng)
+    state = main.particles.__dict__.copy()  # Every scale draws the same particles
+    logical = (main.WIDTH, main.HEIGHT)
+    results = {}
+    try:
+        for scale in scales:
+            main.particles.__dict__.update(state)
+            viewport = Viewport(logical, scale, display.get_size(), smooth)
+            time_frames(display, viewport, 10)  # Scale sprites and text once
+            results[scale] = time_frames(display, viewport, frames)
+    finally:
+        main.viewport = Viewport(logical)
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--balls', type=int, default=500)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--scales', type=float, nargs='+', default=[1.0, 0.75, 0.5])
+    parser.add_argument('--smooth', action='store_true', help='Present with smoothscale')
+    options = parser.parse_args()
+    results = bench(options.balls, options.frames, options.scales, options.smooth)
+    full = results.get(1.0)
+    for scale, (draw, present) in results.items():
+        width, height = round(main.WIDTH * scale), round(main.HEIGHT * scale)
+        note = f" ({(draw + present) / sum(full):.0%} of full)" if full else ''
+        print(f"render scale {scale:4.2f} ({width}x{height}): draw {draw:7.3f} ms + present {present:6.3f} ms{note}")
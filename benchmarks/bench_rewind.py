@@ -0,0 +1,65 @@
+"""
+Benchmark: cost of recording a rewind frame every tick
+
+Places a thousand balls flagged as rolling, so store.update() grows them
+all - the worst case, with every ball in every delta - then times
+store.update() plus RewindBuffer.record() per tick against the budget recording was
+designed for (a tenth of a 60 Hz frame).
+
+    python benchmarks/bench_rewind.py --balls 1000 --ticks 300
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from game.controls import BotInput
+from game.rewind import RewindBuffer
+from graphics.renderer import NullRenderer
+
+TICK_BUDGET_MS = 0.1 * 1000 / 60
+
+def populate(balls, seed=2):
+    """A short bot game plus balls put straight into the store, flagged rolling so they grow"""
+    main.init_game()
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.start_game()
+        bot = BotInput(main.world, main.player.position, seed)
+        main.run_simulation(bot, NullRenderer(), 100, keep_playing=True)
+    for i in range(balls):
+        ball = main.Snowball(400 + i % 400, i % 600)
+        ball.is_rolling = True
+        main.placed_snowballs.append(ball)
+        main.snowball_store.add(ball)
+
+def bench(balls=1000, ticks=300, seed=2):
+    """Milliseconds per tick of update + record, and the buffer that was filled"""
+    populate(balls, seed)
+    buffer = RewindBuffer()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        main.snowball_store.update()
+        buffer.record(main.player, main.snowball_store)
+    return {
+        'tick_ms': (time.perf_counter() - start) * 1000 / ticks,
+        'buffer': buffer,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--balls', type=int, default=1000)
+    parser.add_argument('--ticks', type=int, default=300)
+    options = parser.parse_args()
+    r = bench(options.balls, options.ticks)
+    verdict = 'within' if r['tick_ms'] < TICK_BUDGET_MS else 'OVER'
+    print(f"{options.balls} balls: {r['tick_ms']:.3f} ms/tick to update and record "
+          f"({r['buffer'].nbytes / 1024:.0f} KiB kept), {verdict} the {TICK_BUDGET_MS:.2f} ms budget")
+    main.init_game()
+    sys.exit(0 if verdict == 'within' else 1)
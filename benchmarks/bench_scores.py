@@ -0,0 +1,81 @@
+"""
+Benchmark: leaderboard query latency with many stored results
+
+Fills a fresh score database with random results spread over many
+players, then times the top-K, best-players and per-player rank queries.
+
+    python benchmarks/bench_scores.py --scores 2000000 --players 200000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.scoring import ScoreStore, SnowmanScore
+
+QUERY_BUDGET_MS = 5.0  # Median latency of any leaderboard query
+
+def fill(store, scores, players, seed=0, chunk=100000):
+    """Bulk-load random results; returns the player names"""
+    rng = random.Random(seed)
+    names = ['player%d' % i for i in range(players)]
+    for start in range(0, scores, chunk):
+        store.bulk_load([
+            SnowmanScore(rng.choice(names), rng.randint(20, 400), (58, 40, 22), None, 0.0)
+            for _ in range(min(chunk, scores - start))
+        ])
+    return names
+
+def time_query(query, arguments, repeat):
+    """Median and worst milliseconds of query(*args) over the given argument tuples"""
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        query(*arguments[i % len(arguments)])
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), max(times)
+
+def bench(scores=1000000, players=100000, repeat=200, path=None, seed=0):
+    """{query name: (median ms, worst ms)} over a database of scores results"""
+    directory = None
+    if path is None:
+        directory = tempfile.TemporaryDirectory()
+        path = os.path.join(directory.name, 'scores.sqlite')
+    store = ScoreStore(path)
+    try:
+        names = fill(store, scores, players, seed)
+        rng = random.Random(seed + 1)
+        sample = [(rng.choice(names),) for _ in range(repeat)]
+        return {
+            'top_10': time_query(store.top, [(10,)], repeat),
+            'top_100': time_query(store.top, [(100,)], repeat),
+            'top_players_10': time_query(store.top_players, [(10,)], repeat),
+            'player_rank': time_query(store.player_rank, sample, repeat),
+            'player_scores': time_query(store.player_scores, sample, repeat),
+        }
+    finally:
+        store.close()
+        if directory is not None:
+            directory.cleanup()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scores', type=int, default=1000000)
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--db', help='Database file to fill (default: a temporary one)')
+    options = parser.parse_args()
+    start = time.perf_counter()
+    results = bench(options.scores, options.players, options.repeat, options.db)
+    print(f"{options.scores} scores by {options.players} players ({time.perf_counter() - start:.1f}s total)")
+    for name, (median, worst) in results.items():
+        print(f"  {name:>15}: median {median:6.3f} ms, worst {worst:6.3f} ms")
+    slow = [name for name, (median, _) in results.items() if median >= QUERY_BUDGET_MS]
+    if slow:
+        print(f"Over the {QUERY_BUDGET_MS} ms budget: {', '.join(slow)}")
+    sys.exit(1 if slow else 0)
@@ -0,0 +1,61 @@
+"""
+Benchmark: snowball drawing with draw.circle against cached sprite blits
+
+    python benchmarks/bench_sprites.py --frames 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from graphics.sprites import SnowballSpriteCache, PLAIN, COMPLETE
+
+def make_balls(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        ((rng.randint(400, 800), rng.randint(0, 600)), rng.uniform(20, 60), rng.random() < 0.3)
+        for _ in range(count)
+    ]
+
+def draw_circles(screen, balls):
+    for center, size, complete in balls:
+        pygame.draw.circle(screen, (255, 255, 255), center, int(size))
+        pygame.draw.circle(screen, (0, 0, 0), center, int(size), 1)
+        if complete:
+            pygame.draw.circle(screen, (200, 255, 200), center, int(size) + 2, 1)
+
+def draw_sprites(screen, balls, cache):
+    blits = []
+    for center, size, complete in balls:
+        surface, offset = cache.get(size, COMPLETE if complete else PLAIN)
+        blits.append((surface, (center[0] - offset, center[1] - offset)))
+    screen.blits(blits, False)
+
+def bench(frames=50):
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    cache = SnowballSpriteCache()
+    cache.prewarm(20, 60)
+    for count in (10, 100, 1000, 10000):
+        balls = make_balls(count)
+        start = time.perf_counter()
+        for _ in range(frames):
+            draw_circles(screen, balls)
+        circles = (time.perf_counter() - start) * 1000 / frames
+        start = time.perf_counter()
+        for _ in range(frames):
+            draw_sprites(screen, balls, cache)
+        sprites = (time.perf_counter() - start) * 1000 / frames
+        print(f"{count:6} balls: draw.circle {circles:8.3f} ms/frame, "
+              f"sprites {sprites:8.3f} ms/frame ({circles / sprites:.1f}x)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', type=int, default=50)
+    options = parser.parse_args()
+    bench(options.frames)
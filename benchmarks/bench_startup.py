@@ -0,0 +1,116 @@
+"""
+Benchmark: startup cost, from `import main` to the first frame on screen
+
+Each measurement runs in a fresh interpreter. Import cost comes from
+`python -X importtime`, split into the game's own modules and the
+third-party libraries under them; time to first frame is the wall time
+from launching the process until the first frame has been presented.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+# Libraries whose import cost the game cannot change
+THIRD_PARTY = ('numpy', 'pygame')
+
+# Budgets in milliseconds, with headroom for slow machines
+IMPORT_BUDGET_MS = 1000  # Whole `import main`, libraries included
+OWN_IMPORT_BUDGET_MS = 200  # `import main` minus the THIRD_PARTY packages
+FIRST_FRAME_BUDGET_MS = 2000  # Process launch to first presented frame
+
+FIRST_FRAME_SCRIPT = """
+import pygame
+import main
+pygame.init()
+screen = main.init_screen()
+main.init_game()
+main.draw_screen(screen)
+pygame.display.flip()
+print('first frame', flush=True)
+"""
+
+def _env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = SRC + os.pathsep + env.get('PYTHONPATH', '')
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    env['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    return env
+
+def import_times(module='main'):
+    """{module name: (self ms, cumulative ms)} for one fresh `import module`"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        env=_env(), capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times.setdefault(name.strip(), (int(own) / 1000, int(cumulative) / 1000))
+    return times
+
+def import_cost(module='main'):
+    """(total ms, ms spent outside THIRD_PARTY) of importing module"""
+    times = import_times(module)
+    total = times[module][1]
+    libraries = sum(times[name][1] for name in THIRD_PARTY if name in times)
+    return total, total - libraries
+
+def time_to_first_frame():
+    """Milliseconds from launching the game's process to its first frame"""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-c', FIRST_FRAME_SCRIPT],
+        env=_env(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, errors = process.communicate()
+    if line.strip() != 'first frame':
+        raise RuntimeError('game did not draw a frame:\n' + errors)
+    return elapsed
+
+def measure(runs=3):
+    """Median startup figures over several fresh processes"""
+    imports = [import_cost() for _ in range(runs)]
+    return {
+        'import_ms': statistics.median(total for total, _ in imports),
+        'own_import_ms': statistics.median(own for _, own in imports),
+        'first_frame_ms': statistics.median(time_to_first_frame() for _ in range(runs)),
+    }
+
+def over_budget(results):
+    """(name, measured, budget) for every figure above its budget"""
+    budgets = {
+        'import_ms': IMPORT_BUDGET_MS,
+        'own_import_ms': OWN_IMPORT_BUDGET_MS,
+        'first_frame_ms': FIRST_FRAME_BUDGET_MS,
+    }
+    return [(name, results[name], budget) for name, budget in budgets.items() if results[name] > budget]
+
+def slowest_imports(module='main', count=10):
+    """The modules with the largest self time while importing module"""
+    times = import_times(module)
+    return sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:count]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    options = parser.parse_args()
+    results = measure(options.runs)
+    print(f"      import main: {results['import_ms']:7.1f} ms (budget {IMPORT_BUDGET_MS})")
+    print(f"  game code alone: {results['own_import_ms']:7.1f} ms (budget {OWN_IMPORT_BUDGET_MS})")
+    print(f"   to first frame: {results['first_frame_ms']:7.1f} ms (budget {FIRST_FRAME_BUDGET_MS})")
+    print("slowest modules (self ms):")
+    for name, (own, _) in slowest_imports():
+        print(f"  {own:7.1f}  {name}")
+    sys.exit(1 if over_budget(results) else 0)
@@ -0,0 +1,54 @@
+"""
+Benchmark: snow terrain at one pixel per tile
+
+Scoops snow under a large ball at a random spot every tick, lets the
+snow regenerate and repaints the changed pixels, and times each tick
+against the budget the terrain was designed for (a quarter of a 60 Hz
+frame).
+
+    python benchmarks/bench_terrain.py --ticks 600
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pygame import Rect
+from game.terrain import SnowTerrain
+from graphics.terrain import TerrainSurface
+
+TICK_BUDGET_MS = 0.25 * 1000 / 60
+SNOW_COLOR = (200, 255, 200)
+
+def bench(ticks=600, tile_size=1, radius=40, seed=0):
+    """Milliseconds per tick of collect + regenerate + repaint over a 400x600 zone"""
+    terrain = SnowTerrain(Rect(0, 0, 400, 600), tile_size=tile_size)
+    field = TerrainSurface(terrain, SNOW_COLOR)
+    rng = np.random.default_rng(seed)
+    collected = 0.0
+    repainted = 0
+    start = time.perf_counter()
+    for x, y in rng.uniform(50, 350, (ticks, 2)):
+        collected += terrain.collect((x, y), radius)
+        terrain.regenerate(1 / 60)
+        repainted += field.refresh() is not None
+    return {
+        'tick_ms': (time.perf_counter() - start) * 1000 / ticks,
+        'collected': collected,
+        'repainted': repainted,
+        'field': field,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--tile-size', type=int, default=1)
+    options = parser.parse_args()
+    r = bench(options.ticks, options.tile_size)
+    verdict = 'within' if r['tick_ms'] < TICK_BUDGET_MS else 'OVER'
+    print(f"{options.tile_size}px tiles: {r['tick_ms']:.3f} ms/tick, {verdict} the {TICK_BUDGET_MS:.2f} ms budget")
+    sys.exit(0 if verdict == 'within' else 1)
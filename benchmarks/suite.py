@@ -0,0 +1,209 @@
+"""
+Scaling benchmark suite for the game's hot paths
+
+Runs each case at several scales (placed balls / snowmen), stores the
+results as a JSON baseline and compares later runs against it:
+
+    python benchmarks/suite.py --save main
+    python benchmarks/suite.py --compare main --threshold 0.25
+    python benchmarks/suite.py --scales 10 100 1000 --cases draw_game
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+import main
+from game.controls import InputState
+from game.snowman import Snowball, Snowman
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+SCALES = (10, 100, 1000, 10000, 100000)
+
+class _SameInput:
+    """Input provider that repeats one InputState forever"""
+    def __init__(self, state):
+        self.state = state
+
+    def poll(self):
+        return self.state
+
+def build_scene(balls, seed=0):
+    """Fill main's game state with placed balls, a tenth of them in snowmen"""
+    rng = random.Random(seed)
+    main.init_game()
+    with contextlib.redirect_stdout(io.StringIO()):
+        main.start_game()
+    zone = main.world.building_zone
+    placed = []
+    for _ in range(balls):
+        ball = Snowball(rng.uniform(zone.left, zone.right), rng.uniform(zone.top, zone.bottom))
+        ball.size = rng.uniform(ball.min_size, ball.max_size)
+        placed.append(ball)
+    # Every tenth triple becomes a snowman (complete or not)
+    for i in range(0, balls - 2, 30):
+        base, middle, head = placed[i:i + 3]
+        base.size, middle.size, head.size = 58, 40, 22
+        snowman = Snowman(base)
+        snowman.add_ball(middle)
+        if rng.random() < 0.5:
+            snowman.add_ball(head)
+        main.snowmen.append(snowman)
+    for ball in placed:
+        main.add_placed_snowball(ball)
+    return placed
+
+def case_find_stackable(scale):
+    build_scene(scale)
+    probe = Snowball(600, 300)
+    probe.size = 30
+    return lambda: main.find_stackable_snowball(probe, main.placed_snowballs, main.snowmen, main.snowball_index)
+
+def case_snowball_update(scale):
+    """Per-object Snowball.update over every placed ball"""
+    balls = build_scene(scale)
+    main.snowball_store.clear()  # Plain objects, as before the array store
+    def run():
+        for ball in balls:
+            ball.update(ball.position)
+    return run
+
+def case_store_update(scale):
+    """One vectorized SnowballStore.update over every placed ball"""
+    build_scene(scale)
+    return main.snowball_store.update
+
+def case_can_stack_on(scale):
+    balls = build_scene(scale)
+    probe = Snowball(600, 300)
+    probe.size = 30
+    def run():
+        for ball in balls:
+            probe.can_stack_on(ball)
+    return run
+
+def case_snowman_add_ball(scale):
+    """Build scale snowmen from fresh balls"""
+    def run():
+        for i in range(scale):
+            base = Snowball(i, 300)
+            middle = Snowball(i, 240)
+            head = Snowball(i, 200)
+            base.size, middle.size = 50, 30
+            snowman = Snowman(base)
+            snowman.add_ball(middle)
+            snowman.add_ball(head)
+    return run
+
+def case_handle_input(scale):
+    """One tick with the player carrying a ball across the building zone"""
+    build_scene(scale)
+    main.player.position.update(600, 300)
+    main.player.rolling_snowball = Snowball(600, 300)
+    main.player.rolling_snowball.is_rolling = True
+    controls = _SameInput(InputState(roll=True))
+    return lambda: main.handle_input(controls)
+
+def case_draw_game(scale):
+    build_scene(scale)
+    screen = pygame.Surface((main.WIDTH, main.HEIGHT))
+    return lambda: main.draw_game(screen)
+
+CASES = {
+    'find_stackable': case_find_stackable,
+    'snowball_update': case_snowball_update,
+    'store_update': case_store_update,
+    'can_stack_on': case_can_stack_on,
+    'snowman_add_ball': case_snowman_add_ball,
+    'handle_input': case_handle_input,
+    'draw_game': case_draw_game,
+}
+
+def measure(fn, min_time=0.2, repeats=5):
+    """Median seconds per call over several timed batches"""
+    fn()  # Warm up caches
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeats or number >= 1 << 20:
+            break
+        number *= 2
+    times = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return statistics.median(times)
+
+def run_suite(cases=None, scales=SCALES, min_time=0.2):
+    """Run the chosen cases at every scale; returns the results dict"""
+    pygame.init()
+    main.init_screen()
+    results = {}
+    for name in cases or CASES:
+        results[name] = {}
+        for scale in scales:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fn = CASES[name](scale)
+                seconds = measure(fn, min_time)
+            results[name][str(scale)] = seconds
+            print(f"{name:>17} @ {scale:>6}: {seconds * 1e3:10.4f} ms")
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+def compare(current, baseline, threshold=0.25):
+    """Return [(case, scale, baseline_s, current_s, ratio)] slower than threshold"""
+    regressions = []
+    for name, scales in current['results'].items():
+        for scale, seconds in scales.items():
+            before = baseline['results'].get(name, {}).get(scale)
+            if before and seconds > before * (1 + threshold):
+                regressions.append((name, scale, before, seconds, seconds / before))
+    return regressions
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f'{name}.json')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), help='Cases to run (default: all)')
+    parser.add_argument('--scales', nargs='+', type=int, default=list(SCALES))
+    parser.add_argument('--min-time', type=float, default=0.2, help='Seconds to spend timing each point')
+    parser.add_argument('--save', metavar='NAME', help='Store results as benchmarks/baselines/NAME.json')
+    parser.add_argument('--compare', metavar='NAME', help='Compare against a stored baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown before flagging (0.25 = 25%%)')
+    options = parser.parse_args()
+
+    current = run_suite(options.cases, options.scales, options.min_time)
+    if options.save:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(options.save), 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline saved to {baseline_path(options.save)}")
+    if options.compare:
+        with open(baseline_path(options.compare)) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, options.threshold)
+        for name, scale, before, after, ratio in regressions:
+            print(f"REGRESSION {name} @ {scale}: {before * 1e3:.4f} ms -> {after * 1e3:.4f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {options.threshold:.0%}")
@@ -0,0 +1,125 @@
+"""
+Batch runner for agent sessions - runs many headless games across all cores.
+
+    python src/agent_runner.py --sessions 64 --ticks 20000 --report report.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+# Workers never need a real window
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main
+from game.controls import InputState, ScriptedInput, BotInput
+from graphics.renderer import NullRenderer
+
+def run_session(session):
+    """Run one agent session and return its result as a dict
+
+    session is a dict with 'ticks' plus either a 'seed' for the bot or a
+    'script' list of [dx, dy, roll] inputs. Unless 'keep_playing' is set
+    the session ends when the first snowman is completed.
+    """
+    ticks = session.get('ticks', 10000)
+    keep_playing = session.get('keep_playing', False)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        main.init_game()
+        main.start_game()
+        if session.get('script') is not None:
+            controls = ScriptedInput(InputState(dx, dy, bool(roll)) for dx, dy, roll in session['script'])
+        else:
+            controls = BotInput(main.world, main.player.position, session.get('seed'))
+
+        start = time.perf_counter()
+        done = 0
+        while done < ticks:
+            if not main.handle_input(controls):
+                break
+            done += 1
+            if main.get_game_state() == main.CELEBRATION:
+                if not keep_playing:
+                    break
+                main.set_game_state(main.PLAYING)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'session': session.get('name'),
+        'seed': session.get('seed'),
+        'ticks': done,
+        'balls_placed': len(main.placed_snowballs),
+        'snowmen_started': len(main.snowmen),
+        'snowmen_completed': sum(1 for snowman in main.snowmen if snowman.is_complete),
+        'final_state': main.get_game_state(),
+        'elapsed': elapsed,
+        'ticks_per_sec': done / elapsed if elapsed else 0.0,
+    }
+
+def run_batch(sessions, workers=None):
+    """Run sessions in a process pool and gather one report"""
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1:
+        results = [run_session(session) for session in sessions]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_session, sessions))
+    wall_time = time.perf_counter() - start
+    total_ticks = sum(result['ticks'] for result in results)
+    return {
+        'workers': workers,
+        'sessions': len(results),
+        'wall_time': wall_time,
+        'total_ticks': total_ticks,
+        'ticks_per_sec': total_ticks / wall_time if wall_time else 0.0,
+        'balls_placed': sum(result['balls_placed'] for result in results),
+        'snowmen_completed': sum(result['snowmen_completed'] for result in results),
+        'results': results,
+    }
+
+def build_sessions(count, ticks, seed_base=0, scripts=None, keep_playing=False):
+    """One session per seed, or one per script if scripts are given"""
+    if scripts:
+        return [
+            {'name': f'script-{i}', 'script': script, 'ticks': ticks, 'keep_playing': keep_playing}
+            for i, script in enumerate(scripts)
+        ]
+    return [
+        {'name': f'seed-{seed_base + i}', 'seed': seed_base + i, 'ticks': ticks, 'keep_playing': keep_playing}
+        for i in range(count)
+    ]
+
+def main_cli():
+    parser = argparse.ArgumentParser(description='Run many headless agent sessions in parallel')
+    parser.add_argument('--sessions', type=int, default=os.cpu_count() or 1, help='Number of seeded bot sessions')
+    parser.add_argument('--ticks', type=int, default=10000, help='Maximum ticks per session')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--seed-base', type=int, default=0, help='Seed of the first session')
+    parser.add_argument('--scripts', help='JSON file with a list of input scripts ([[dx, dy, roll], ...])')
+    parser.add_argument('--keep-playing', action='store_true', help='Keep building after a snowman is completed')
+    parser.add_argument('--report', help='Write the full report to this JSON file')
+    options = parser.parse_args()
+
+    scripts = None
+    if options.scripts:
+        with open(options.scripts) as f:
+            scripts = json.load(f)
+    sessions = build_sessions(options.sessions, options.ticks, options.seed_base, scripts, options.keep_playing)
+    report = run_batch(sessions, options.workers)
+
+    print(f"{report['sessions']} sessions on {report['workers']} workers in {report['wall_time']:.2f}s "
+          f"({report['ticks_per_sec']:.0f} ticks/sec total)")
+    print(f"{report['balls_placed']} balls placed, {report['snowmen_completed']} snowmen completed")
+    if options.report:
+        with open(options.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {options.report}")
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,13 @@
+"""
+Convert a level between the binary (.ssl) and human-editable JSON (.json) forms
+
+    python src/convert_level.py level.json level.ssl
+    python src/convert_level.py level.ssl level.json
+"""
+import sys
+from game.level import convert
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit(__doc__.strip())
+    convert(sys.argv[1], sys.argv[2])
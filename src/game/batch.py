@@ -0,0 +1,220 @@
+import numpy as np
+from pygame import Rect
+from game.scoring import score_stacks
+from game.world import World, ROLLING, BUILDING
+
+# Game rules, as in Player and Snowball
+SPEED = 5
+START_SIZE = 20
+MAX_SIZE = 60
+GROWING_SPEED = 0.2
+STACK_MARGIN = 1.2  # Snowball.can_stack_on allows 20% extra distance
+
+# Rewards
+STACK_REWARD = 1.0  # Per ball stacked; a finished snowman also earns its score
+
+OBS_FIELDS = ('x', 'y', 'rolling', 'size', 'placed', 'snowmen', 'completed', 'tick')
+
+class BatchEnv:
+    """N independent single-player worlds stepped together as arrays
+
+    A gym-style environment for training agents: step() takes one
+    (dx, dy, roll) action per world, the same as an InputState, and
+    returns observations, rewards and done flags as arrays. Each world
+    follows the rules of a one-player Session - move, start rolling in
+    the rolling zone, place in the building zone, stack on the same ball
+    find_stackable_snowball would pick - but every rule is one NumPy operation over all N worlds
+    instead of Python calls per ball.
+
+    Each world holds up to max_balls placed balls in row i of the ball
+    arrays, in placement order. A world is done after max_ticks or when
+    it is full, and is reset in place; the observation it finished with
+    is in info['final_observation'].
+    """
+    def __init__(self, n, world=None, max_balls=64, max_ticks=3600, tick_rate=60):
+        self.n = n
+        self.world = world or World(800, 600)
+        self.max_balls = max_balls
+        self.max_ticks = max_ticks
+        self.tick_rate = tick_rate
+        self.spawn = self.world.rect.center
+        self.rolling_rects = self._zone_rects(ROLLING)
+        self.building_rects = self._zone_rects(BUILDING)
+        # Zones looked up through chunks only exist at chunk keys >= 0
+        self.chunked_zones = not isinstance(self.world.rolling_zone, Rect)
+
+        # Per world
+        self.px = np.zeros(n)
+        self.py = np.zeros(n)
+        self.rolling = np.zeros(n, dtype=np.bool_)
+        self.rx = np.zeros(n)  # Rolling ball, which follows the player
+        self.ry = np.zeros(n)
+        self.rsize = np.zeros(n)
+        self.count = np.zeros(n, dtype=np.int64)  # Balls placed
+        self.snowmen = np.zeros(n, dtype=np.int64)  # Snowmen started
+        self.completed = np.zeros(n, dtype=np.int64)
+        self.tick = np.zeros(n, dtype=np.int64)
+        self.reward = np.zeros(n, dtype=np.float32)  # Summed up by step() and _place()
+
+        # Per placed ball, shape (n, max_balls)
+        shape = (n, max_balls)
+        self.x = np.zeros(shape)
+        self.y = np.zeros(shape)
+        self.size = np.zeros(shape)
+        self.below = np.full(shape, -1, dtype=np.int64)  # Slot of the ball below, -1 for none
+        self.height = np.zeros(shape, dtype=np.int8)  # 1 base, 2 middle, 3 head; 0 empty slot
+        self.covered = np.zeros(shape, dtype=np.bool_)  # Another ball rests on it
+        self.started = np.zeros(shape, dtype=np.int64)  # Middles: tick their snowman began
+        self.order = np.zeros(shape, dtype=np.int64)  # Middles: snowman creation order
+        self._next_order = 0
+        self._levels = None  # Flat indices of middles and heads, rebuilt after stacking
+        self.reset()
+
+    def _zone_rects(self, kind):
+        """(left, top, right, bottom) of every zone of kind, one row each"""
+        rects = [zone.rect for zone in self.world.zones if zone.kind == kind]
+        return np.array([(r.left, r.top, r.right, r.bottom) for r in rects], dtype=np.float64).reshape(-1, 4)
+
+    def _inside(self, rects, x, y):
+        """Which points are in any of rects, matching Rect.collidepoint
+
+        collidepoint truncates float coordinates toward zero, so -0.5 is
+        still inside a zone starting at 0.
+        """
+        tx = np.trunc(x)[:, None]
+        ty = np.trunc(y)[:, None]
+        inside = ((rects[:, 0] <= tx) & (tx < rects[:, 2]) & (rects[:, 1] <= ty) & (ty < rects[:, 3])).any(axis=1)
+        if self.chunked_zones:
+            inside &= (x >= 0) & (y >= 0)
+        return inside
+
+    def reset(self, worlds=None):
+        """Start the given worlds (a mask or indices; default all) afresh and return observations"""
+        if worlds is None:
+            worlds = slice(None)
+        self.px[worlds] = self.spawn[0]
+        self.py[worlds] = self.spawn[1]
+        self.rolling[worlds] = False
+        self.rsize[worlds] = 0
+        for array in (self.count, self.snowmen, self.completed, self.tick):
+            array[worlds] = 0
+        self.height[worlds] = 0
+        self.below[worlds] = -1
+        self.covered[worlds] = False
+        self._levels = None
+        return self.observe()
+
+    def observe(self):
+        """One row of OBS_FIELDS per world, as a new array"""
+        obs = np.empty((self.n, len(OBS_FIELDS)), dtype=np.float32)
+        for column, value in enumerate((self.px, self.py, self.rolling, self.rsize,
+                                        self.count, self.snowmen, self.completed, self.tick)):
+            obs[:, column] = value
+        return obs
+
+    def step(self, actions):
+        """Apply one (dx, dy, roll) row per world; returns (obs, reward, done, info)
+
+        The returned arrays are new on every call, so rollouts can keep
+        them. The order matches Session.step: move, then roll or place, then
+        the rolling ball follows the player and grows, then stacked balls
+        move onto their bases.
+        """
+        actions = np.asarray(actions)
+        roll = actions[:, 2] != 0
+        self.px += actions[:, 0] * SPEED
+        self.py += actions[:, 1] * SPEED
+        reward = self.reward
+        reward.fill(0)
+
+        # Player.start_rolling
+        start = roll & ~self.rolling
+        start &= self._inside(self.rolling_rects, self.px, self.py)
+        self.rolling |= start
+        self.rsize[start] = START_SIZE
+
+        # Player.place_snowball; the ball is still where it followed the player to last tick
+        place = ~roll & self.rolling
+        place &= self._inside(self.building_rects, self.px, self.py)
+        placing = np.flatnonzero(place)
+        if len(placing):
+            self._place(placing)
+            self.rolling[placing] = False
+
+        # Snowball.update for rolling balls
+        np.copyto(self.rx, self.px, where=self.rolling)
+        np.copyto(self.ry, self.py, where=self.rolling)
+        np.add(self.rsize, GROWING_SPEED, out=self.rsize, where=self.rolling & (self.rsize < MAX_SIZE))
+
+        # SnowballStore.update: stacked balls sit on their base
+        if self._levels is None:
+            self._levels = [np.flatnonzero(self.height == level) for level in (2, 3)]
+        x, y, size, below = self.x.reshape(-1), self.y.reshape(-1), self.size.reshape(-1), self.below.reshape(-1)
+        for slots in self._levels:
+            if len(slots):
+                under = slots - slots % self.max_balls + below[slots]
+                x[slots] = x[under]
+                y[slots] = y[under] - size[under] - size[slots]
+
+        self.tick += 1
+        done = (self.tick >= self.max_ticks) | (self.count >= self.max_balls)
+        info = {}
+        if done.any():
+            info['final_observation'] = self.observe()
+            self.reset(done)
+        return self.observe(), reward.copy(), done, info
+
+    def _place(self, worlds):
+        """Place each listed world's rolling ball, stacking it like stack_placed_ball"""
+        nx, ny, ns = self.rx[worlds, None], self.ry[worlds, None], self.rsize[worlds, None]
+        height = self.height[worlds]
+        size = self.size[worlds]
+        dx = self.x[worlds] - nx
+        dy = self.y[worlds] - ny
+        # Snowball.can_stack_on against every placed ball of the world at once
+        reach = (height > 0) & ~self.covered[worlds] & (ns < size)
+        reach &= np.sqrt(dx * dx + dy * dy) < (size + ns) * STACK_MARGIN
+
+        # Incomplete snowmen come first, oldest first; then the largest free ball
+        middles = reach & (height == 2)
+        bases = reach & (height == 1)
+        on_middle = middles.any(axis=1)
+        on_base = bases.any(axis=1)
+        oldest = np.where(middles, self.order[worlds], np.iinfo(np.int64).max).argmin(axis=1)
+        largest = np.where(bases, size, -1.0).argmax(axis=1)  # First of equals, i.e. placed earliest
+        target = np.where(on_middle, oldest, largest)
+        stacked = on_middle | on_base
+
+        slot = self.count[worlds]
+        self.x[worlds, slot] = nx[:, 0]
+        self.y[worlds, slot] = ny[:, 0]
+        self.size[worlds, slot] = ns[:, 0]
+        self.below[worlds, slot] = np.where(stacked, target, -1)
+        self.height[worlds, slot] = np.where(stacked, height[np.arange(len(worlds)), target] + 1, 1)
+        self.count[worlds] += 1
+        if not stacked.any():
+            return
+
+        self._levels = None
+        self.reward[worlds[stacked]] += STACK_REWARD
+        self.covered[worlds[stacked], target[stacked]] = True
+
+        # A ball on a base starts a snowman; numbered so older ones are tried first
+        new = np.flatnonzero(on_base & ~on_middle)
+        if len(new):
+            world = worlds[new]
+            self.order[world, slot[new]] = np.arange(self._next_order, self._next_order + len(new))
+            self._next_order += len(new)
+            self.started[world, slot[new]] = self.tick[world]
+            self.snowmen[world] += 1
+
+        # A ball on a middle finishes its snowman, which earns its score
+        done = np.flatnonzero(on_middle)
+        if len(done):
+            world = worlds[done]
+            middle = target[done]
+            base = self.below[world, middle]
+            sizes = np.stack([self.size[world, base], self.size[world, middle], ns[done, 0]], axis=1)
+            seconds = (self.tick[world] - self.started[world, middle]) / self.tick_rate
+            self.reward[world] += score_stacks(sizes, seconds)
+            self.completed[world] += 1
@@ -0,0 +1,104 @@
+import random
+import pygame
+from game.world import ROLLING, BUILDING
+
+class InputState:
+    """Player input for a single tick, independent of where it came from"""
+    def __init__(self, dx=0, dy=0, roll=False, quit=False, clicks=(), rewind=False):
+        self.dx = dx
+        self.dy = dy
+        self.roll = roll  # Space held: start/keep rolling a snowball
+        self.quit = quit
+        self.clicks = clicks  # Mouse-down positions this tick
+        self.rewind = rewind  # Step back in time this tick
+
+class KeyboardInput:
+    """Reads input from the real pygame event queue and keyboard"""
+    def poll(self):
+        """Return the InputState for this tick"""
+        quit = False
+        rewind = False
+        clicks = []
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                quit = True
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                clicks.append(event.pos)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                rewind = True
+        keys = pygame.key.get_pressed()
+        return InputState(
+            keys[pygame.K_RIGHT] - keys[pygame.K_LEFT],
+            keys[pygame.K_DOWN] - keys[pygame.K_UP],
+            bool(keys[pygame.K_SPACE]),
+            quit,
+            clicks,
+            rewind,
+        )
+
+class ScriptedInput:
+    """Replays a fixed sequence of InputStates, then quits"""
+    def __init__(self, states):
+        self.states = iter(states)
+
+    def poll(self):
+        """Return the next scripted InputState"""
+        return next(self.states, InputState(quit=True))
+
+class BotInput:
+    """A simple seeded bot that rolls snowballs and carries them to the building zone
+
+    Each trip picks a random rolling time, spent wandering the rolling
+    zone, and a random drop-off point, so balls of different sizes end up
+    close enough to stack now and then.
+    """
+    def __init__(self, world, player_position, seed=None):
+        self.world = world
+        self.position = player_position  # The bot steers the live player position
+        self.rng = random.Random(seed)
+        self._new_trip()
+
+    def _new_trip(self):
+        # On a large world, work the closest pair of zones
+        self.rolling = self.world.nearest_zone(ROLLING, self.position).rect
+        building = self.world.nearest_zone(BUILDING, self.position).rect
+        self.roll_spot = self._random_spot(self.rolling)
+        self.drop_spot = self._random_spot(building)
+        self.roll_ticks = self.rng.randint(0, 200)
+        self.phase = 'to_roll'
+
+    def _random_spot(self, rect):
+        return (
+            self.rng.randint(rect.left + 20, rect.right - 20),
+            self.rng.randint(rect.top + 20, rect.bottom - 20),
+        )
+
+    def _steer(self, target):
+        dx = (target[0] > self.position.x + 2) - (target[0] < self.position.x - 2)
+        dy = (target[1] > self.position.y + 2) - (target[1] < self.position.y - 2)
+        return dx, dy
+
+    def poll(self):
+        """Return the bot's InputState for this tick"""
+        if self.phase == 'to_roll':
+            dx, dy = self._steer(self.roll_spot)
+            if not self.world.rolling_zone.collidepoint(self.position):
+                return InputState(dx, dy)
+            if (dx, dy) == (0, 0):
+                self.phase = 'rolling'
+            return InputState(dx, dy)
+        if self.phase == 'rolling':
+            self.roll_ticks -= 1
+            if self.roll_ticks <= 0:
+                self.phase = 'to_drop'
+            # Keep wandering so the ball rolls over fresh snow
+            dx, dy = self._steer(self.roll_spot)
+            if (dx, dy) == (0, 0):
+                self.roll_spot = self._random_spot(self.rolling)
+                dx, dy = self._steer(self.roll_spot)
+            return InputState(dx, dy, roll=True)
+        dx, dy = self._steer(self.drop_spot)
+        if (dx, dy) == (0, 0):
+            self._new_trip()
+            return InputState()  # Release space in the building zone to place
+        return InputState(dx, dy, roll=True)
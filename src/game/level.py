@@ -0,0 +1,362 @@
+import json
+import mmap
+import struct
+import numpy as np
+from pygame import Rect
+from game.snowman import Snowball, Snowman
+from game.world import ChunkedWorld, ROLLING, BUILDING
+
+# Binary level files ('.ssl'): a fixed header, a table of regions, then the
+# zone, ball and target records as packed arrays and the zone labels. Balls
+# and targets are sorted by region, so one region's records are a single
+# contiguous slice that can be read straight out of a memory map.
+MAGIC = b'SSL1'
+VERSION = 1
+# Magic, version, reserved, width, height, region size, regions across, regions down,
+# spawn x, spawn y, zones, balls, targets, label bytes
+HEADER = struct.Struct('<4sHHIIIIIffIIII')
+
+REGION = np.dtype([
+    ('ball_start', '<u4'), ('ball_count', '<u4'),
+    ('target_start', '<u4'), ('target_count', '<u4'),
+])
+ZONE = np.dtype([
+    ('kind', '<u4'),
+    ('x', '<i4'), ('y', '<i4'), ('w', '<i4'), ('h', '<i4'),
+    ('label', '<i4'),  # Byte offset of the label, -1 for none
+    ('label_color', '<u4'),  # 0xRRGGBB
+])
+BALL = np.dtype([
+    ('x', '<f4'), ('y', '<f4'), ('size', '<f4'),
+    ('below', '<i4'),  # Index of the ball it is stacked on, -1 for none
+])
+# A spot where the level wants a snowman of the given number of balls
+TARGET = np.dtype([
+    ('x', '<f4'), ('y', '<f4'), ('radius', '<f4'),
+    ('height', '<u4'),
+])
+
+KIND_CODES = {ROLLING: 1, BUILDING: 2}
+KINDS = {code: kind for kind, code in KIND_CODES.items()}
+
+def _color_code(color):
+    return 0 if color is None else (color[0] << 16) | (color[1] << 8) | color[2]
+
+def _color(code):
+    return (code >> 16 & 255, code >> 8 & 255, code & 255)
+
+class Level:
+    """An editable level: zones, pre-placed snowballs and snowman targets
+
+    Built in code or from the JSON form, and saved with write(). Balls are
+    (x, y, size, on) where on is the index of the ball below, or None.
+    """
+    def __init__(self, width, height, region_size=1024, spawn=None):
+        self.width = width
+        self.height = height
+        self.region_size = region_size  # Side of a streaming region in pixels
+        self.spawn = spawn or (width // 2, height // 2)
+        self.zones = []  # (kind, Rect, label, label_color)
+        self.balls = []
+        self.targets = []  # (x, y, radius, height)
+        self._covered = set()  # Indices of balls with a ball on them
+
+    def add_zone(self, kind, rect, label=None, label_color=None):
+        if kind not in KIND_CODES:
+            raise ValueError("unknown zone kind %r" % (kind,))
+        self.zones.append((kind, Rect(rect), label, label_color))
+
+    def add_ball(self, x, y, size, on=None):
+        """Add a ball, stacked on the ball with index on if given; returns its index
+
+        Stacks follow the snowman rules: one ball on each ball, each
+        smaller than the one below, at most three high.
+        """
+        if on is not None:
+            index = len(self.balls)
+            if not 0 <= on < index:
+                raise ValueError("ball %d is stacked on unknown ball %r" % (index, on))
+            if size >= self.balls[on][2]:
+                raise ValueError("ball %d must be smaller than the ball it is stacked on" % index)
+            if on in self._covered:
+                raise ValueError("ball %d is stacked on ball %d, which already has a ball on it" % (index, on))
+            height = 2
+            below = self.balls[on][3]
+            while below is not None:
+                height += 1
+                below = self.balls[below][3]
+            if height > 3:
+                raise ValueError("ball %d would make a stack %d balls high" % (index, height))
+            self._covered.add(on)
+        self.balls.append((x, y, size, on))
+        return len(self.balls) - 1
+
+    def add_target(self, x, y, radius, height=3):
+        self.targets.append((x, y, radius, height))
+
+    def _regions(self):
+        return -(-self.width // self.region_size), -(-self.height // self.region_size)
+
+    def _region_of(self, x, y):
+        across, down = self._regions()
+        rx = np.clip((np.asarray(x) // self.region_size).astype(np.int64), 0, across - 1)
+        ry = np.clip((np.asarray(y) // self.region_size).astype(np.int64), 0, down - 1)
+        return ry * across + rx
+
+    def write(self, path):
+        """Save in the binary format read by LevelFile"""
+        across, down = self._regions()
+        count = across * down
+        regions = np.zeros(count, dtype=REGION)
+
+        balls = np.zeros(len(self.balls), dtype=BALL)
+        if self.balls:
+            records = np.array([(x, y, size, -1 if on is None else on) for x, y, size, on in self.balls],
+                               dtype=np.float64)
+            balls['x'], balls['y'], balls['size'] = records[:, 0], records[:, 1], records[:, 2]
+            balls['below'] = records[:, 3]
+        # A stacked ball lives in the region of the bottom of its stack
+        root = np.arange(len(balls))
+        stacked = balls['below'] >= 0
+        root[stacked] = balls['below'][stacked]
+        while True:
+            deeper = balls['below'][root] >= 0
+            if not deeper.any():
+                break
+            root[deeper] = balls['below'][root[deeper]]
+        balls, regions['ball_start'], regions['ball_count'] = self._by_region(
+            balls, self._region_of(balls['x'][root], balls['y'][root]), count)
+
+        targets = np.array(self.targets, dtype=TARGET) if self.targets else np.zeros(0, dtype=TARGET)
+        targets, regions['target_start'], regions['target_count'] = self._by_region(
+            targets, self._region_of(targets['x'], targets['y']), count)
+
+        zones = np.zeros(len(self.zones), dtype=ZONE)
+        labels = bytearray()
+        for i, (kind, rect, label, label_color) in enumerate(self.zones):
+            zones[i] = (KIND_CODES[kind], rect.x, rect.y, rect.w, rect.h, -1, _color_code(label_color))
+            if label:
+                zones['label'][i] = len(labels)
+                labels += label.encode() + b'\0'
+        labels += b'\0' * (-len(labels) % 4)
+
+        header = HEADER.pack(MAGIC, VERSION, 0, self.width, self.height, self.region_size, across, down,
+                             self.spawn[0], self.spawn[1], len(zones), len(balls), len(targets), len(labels))
+        with open(path, 'wb') as f:
+            for part in (header, regions.tobytes(), zones.tobytes(), balls.tobytes(), targets.tobytes(), labels):
+                f.write(part)
+
+    @staticmethod
+    def _by_region(records, region, count):
+        """records sorted by region, with each region's start and count"""
+        order = np.argsort(region, kind='stable')
+        records = records[order]
+        if 'below' in records.dtype.names:
+            # Point stacked balls at their base's new position
+            position = np.empty(len(order), dtype=np.int64)
+            position[order] = np.arange(len(order))
+            stacked = records['below'] >= 0
+            records['below'][stacked] = position[records['below'][stacked]]
+        counts = np.bincount(region, minlength=count)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        return records, starts, counts
+
+    def to_json(self):
+        """The human-editable form, as plain dicts and lists"""
+        zones = []
+        for kind, rect, label, label_color in self.zones:
+            zone = {'kind': kind, 'rect': [rect.x, rect.y, rect.w, rect.h]}
+            if label:
+                zone['label'] = label
+            if label_color is not None:
+                zone['label_color'] = list(label_color)
+            zones.append(zone)
+        balls = []
+        for x, y, size, on in self.balls:
+            ball = {'x': x, 'y': y, 'size': size}
+            if on is not None:
+                ball['on'] = on
+            balls.append(ball)
+        return {
+            'width': self.width, 'height': self.height,
+            'region_size': self.region_size, 'spawn': list(self.spawn),
+            'zones': zones, 'balls': balls,
+            'targets': [{'x': x, 'y': y, 'radius': radius, 'height': height}
+                        for x, y, radius, height in self.targets],
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        level = cls(data['width'], data['height'], data.get('region_size', 1024), data.get('spawn'))
+        for zone in data.get('zones', ()):
+            color = zone.get('label_color')
+            level.add_zone(zone['kind'], zone['rect'], zone.get('label'), tuple(color) if color else None)
+        for ball in data.get('balls', ()):
+            level.add_ball(ball['x'], ball['y'], ball['size'], ball.get('on'))
+        for target in data.get('targets', ()):
+            level.add_target(target['x'], target['y'], target['radius'], target.get('height', 3))
+        return level
+
+class LevelFile:
+    """A binary level opened with mmap
+
+    Opening only reads the header; the region table and the records are
+    NumPy views onto the mapped file, so nothing becomes a Python object
+    until a region is asked for.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except (ValueError, struct.error):
+            self._map.close()
+            raise
+
+    def _read_header(self):
+        if len(self._map) < HEADER.size:
+            raise ValueError("%s is not a level file" % self.path)
+        (magic, version, _, self.width, self.height, self.region_size, self.across, self.down,
+         spawn_x, spawn_y, zones, balls, targets, labels) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("%s is not a version %d level file" % (self.path, VERSION))
+        self.spawn = (spawn_x, spawn_y)
+        offset = HEADER.size
+        sections = []
+        for dtype, count in ((REGION, self.across * self.down), (ZONE, zones), (BALL, balls), (TARGET, targets)):
+            sections.append((dtype, count, offset))
+            offset += dtype.itemsize * count
+        if len(self._map) != offset + labels:
+            raise ValueError("%s is truncated or damaged" % self.path)
+        self.regions, self.zones, self.balls, self.targets = (
+            np.frombuffer(self._map, dtype=dtype, count=count, offset=start) for dtype, count, start in sections)
+        self._labels = offset
+
+    def close(self):
+        self.regions = self.zones = self.balls = self.targets = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # Region views handed out still use it; it goes when they do
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def label(self, offset):
+        if offset < 0:
+            return None
+        start = self._labels + offset
+        return self._map[start:self._map.find(b'\0', start)].decode()
+
+    def build_world(self, chunk_size=1024):
+        """A ChunkedWorld with this level's zones (balls are streamed separately)"""
+        world = ChunkedWorld(self.width, self.height, chunk_size)
+        for zone in self.zones.tolist():
+            kind, x, y, w, h, label, color = zone
+            label = self.label(label)
+            world.add_zone(KINDS[kind], (x, y, w, h), label=label, label_color=_color(color) if label else None)
+        return world
+
+    def regions_in(self, rect):
+        """Indices of the regions overlapping rect"""
+        area = Rect(rect).clip(Rect(0, 0, self.width, self.height))
+        if not area.w or not area.h:
+            return []
+        size = self.region_size
+        x0, y0 = area.left // size, area.top // size
+        x1, y1 = (area.right - 1) // size, (area.bottom - 1) // size
+        return [ry * self.across + rx for ry in range(y0, y1 + 1) for rx in range(x0, x1 + 1)]
+
+    def region_balls(self, region):
+        """View of the ball records of one region"""
+        start, count = self.regions['ball_start'][region], self.regions['ball_count'][region]
+        return self.balls[start:start + count]
+
+    def region_targets(self, region):
+        start, count = self.regions['target_start'][region], self.regions['target_count'][region]
+        return self.targets[start:start + count]
+
+    def to_level(self):
+        """Read everything back into an editable Level"""
+        level = Level(self.width, self.height, self.region_size, self.spawn)
+        for kind, x, y, w, h, label, color in self.zones.tolist():
+            label = self.label(label)
+            level.add_zone(KINDS[kind], (x, y, w, h), label, _color(color) if label else None)
+        for x, y, size, below in self.balls.tolist():
+            level.add_ball(x, y, size, None if below < 0 else below)
+        for x, y, radius, height in self.targets.tolist():
+            level.add_target(x, y, radius, height)
+        return level
+
+class LevelStream:
+    """Turns a LevelFile's regions into snowballs as the view reaches them
+
+    Each region is loaded at most once (until reset()); stacked balls are
+    rebuilt into Snowmen.
+    """
+    def __init__(self, level, pool=None):
+        self.level = level
+        self.pool = pool
+        self.loaded = set()  # Region indices already streamed in
+        self.targets = {}  # Region index -> TARGET records of loaded regions
+
+    def reset(self):
+        self.loaded.clear()
+        self.targets.clear()
+
+    def load(self, rect):
+        """Stream in the regions overlapping rect; returns (new balls, new snowmen)"""
+        balls = []
+        snowmen = []
+        for region in self.level.regions_in(rect):
+            if region in self.loaded:
+                continue
+            self.loaded.add(region)
+            self.targets[region] = self.level.region_targets(region)
+            records = self.level.region_balls(region)
+            start = int(self.level.regions['ball_start'][region])
+            self._load_balls(records.tolist(), start, balls, snowmen)
+        return balls, snowmen
+
+    def _load_balls(self, records, start, balls, snowmen):
+        first = len(balls)
+        for x, y, size, below in records:
+            if below >= 0:
+                base = balls[first + below - start]
+                x, y = base.position  # Stacked balls sit on their base
+            ball = self.pool.acquire(x, y) if self.pool is not None else Snowball(x, y)
+            ball.size = size
+            balls.append(ball)
+            if below < 0:
+                continue
+            snowman = base.snowman
+            if snowman is None and base.stacked_on is None:
+                snowman = Snowman(base)
+                snowmen.append(snowman)
+            if snowman is None or not snowman.add_ball(ball):
+                ball.stack_on(base)
+
+    def targets_in(self, rect):
+        """TARGET records of loaded regions overlapping rect"""
+        found = [self.targets[region] for region in self.level.regions_in(rect) if region in self.targets]
+        return np.concatenate(found) if found else np.zeros(0, dtype=TARGET)
+
+def save_json(level, path):
+    with open(path, 'w') as f:
+        json.dump(level.to_json(), f, indent=1)
+
+def load_json(path):
+    with open(path) as f:
+        return Level.from_json(json.load(f))
+
+def convert(source, target):
+    """Convert between the binary ('.ssl') and JSON ('.json') forms by file extension"""
+    if source.endswith('.json'):
+        load_json(source).write(target)
+    else:
+        with LevelFile(source) as level:
+            save_json(level.to_level(), target)
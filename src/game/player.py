@@ -1,37 +1,52 @@
-from pygame import Vector2, Surface, draw
+from pygame import Vector2
 from game.snowman import Snowball
-import pygame
+from graphics.sprites import player_sprite
 
 class Player:
+    __slots__ = ('position', 'previous_position', 'speed', 'rolling_snowball', 'surface')
+
     def __init__(self, x, y):
         self.position = Vector2(x, y)
+        self.previous_position = Vector2(x, y)  # Position at the previous tick
         self.speed = 5
         self.rolling_snowball = None
-        # Create a temporary circle for the player
-        self.surface = Surface((32, 32), pygame.SRCALPHA)
-        draw.circle(self.surface, (0, 0, 255), (16, 16), 16)  # Blue circle
+        self.surface = player_sprite()  # Shared, drawn once
         
     def move(self, dx, dy):
         """Move the player based on input"""
         self.position.x += dx * self.speed
         self.position.y += dy * self.speed
         
-    def draw(self, screen):
-        """Draw the player"""
-        rect = self.surface.get_rect(center=self.position)
+    def interpolated_position(self, alpha):
+        """Return the position between the previous and current tick"""
+        if alpha >= 1.0:
+            return self.position
+        return self.previous_position.lerp(self.position, alpha)
+        
+    def draw(self, screen, position=None):
+        """Draw the player, optionally at an interpolated position"""
+        if position is None:
+            position = self.position
+        rect = self.surface.get_rect(center=position)
         screen.blit(self.surface, rect)
         
-    def start_rolling(self, world):
-        """Start rolling a new snowball"""
+    def start_rolling(self, world, pool=None):
+        """Start rolling a new snowball, recycled from pool if given"""
         if self.rolling_snowball is None and world.rolling_zone.collidepoint(self.position):
-            self.rolling_snowball = Snowball(self.position.x, self.position.y)
+            x, y = self.position
+            self.rolling_snowball = pool.acquire(x, y) if pool is not None else Snowball(x, y)
             self.rolling_snowball.is_rolling = True
             
     def place_snowball(self, world):
-        """Try to place the snowball in the building zone"""
+        """Try to place the snowball in the building zone
+
+        A placed ball stops rolling, so it only grows again from snow
+        collected while carried.
+        """
         if (self.rolling_snowball and 
             world.building_zone.collidepoint(self.position)):
             placed_ball = self.rolling_snowball
+            placed_ball.is_rolling = False
             self.rolling_snowball = None
             return placed_ball
         return None
@@ -0,0 +1,39 @@
+from game.snowman import Snowball
+
+class SnowballPool:
+    """Free list of snowballs that are no longer in the world
+
+    acquire() hands out a recycled ball reset to its starting state (or a
+    new one when the list is empty), so placing and rewinding balls does
+    not keep allocating Snowballs and their Vector2s.
+    """
+    def __init__(self, max_free=1024):
+        self.max_free = max_free
+        self.free = []
+
+    def __len__(self):
+        return len(self.free)
+
+    def acquire(self, x, y):
+        """Return a fresh-looking snowball at (x, y)"""
+        if self.free:
+            ball = self.free.pop()
+            ball.reset(x, y)
+            return ball
+        return Snowball(x, y)
+
+    def release(self, ball):
+        """Take back a ball that has left the world"""
+        if ball._store is not None:
+            ball._store.remove(ball)
+        if ball.index is not None:
+            ball.index.untrack(ball)
+        # Drop links so released balls do not keep the old world alive
+        ball.stacked_by = None
+        ball.snowman = None
+        ball._stacked_on = None
+        if len(self.free) < self.max_free:
+            self.free.append(ball)
+
+    def clear(self):
+        self.free.clear()
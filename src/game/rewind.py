@@ -0,0 +1,251 @@
+from collections import deque
+import numpy as np
+from game.snowman import Snowball, Snowman
+
+# Per-ball arrays copied out of the SnowballStore
+BALL_FIELDS = ('x', 'y', 'size', 'is_rolling', 'stacked_on')
+
+class _Frame:
+    """One recorded tick: a full keyframe or a delta against the tick before"""
+    __slots__ = ('tick', 'keyframe', 'count', 'player', 'changed', 'values', 'snowmen', 'nbytes')
+
+    def __init__(self, tick, keyframe, count, player, changed, values, snowmen):
+        self.tick = tick
+        self.keyframe = keyframe
+        self.count = count  # Placed balls at this tick
+        self.player = player  # (x, y, rolling size or -1)
+        self.changed = changed  # Slots whose values are stored (None for keyframes)
+        self.values = values  # Field name -> array of stored values
+        self.snowmen = snowmen  # (k, 4) [base, middle, head, complete] slots, None if unchanged
+        self.nbytes = 64 + sum(array.nbytes for array in values.values())
+        if changed is not None:
+            self.nbytes += changed.nbytes
+        if snowmen is not None:
+            self.nbytes += snowmen.nbytes
+
+class RewindBuffer:
+    """Bounded history of world states for rewinding time
+
+    Every tick record() stores only what changed since the previous tick,
+    as slot indices plus new values read straight from the SnowballStore
+    arrays, with a full keyframe every keyframe_interval ticks. Whole
+    keyframe groups are dropped from the front once the history goes over
+    max_bytes, so memory stays fixed however long the game runs. The
+    newest group is always kept, even when it alone is over max_bytes,
+    so every recorded tick can be rebuilt from a keyframe.
+    """
+    def __init__(self, max_bytes=8 * 1024 * 1024, keyframe_interval=60):
+        self.max_bytes = max_bytes
+        self.keyframe_interval = keyframe_interval
+        self.frames = deque()
+        self.nbytes = 0
+        self.keyframes = 0  # Keyframes in frames
+        self.tick = 0
+        self._last = None  # Field name -> copy of the arrays at the last record
+        self._last_count = 0
+        self._snowmen = None  # Snowman slot rows at the last record
+        self._changed = None  # Scratch masks sized with _last
+        self._differs = None
+
+    def __len__(self):
+        return len(self.frames)
+
+    def clear(self):
+        self.frames.clear()
+        self.nbytes = 0
+        self.keyframes = 0
+        self._last = None
+        self._last_count = 0
+
+    @property
+    def oldest_tick(self):
+        return self.frames[0].tick if self.frames else None
+
+    def record(self, player, store):
+        """Record the state after the current tick"""
+        count = store.count
+        rolling = player.rolling_snowball if player else None
+        player_state = (
+            (player.position.x, player.position.y, rolling.size if rolling else -1.0)
+            if player else None
+        )
+        current = {name: getattr(store, name)[:count] for name in BALL_FIELDS}
+
+        old = self._last_count
+        keyframe = (
+            self._last is None
+            or not self.keyframes
+            or count < old
+            or self.tick % self.keyframe_interval == 0
+        )
+        # Snowmen only change when balls are added or restacked
+        relinked = (
+            self._last is None
+            or count != old
+            or np.not_equal(current['stacked_on'], self._last['stacked_on'][:old], out=self._differs[:old]).any()
+        )
+        if relinked:
+            self._snowmen = snowman_slots(store)
+
+        if keyframe:
+            values = {name: array.copy() for name, array in current.items()}
+            frame = _Frame(self.tick, True, count, player_state, None, values, self._snowmen)
+        else:
+            # Compare into scratch masks so only the delta itself is allocated
+            changed = self._changed[:count]
+            differs = self._differs[:old]
+            changed[:old] = False
+            for name in BALL_FIELDS:
+                np.not_equal(current[name][:old], self._last[name][:old], out=differs)
+                changed[:old] |= differs
+            changed[old:] = True
+            changed = np.flatnonzero(changed).astype(np.int32)
+            values = {name: array[changed] for name, array in current.items()}
+            frame = _Frame(self.tick, False, count, player_state, changed, values, self._snowmen if relinked else None)
+
+        self._remember(current, count)
+        self.frames.append(frame)
+        self.nbytes += frame.nbytes
+        self.keyframes += keyframe
+        self.tick += 1
+        self._evict()
+
+    def _remember(self, current, count):
+        if self._last is None or len(self._last['x']) < count:
+            capacity = max(64, count * 2)
+            self._last = {name: np.zeros(capacity, dtype=array.dtype) for name, array in current.items()}
+            self._changed = np.zeros(capacity, dtype=np.bool_)
+            self._differs = np.zeros(capacity, dtype=np.bool_)
+        for name, array in current.items():
+            self._last[name][:count] = array
+        self._last_count = count
+
+    def _evict(self):
+        """Drop the oldest keyframe group while over budget, never the newest"""
+        frames = self.frames
+        while self.nbytes > self.max_bytes and self.keyframes > 1:
+            self._drop(frames.popleft())
+            while not frames[0].keyframe:
+                self._drop(frames.popleft())
+
+    def _drop(self, frame):
+        self.nbytes -= frame.nbytes
+        self.keyframes -= frame.keyframe
+
+    def state_at(self, tick):
+        """Rebuild (count, player, arrays, snowmen) as recorded at tick"""
+        frames = self.frames
+        if not frames or tick < frames[0].tick or tick > frames[-1].tick:
+            return None
+        position = tick - frames[0].tick  # Ticks are recorded consecutively
+        start = position
+        while start > 0 and not frames[start].keyframe:
+            start -= 1
+        key = frames[start]
+        if not key.keyframe:
+            return None
+        arrays = {name: array.copy() for name, array in key.values.items()}
+        snowmen = key.snowmen
+        for i in range(start + 1, position + 1):
+            frame = frames[i]
+            if frame.count > len(arrays['x']):
+                for name, array in arrays.items():
+                    grown = np.zeros(frame.count, dtype=array.dtype)
+                    grown[:len(array)] = array
+                    arrays[name] = grown
+            for name, values in frame.values.items():
+                arrays[name][frame.changed] = values
+            if frame.snowmen is not None:
+                snowmen = frame.snowmen
+        frame = frames[position]
+        arrays = {name: array[:frame.count] for name, array in arrays.items()}
+        return frame.count, frame.player, arrays, snowmen
+
+    def rewind(self, ticks):
+        """Step back up to ticks ticks; returns the state or None
+
+        History after the restored tick is discarded, and recording
+        continues from there.
+        """
+        if not self.frames:
+            return None
+        target = max(self.frames[-1].tick - ticks, self.frames[0].tick)
+        state = self.state_at(target)
+        while self.frames and self.frames[-1].tick > target:
+            self._drop(self.frames.pop())
+        count, _, arrays, snowmen = state
+        self._remember(arrays, count)
+        self._snowmen = snowmen
+        self.tick = target + 1
+        return state
+
+def snowman_slots(store):
+    """Snowmen reachable from the store as [base, middle, head, complete] slot rows"""
+    rows = []
+    seen = set()
+    for ball in store.balls:
+        snowman = ball.snowman
+        if snowman is None or snowman.base is None or id(snowman) in seen:
+            continue
+        seen.add(id(snowman))
+        rows.append((
+            snowman.base._slot,
+            snowman.middle._slot if snowman.middle else -1,
+            snowman.head._slot if snowman.head else -1,
+            int(snowman.is_complete),
+        ))
+    return np.array(rows, dtype=np.int32).reshape(-1, 4)
+
+def restore(state, player, store, pool=None):
+    """Apply a state from RewindBuffer to the player and store
+
+    Balls placed after the restored tick are removed from the store.
+    A rolling ball that has to be dropped or brought back goes through
+    pool when one is given. Returns the rebuilt snowmen list.
+    """
+    count, player_state, arrays, snowmen = state
+    store.truncate(count)
+    balls = store.balls
+    for name, values in arrays.items():
+        getattr(store, name)[:count] = values
+    store._levels = None
+
+    # Rebuild object links from the slot array
+    for ball in balls:
+        ball._stacked_on = None
+        ball.stacked_by = None
+        ball.snowman = None
+    for slot in np.flatnonzero(arrays['stacked_on'] >= 0):
+        below = balls[arrays['stacked_on'][slot]]
+        balls[slot]._stacked_on = below
+        below.stacked_by = balls[slot]
+
+    rebuilt = []
+    for base, middle, head, complete in snowmen.tolist():
+        if base >= count:
+            continue
+        snowman = Snowman(balls[base])
+        if 0 <= middle < count:
+            snowman.middle = balls[middle]
+            snowman.middle.snowman = snowman
+        if 0 <= head < count:
+            snowman.head = balls[head]
+            snowman.head.snowman = snowman
+        snowman.is_complete = bool(complete) and snowman.head is not None
+        rebuilt.append(snowman)
+
+    if player is not None and player_state is not None:
+        x, y, rolling_size = player_state
+        player.position.update(x, y)
+        player.previous_position.update(x, y)
+        if rolling_size < 0:
+            if pool is not None and player.rolling_snowball is not None:
+                pool.release(player.rolling_snowball)
+            player.rolling_snowball = None
+        else:
+            if player.rolling_snowball is None:
+                player.rolling_snowball = pool.acquire(x, y) if pool is not None else Snowball(x, y)
+                player.rolling_snowball.is_rolling = True
+            player.rolling_snowball.position = (x, y)
+            player.rolling_snowball.size = rolling_size
+    return rebuilt
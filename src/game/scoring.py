@@ -0,0 +1,269 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+# Scoring
+IDEAL_RATIO = 0.7  # Each ball about this size relative to the one below it
+PAR_SECONDS = 30.0  # Snowmen built faster than this earn a time bonus
+TIME_BONUS = 2.0  # Points per second under par
+
+def default_score_path():
+    """Per-user location of the local score database"""
+    base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'snowball_snowman', 'scores.sqlite')
+
+def proportion(sizes):
+    """How close a stack is to the ideal shape, from 0 (poor) to 1 (ideal)"""
+    errors = [abs(upper / lower - IDEAL_RATIO) / IDEAL_RATIO for lower, upper in zip(sizes, sizes[1:])]
+    if not errors:
+        return 0.0
+    return max(0.0, 1.0 - sum(errors) / len(errors))
+
+def score_snowman(snowman, build_seconds=None):
+    """Points for a finished snowman
+
+    Bigger balls score more, a well-proportioned stack multiplies that by
+    up to 1.5, and a snowman finished under par earns a time bonus. A
+    build_seconds of None (start unknown, e.g. after a rewind) earns no
+    bonus.
+    """
+    sizes = [ball.size for ball in snowman.all_balls]
+    points = sum(sizes) * (0.5 + proportion(sizes))
+    if build_seconds is not None:
+        points += max(0.0, PAR_SECONDS - build_seconds) * TIME_BONUS
+    return int(round(points))
+
+def score_stacks(sizes, build_seconds):
+    """score_snowman for many finished snowmen at once
+
+    sizes is an array with one (base, middle, head) row per snowman and
+    build_seconds holds each one's build time; returns the points as an
+    array.
+    """
+    sizes = np.asarray(sizes, dtype=np.float64)
+    errors = np.abs(sizes[:, 1:] / sizes[:, :-1] - IDEAL_RATIO) / IDEAL_RATIO
+    shape = np.maximum(0.0, 1.0 - errors.mean(axis=1))
+    points = sizes.sum(axis=1) * (0.5 + shape)
+    points += np.maximum(0.0, PAR_SECONDS - np.asarray(build_seconds)) * TIME_BONUS
+    return np.rint(points)
+
+class SnowmanScore:
+    """One scored snowman, as stored"""
+    __slots__ = ('player', 'points', 'sizes', 'build_seconds', 'created')
+
+    def __init__(self, player, points, sizes, build_seconds=None, created=None):
+        self.player = player
+        self.points = points
+        self.sizes = tuple(sizes)  # Base, middle, head
+        self.build_seconds = build_seconds
+        self.created = time.time() if created is None else created
+
+    @classmethod
+    def of(cls, player, snowman, build_seconds=None):
+        """Score a finished snowman for player"""
+        sizes = [ball.size for ball in snowman.all_balls]
+        return cls(player, score_snowman(snowman, build_seconds), sizes, build_seconds)
+
+    def row(self):
+        base, middle, head = (self.sizes + (None, None, None))[:3]
+        return (self.player, self.points, base, middle, head, self.build_seconds, self.created)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    base REAL, middle REAL, head REAL,
+    build_seconds REAL,
+    created REAL NOT NULL
+);
+-- Top-K walks this index from the top; ties go to the earlier score
+CREATE INDEX IF NOT EXISTS scores_by_points ON scores (points DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_player ON scores (player, points DESC);
+
+-- Each player's best score, kept up to date as scores are written
+CREATE TABLE IF NOT EXISTS players (
+    player TEXT PRIMARY KEY,
+    best INTEGER NOT NULL,
+    scores INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_by_best ON players (best DESC, player);
+
+-- How many players have each best score. A rank sums the counts above a
+-- score, which touches one row per distinct score instead of every player.
+CREATE TABLE IF NOT EXISTS best_counts (
+    points INTEGER PRIMARY KEY,
+    players INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    started REAL NOT NULL,
+    ended REAL NOT NULL,
+    snowmen INTEGER NOT NULL,
+    points INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_player ON sessions (player, ended);
+"""
+
+class ScoreStore:
+    """Local SQLite leaderboard with writes batched on a background thread
+
+    submit() and record_session() only queue rows; the writer thread
+    commits whatever has queued up in one transaction, so the game loop
+    never waits on the disk. Queries run on a separate read connection
+    and, thanks to WAL mode, are not blocked by a write in progress.
+    """
+    def __init__(self, path, max_batch=512):
+        self.path = path
+        self.max_batch = max_batch  # Most rows committed in one transaction
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        setup = self._connect()
+        setup.executescript(SCHEMA)
+        setup.close()
+        self._reader = self._connect(check_same_thread=False)
+        self._read_lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.written = 0  # Rows committed so far
+        self.errors = []
+        self.thread = threading.Thread(target=self._run, name='score-writer', daemon=True)
+        self.thread.start()
+
+    def _connect(self, check_same_thread=True):
+        connection = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')  # WAL keeps this crash-safe
+        return connection
+
+    def submit(self, score):
+        """Queue a SnowmanScore to be written"""
+        self.queue.put(('score', score))
+
+    def record_session(self, player, started, ended, snowmen, points):
+        """Queue the result of one game session"""
+        self.queue.put(('session', (player, started, ended, snowmen, points)))
+
+    def _run(self):
+        writer = self._connect()  # SQLite connections stay on the thread that made them
+        while True:
+            items = [self.queue.get()]
+            # Take whatever else is already waiting into the same transaction
+            while len(items) < self.max_batch:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = any(item is None for item in items)
+            try:
+                self._write(writer, [item for item in items if item is not None])
+            except sqlite3.Error as e:
+                self.errors.append(str(e))
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+            if closing:
+                writer.close()
+                return
+
+    def _write(self, writer, items):
+        scores = [item for kind, item in items if kind == 'score']
+        sessions = [item for kind, item in items if kind == 'session']
+        with writer:  # One transaction
+            if scores:
+                self._insert_scores(writer, [score.row() for score in scores])
+            if sessions:
+                writer.executemany(
+                    'INSERT INTO sessions (player, started, ended, snowmen, points) VALUES (?, ?, ?, ?, ?)',
+                    sessions)
+        self.written += len(items)
+
+    @staticmethod
+    def _insert_scores(connection, rows):
+        connection.executemany(
+            'INSERT INTO scores (player, points, base, middle, head, build_seconds, created) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+        # New bests per player in this batch
+        best = {}
+        counts = {}
+        for row in rows:
+            player, points = row[0], row[1]
+            best[player] = max(points, best.get(player, points))
+            counts[player] = counts.get(player, 0) + 1
+        old = dict(connection.execute(
+            'SELECT player, best FROM players WHERE player IN (SELECT value FROM json_each(?))',
+            (json.dumps(list(best)),)))
+        moved = {}  # Best score -> change in the number of players holding it
+        for player, points in best.items():
+            previous = old.get(player)
+            if previous is None or points > previous:
+                if previous is not None:
+                    moved[previous] = moved.get(previous, 0) - 1
+                moved[points] = moved.get(points, 0) + 1
+        connection.executemany(
+            'INSERT INTO players (player, best, scores) VALUES (?, ?, ?) '
+            'ON CONFLICT (player) DO UPDATE SET best = max(best, excluded.best), scores = scores + excluded.scores',
+            [(player, points, counts[player]) for player, points in best.items()])
+        connection.executemany(
+            'INSERT INTO best_counts (points, players) VALUES (?, ?) '
+            'ON CONFLICT (points) DO UPDATE SET players = players + excluded.players',
+            list(moved.items()))
+        connection.execute('DELETE FROM best_counts WHERE players <= 0')
+
+    def bulk_load(self, scores):
+        """Write many SnowmanScores at once, bypassing the queue (imports, benchmarks)"""
+        self.flush()
+        connection = self._connect()
+        try:
+            with connection:
+                self._insert_scores(connection, [score.row() for score in scores])
+        finally:
+            connection.close()
+
+    def flush(self):
+        """Wait until every queued row is committed"""
+        self.queue.join()
+
+    def close(self):
+        """Commit what is queued and stop the writer"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self._reader.close()
+
+    def _query(self, sql, parameters=()):
+        with self._read_lock:
+            return self._reader.execute(sql, parameters).fetchall()
+
+    def top(self, k=10):
+        """The k best scores as (player, points, created), best first"""
+        return self._query('SELECT player, points, created FROM scores ORDER BY points DESC, id LIMIT ?', (k,))
+
+    def top_players(self, k=10):
+        """The k players with the best personal bests, as (player, best)"""
+        return self._query('SELECT player, best FROM players ORDER BY best DESC, player LIMIT ?', (k,))
+
+    def player_best(self, player):
+        rows = self._query('SELECT best FROM players WHERE player = ?', (player,))
+        return rows[0][0] if rows else None
+
+    def player_rank(self, player):
+        """(rank, best) of player among all players by best score, or None
+
+        Players sharing a best score share its rank.
+        """
+        best = self.player_best(player)
+        if best is None:
+            return None
+        above = self._query('SELECT coalesce(sum(players), 0) FROM best_counts WHERE points > ?', (best,))[0][0]
+        return above + 1, best
+
+    def player_scores(self, player, k=10):
+        """A player's k best scores as (points, created)"""
+        return self._query(
+            'SELECT points, created FROM scores WHERE player = ? ORDER BY points DESC LIMIT ?', (player, k))
@@ -0,0 +1,76 @@
+import numpy as np
+from game.player import Player
+from game.pool import SnowballPool
+from game.spatial import SnowballIndex
+from game.stacking import stack_placed_ball
+from game.store import SnowballStore
+from game.world import World
+
+class Session:
+    """Game state shared by several players in one world
+
+    The single-player game keeps this state in main's globals; a Session
+    owns it instead so a server can step every player's input in the same
+    tick. Placed balls are never removed, so a ball's slot in the store
+    is also its placement number and a stable id for snapshots.
+    """
+    def __init__(self, world=None):
+        self.world = world or World(800, 600)
+        self.spawn = self.world.rect.center
+        self.players = {}  # Player id -> Player
+        self.placed = []
+        self.snowmen = []
+        self.store = SnowballStore()
+        self.index = SnowballIndex()
+        self.pool = SnowballPool()
+        self.complete = np.zeros(256, dtype=np.bool_)  # Slot -> part of a finished snowman
+        self.tick = 0
+        self.completed = 0  # Snowmen finished so far
+
+    def add_player(self, player_id):
+        player = self.players[player_id] = Player(*self.spawn)
+        return player
+
+    def remove_player(self, player_id):
+        player = self.players.pop(player_id, None)
+        if player is not None and player.rolling_snowball is not None:
+            self.pool.release(player.rolling_snowball)
+
+    def step(self, inputs):
+        """Advance one tick; inputs maps player id to that player's InputState
+
+        Players are handled in id order so every run of the same inputs
+        gives the same world.
+        """
+        for player_id in sorted(self.players):
+            state = inputs.get(player_id)
+            if state is not None:
+                self._apply(self.players[player_id], state)
+        for player in self.players.values():
+            if player.rolling_snowball:
+                player.rolling_snowball.update(player.position)
+        self.store.update()
+        self.tick += 1
+
+    def _apply(self, player, state):
+        player.previous_position.update(player.position)
+        player.move(state.dx, state.dy)
+        if state.roll:
+            player.start_rolling(self.world, self.pool)
+        elif player.rolling_snowball:
+            placed = player.place_snowball(self.world)
+            if placed:
+                _, snowman = stack_placed_ball(placed, self.placed, self.snowmen, self.index)
+                self._add(placed)
+                if snowman and snowman.is_complete:
+                    self.completed += 1
+                    for ball in snowman.all_balls:
+                        self.complete[ball._slot] = True
+
+    def _add(self, ball):
+        self.placed.append(ball)
+        self.world.add_ball(ball, ball.stacked_on)
+        slot = self.store.add(ball)
+        if slot >= len(self.complete):
+            self.complete = np.concatenate([self.complete, np.zeros_like(self.complete)])
+        self.index.track(ball)
@@ -1,8 +1,82 @@
 from pygame import Vector2
 
+class _StoreField:
+    """Snowball attribute that lives in a SnowballStore array once placed"""
+    def __init__(self, relinks=False):
+        self.relinks = relinks  # Changing it regroups the store's stacking levels
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.local = '_' + name
+
+    def __get__(self, ball, owner=None):
+        if ball is None:
+            return self
+        if ball._store is None:
+            return getattr(ball, self.local)
+        return getattr(ball._store, self.name)[ball._slot].item()
+
+    def __set__(self, ball, value):
+        if ball._store is None:
+            setattr(ball, self.local, value)
+        else:
+            getattr(ball._store, self.name)[ball._slot] = value
+            if self.relinks:
+                ball._store._levels = None
+
+class _StoredPosition(Vector2):
+    """Centre of a stored ball, read when asked for; changes to it are written back
+
+    Moving it in place (position.x += 1, update(), +=, rotate_ip() ...)
+    moves the ball, as it did when position was a plain Vector2. Vectors
+    computed from it (position + offset) share the type but belong to no ball.
+    """
+    __slots__ = ('_ball',)
+
+    def __setattr__(self, name, value):
+        Vector2.__setattr__(self, name, value)  # x, y and swizzles like xy
+        self._write()
+
+    def _write(self):
+        ball = getattr(self, '_ball', None)
+        if ball is not None:
+            ball.position = self
+
+def _writes_back(name):
+    method = getattr(Vector2, name)
+    def write_back(self, *args):
+        result = method(self, *args)
+        self._write()
+        return result
+    write_back.__name__ = name
+    return write_back
+
+for _name in ('__setitem__', '__iadd__', '__isub__', '__imul__', '__itruediv__', '__ifloordiv__',
+              'update', 'from_polar', 'scale_to_length', 'normalize_ip', 'clamp_magnitude_ip',
+              'move_towards_ip', 'reflect_ip', 'rotate_ip', 'rotate_rad_ip'):
+    setattr(_StoredPosition, _name, _writes_back(_name))
+
 class Snowball:
+    __slots__ = (
+        '_store', '_slot', '_position', '_stacked_on',
+        '_size', '_max_size', '_growing_speed', '_is_rolling',
+        'min_size', 'stacked_by', 'index', 'snowman',
+    )
+    size = _StoreField()
+    max_size = _StoreField()
+    growing_speed = _StoreField()
+    is_rolling = _StoreField(relinks=True)  # Rolling balls are not moved onto their base
+
     def __init__(self, x, y):
-        self.position = Vector2(x, y)
+        self._position = Vector2(x, y)
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Put a detached ball back in its just-created state at (x, y)"""
+        self._store = None  # SnowballStore holding this ball's state, if any
+        self._slot = -1
+        self._position.update(x, y)
+        self._stacked_on = None
         self.size = 20  # Starting size in pixels
         self.min_size = 20
         self.max_size = 60
@@ -10,23 +84,89 @@ class Snowball:
         self.is_rolling = False
         self.stacked_on = None  # Reference to snowball below this one
         self.stacked_by = None  # Reference to snowball above this one
+        self.index = None  # SnowballIndex tracking this ball, if placed
+        self.snowman = None  # Snowman this ball belongs to, if any
+
+    @property
+    def position(self):
+        """Centre of the ball
+
+        For a ball in a SnowballStore this is a vector read from the stored
+        coordinates that writes any change made to it back to the store.
+        """
+        if self._store is None:
+            return self._position
+        position = _StoredPosition(self._store.x[self._slot], self._store.y[self._slot])
+        Vector2.__setattr__(position, '_ball', self)
+        return position
+
+    @position.setter
+    def position(self, value):
+        if self._store is None:
+            self._position.update(value)
+        else:
+            self._store.x[self._slot] = value[0]
+            self._store.y[self._slot] = value[1]
+
+    @property
+    def stacked_on(self):
+        return self._stacked_on
+
+    @stacked_on.setter
+    def stacked_on(self, ball):
+        self._stacked_on = ball
+        if self._store is not None:
+            self._store._relink(self)
+
+    def _attach(self, store, slot):
+        """Called by SnowballStore.add once the state is copied in"""
+        self._store = store
+        self._slot = slot
+
+    def _detach(self):
+        """Called by SnowballStore.remove; copy the state back onto the object"""
+        store = self._store
+        slot = self._slot
+        self._position.update(store.x[slot], store.y[slot])
+        self._size = store.size[slot].item()
+        self._max_size = store.max_size[slot].item()
+        self._growing_speed = store.growing_speed[slot].item()
+        self._is_rolling = store.is_rolling[slot].item()
+        self._store = None
+        self._slot = -1
         
-    def grow(self):
-        """Increase snowball size while rolling"""
+    def grow(self, amount=None):
+        """Increase snowball size while rolling
+
+        amount defaults to growing_speed; pass the growth from snow
+        actually collected to tie it to the ground.
+        """
         if self.is_rolling and self.size < self.max_size:
-            self.size += self.growing_speed
+            self.size += self.growing_speed if amount is None else amount
     
-    def update(self, player_pos):
-        """Update snowball position to follow player"""
+    def update(self, player_pos, growth=None):
+        """Update snowball position to follow player, growing by growth if rolling"""
         if self.is_rolling:
-            self.position = Vector2(player_pos)
-            self.grow()
+            self.position = player_pos  # Copied in place, not aliased
+            self.grow(growth)
         elif self.stacked_on:
             # Update position to stay on top of the snowball below
-            self.position = Vector2(
-                self.stacked_on.position.x,
-                self.stacked_on.position.y - self.stacked_on.size - self.size
-            )
+            below = self.stacked_on
+            x, y = below._xy()
+            self._move_to(x, y - below.size - self.size)
+
+    def _xy(self):
+        """Centre as plain floats, without building a Vector2"""
+        if self._store is None:
+            return self._position.x, self._position.y
+        return self._store.x[self._slot].item(), self._store.y[self._slot].item()
+
+    def _move_to(self, x, y):
+        if self._store is None:
+            self._position.update(x, y)
+        else:
+            self._store.x[self._slot] = x
+            self._store.y[self._slot] = y
     
     def can_stack_on(self, other_ball):
         """Check if this snowball can stack on another"""
@@ -51,53 +191,125 @@ class Snowball:
         self.stacked_on = other_ball
         other_ball.stacked_by = self
         self.is_rolling = False
+        self._refresh_index()
+        other_ball._refresh_index()
         return True
     
     def unstack(self):
         """Remove this snowball from its stack"""
-        if self.stacked_on:
-            self.stacked_on.stacked_by = None
+        below = self.stacked_on
+        above = self.stacked_by
+        if below:
+            below.stacked_by = None
             self.stacked_on = None
-        if self.stacked_by:
-            self.stacked_by.stacked_on = None
+            below._refresh_index()
+        if above:
+            above.stacked_on = None
             self.stacked_by = None
+            above._refresh_index()
+        if self.snowman:
+            self.snowman.remove_ball(self)
+        self._refresh_index()
+
+    def _refresh_index(self):
+        """Let the spatial index know this ball's stacking state changed"""
+        if self.index is not None:
+            self.index.refresh(self)
+
+class _Part:
+    """Snowman ball slot that drops the cached all_balls list when reassigned"""
+    def __set_name__(self, owner, name):
+        self.local = '_' + name
+
+    def __get__(self, snowman, owner=None):
+        if snowman is None:
+            return self
+        return getattr(snowman, self.local)
+
+    def __set__(self, snowman, ball):
+        setattr(snowman, self.local, ball)
+        snowman._balls = None
 
 class Snowman:
     """A class to manage a complete snowman made of stacked snowballs"""
+    __slots__ = ('_base', '_middle', '_head', '_balls', 'is_complete')
+    base = _Part()
+    middle = _Part()
+    head = _Part()
+
     def __init__(self, base_ball):
         self.base = base_ball
         self.middle = None
         self.head = None
         self.is_complete = False
+        base_ball.snowman = self
         
     @property
     def all_balls(self):
-        """Return all snowballs in this snowman"""
-        balls = [self.base]
-        if self.middle:
-            balls.append(self.middle)
-        if self.head:
-            balls.append(self.head)
-        return balls
+        """Return all snowballs in this snowman
+
+        The list is cached until a part changes; treat it as read-only.
+        """
+        if self._balls is None:
+            balls = []
+            if self.base:
+                balls.append(self.base)
+                if self.middle:
+                    balls.append(self.middle)
+                if self.head:
+                    balls.append(self.head)
+            self._balls = balls
+        return self._balls
     
     def add_ball(self, ball):
         """Try to add a ball to this snowman"""
-        if self.is_complete:
+        if self.is_complete or not self.base:
             return False
             
         if not self.middle and ball.size < self.base.size:
             self.middle = ball
+            ball.snowman = self
             ball.stack_on(self.base)
             return True
             
         if self.middle and not self.head and ball.size < self.middle.size:
             self.head = ball
+            ball.snowman = self
             ball.stack_on(self.middle)
             self.is_complete = True
             return True
             
         return False
     
+    def remove_ball(self, ball):
+        """Drop a ball, and everything resting on it, from this snowman"""
+        balls = self.all_balls
+        if ball not in balls:
+            return False
+        for dropped in balls[balls.index(ball):]:
+            dropped.snowman = None
+        if ball is self.base:
+            self.base = None  # Nothing left to build on
+            self.middle = None
+            self.head = None
+        elif ball is self.middle:
+            self.middle = None
+            self.head = None
+        else:
+            self.head = None
+        self.is_complete = False
+        return True
+    
+    def dismantle(self):
+        """Unstack every ball, top first, leaving an empty snowman
+
+        Returns the balls that were part of it.
+        """
+        balls = list(self.all_balls)
+        for ball in reversed(balls):
+            ball.unstack()
+        return balls
+
     def get_stackable_ball(self):
         """Return the snowball that can be stacked on, if any"""
         if not self.middle:
@@ -0,0 +1,111 @@
+from itertools import count
+
+class SnowballIndex:
+    """Uniform grid over free placed snowballs for fast stack-target lookup.
+
+    Only balls that have nothing below and nothing on top are kept in the
+    grid, since those are the only ones find_stackable_snowball considers
+    as new bases. Balls tracked by the index refresh themselves whenever
+    they are stacked or unstacked.
+    """
+    def __init__(self, cell_size=144):
+        self.cell_size = cell_size  # 2 * max snowball size * stacking margin
+        self.cells = {}
+        self.cell_of = {}  # Snowball -> cell key it is stored under
+        self.order = {}  # Snowball -> insertion order, for stable tie-breaking
+        self.max_reach = 0  # Largest radius (incl. growth) ever inserted
+        self._counter = count()
+
+    def __len__(self):
+        return len(self.cell_of)
+
+    def __contains__(self, ball):
+        return ball in self.cell_of
+
+    def _key(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def track(self, ball):
+        """Start tracking a placed snowball"""
+        ball.index = self
+        if ball not in self.order:
+            self.order[ball] = next(self._counter)
+        self.refresh(ball)
+
+    def untrack(self, ball):
+        """Stop tracking a snowball entirely"""
+        self.discard(ball)
+        self.order.pop(ball, None)
+        if ball.index is self:
+            ball.index = None
+
+    def refresh(self, ball):
+        """Insert, move or remove a ball depending on its stacking state"""
+        if ball.stacked_on or ball.stacked_by:
+            self.discard(ball)
+            return
+        key = self._key(ball.position.x, ball.position.y)
+        old_key = self.cell_of.get(ball)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self._remove_from_cell(ball, old_key)
+        self.cells.setdefault(key, set()).add(ball)
+        self.cell_of[ball] = key
+        # Free balls keep growing up to max_size, so reserve room for that
+        reach = max(ball.size, ball.max_size + ball.growing_speed)
+        if reach > self.max_reach:
+            self.max_reach = reach
+
+    def discard(self, ball):
+        """Remove a ball from the grid if present"""
+        key = self.cell_of.pop(ball, None)
+        if key is not None:
+            self._remove_from_cell(ball, key)
+
+    def _remove_from_cell(self, ball, key):
+        cell = self.cells[key]
+        cell.discard(ball)
+        if not cell:
+            del self.cells[key]
+
+    def clear(self):
+        """Forget every tracked ball"""
+        for ball in list(self.order):
+            if ball.index is self:
+                ball.index = None
+        self.cells.clear()
+        self.cell_of.clear()
+        self.order.clear()
+        self.max_reach = 0
+
+    def nearby(self, position, radius):
+        """Yield free balls whose cell overlaps the square around position"""
+        x0, y0 = self._key(position.x - radius, position.y - radius)
+        x1, y1 = self._key(position.x + radius, position.y + radius)
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    yield from cell
+
+    def find_base(self, new_ball):
+        """Return the largest free ball new_ball can stack on, or None
+
+        Ties are broken by placement order, matching a stable largest-first
+        sort of the placed balls.
+        """
+        if not self.cell_of:
+            return None
+        radius = (new_ball.size + self.max_reach) * 1.2
+        best = None
+        best_key = None
+        for ball in self.nearby(new_ball.position, radius):
+            if ball is new_ball or not new_ball.can_stack_on(ball):
+                continue
+            key = (-ball.size, self.order[ball])
+            if best_key is None or key < best_key:
+                best = ball
+                best_key = key
+        return best
@@ -0,0 +1,50 @@
+from game.snowman import Snowman
+
+def find_stackable_snowball(new_ball, placed_balls, snowmen, index=None):
+    """Find a snowball that the new ball can stack on
+
+    When a SnowballIndex over placed_balls is given, only free balls near
+    new_ball are considered instead of sorting every placed ball.
+    """
+    # First check existing snowmen for incomplete stacks
+    for snowman in snowmen:
+        if not snowman.is_complete:
+            stackable = snowman.get_stackable_ball()
+            if stackable and new_ball.can_stack_on(stackable):
+                return stackable
+    
+    # Then check for new potential base balls
+    if index is not None:
+        return index.find_base(new_ball)
+    
+    # Sort balls by size (largest first) to prefer stacking on larger balls
+    unattached_balls = [b for b in placed_balls if not b.stacked_on and not b.stacked_by]
+    sorted_balls = sorted(unattached_balls, key=lambda b: b.size, reverse=True)
+    
+    for ball in sorted_balls:
+        if new_ball.can_stack_on(ball):
+            return ball
+    return None
+
+def stack_placed_ball(placed, placed_balls, snowmen, index=None):
+    """Stack a just-placed ball on the best target it reaches
+
+    The ball joins the target's snowman, or starts a new one (appended
+    to snowmen) on a free ball. Returns (ball stacked on, snowman joined),
+    with None for either when there was none.
+    """
+    stackable = find_stackable_snowball(placed, placed_balls, snowmen, index)
+    if not stackable:
+        return None, None
+    placed.stack_on(stackable)
+    
+    # Check if this creates or adds to a snowman
+    snowman = stackable.snowman
+    if snowman:
+        snowman.add_ball(placed)
+    elif not stackable.stacked_on:
+        # Start a new snowman with these balls
+        snowman = Snowman(stackable)
+        snowmen.append(snowman)
+        snowman.add_ball(placed)
+    return stackable, snowman
@@ -0,0 +1,169 @@
+import numpy as np
+
+class SnowballStore:
+    """Struct-of-arrays storage for placed snowballs
+
+    Each attached Snowball owns one slot in the arrays below and becomes a
+    view onto it, so per-frame growth and stacking positions can be
+    updated for every ball in one vectorized pass.
+    """
+    # Array name -> dtype; Snowball exposes each one as an attribute
+    FIELDS = {
+        'x': np.float64,
+        'y': np.float64,
+        'size': np.float64,
+        'max_size': np.float64,
+        'growing_speed': np.float64,
+        'is_rolling': np.bool_,
+        'stacked_on': np.int32,  # Slot of the ball below, -1 for none
+    }
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.count = 0
+        self.balls = []  # Slot -> Snowball
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.stacked_on.fill(-1)
+        self._growing = np.zeros(capacity, dtype=np.bool_)  # Scratch mask for update()
+        self._levels = None  # Stacked slots grouped by depth, rebuilt on relink
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        """Double the capacity of every array"""
+        self.capacity *= 2
+        for name in self.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.stacked_on[self.count:] = -1
+        self._growing = np.zeros(self.capacity, dtype=np.bool_)
+
+    def add(self, ball):
+        """Move a snowball's state into the store and make it a view"""
+        if ball._store is self:
+            return ball._slot
+        if ball._store is not None:
+            ball._store.remove(ball)
+        if self.count == self.capacity:
+            self._grow()
+        slot = self.count
+        self.x[slot] = ball.position.x
+        self.y[slot] = ball.position.y
+        self.size[slot] = ball.size
+        self.max_size[slot] = ball.max_size
+        self.growing_speed[slot] = ball.growing_speed
+        self.is_rolling[slot] = ball.is_rolling
+        self.balls.append(ball)
+        self.count += 1
+        ball._attach(self, slot)
+        self._relink(ball)
+        # A ball already resting on this one can now follow it
+        if ball.stacked_by is not None and ball.stacked_by._store is self:
+            self._relink(ball.stacked_by)
+        return slot
+
+    def remove(self, ball):
+        """Detach a snowball, copying its state back onto the object"""
+        slot = ball._slot
+        ball._detach()
+        last = self.count - 1
+        links = self.stacked_on[:self.count]
+        links[links == slot] = -1
+        if slot != last:
+            # Move the last ball into the freed slot
+            moved = self.balls[last]
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+            self.balls[slot] = moved
+            moved._slot = slot
+            links[links == last] = slot
+        self.stacked_on[last] = -1
+        self.balls.pop()
+        self.count = last
+        self._levels = None
+
+    def truncate(self, count):
+        """Detach every ball in slot count and above, keeping the rest in place"""
+        if count >= self.count:
+            return
+        for ball in self.balls[count:]:
+            ball._detach()
+        del self.balls[count:]
+        links = self.stacked_on[:count]
+        links[links >= count] = -1
+        self.stacked_on[count:self.count] = -1
+        self.count = count
+        self._levels = None
+
+    def clear(self):
+        """Detach every snowball"""
+        for ball in self.balls:
+            ball._detach()
+        self.balls = []
+        self.count = 0
+        self.stacked_on.fill(-1)
+        self._levels = None
+
+    def _relink(self, ball):
+        """Mirror ball.stacked_on into the slot array"""
+        below = ball.stacked_on
+        if below is not None and below._store is self:
+            self.stacked_on[ball._slot] = below._slot
+        else:
+            self.stacked_on[ball._slot] = -1
+        self._levels = None
+
+    def _build_levels(self):
+        """Group stacked slots by height so each level reads a finished level
+
+        Each level is stored as (slots, slots below, scratch, scratch) so
+        update() can move it without allocating. Rolling balls are left
+        out; changing is_rolling on a stored ball triggers a rebuild.
+        """
+        n = self.count
+        below = self.stacked_on[:n]
+        linked = (below >= 0) & ~self.is_rolling[:n]
+        depth = np.zeros(n, dtype=np.int32)
+        for _ in range(n):
+            new_depth = np.where(below >= 0, depth[np.maximum(below, 0)] + 1, 0)
+            if np.array_equal(new_depth, depth):
+                break
+            depth = new_depth
+        self._levels = []
+        for level in range(1, int(depth.max(initial=0)) + 1):
+            slots = np.flatnonzero((depth == level) & linked)
+            if len(slots):
+                self._levels.append((slots, below[slots].astype(np.intp), np.empty(len(slots)), np.empty(len(slots))))
+
+    def update(self):
+        """Grow rolling balls and move stacked balls onto their bases
+
+        Equivalent to calling Snowball.update on every stored ball in
+        placement order: growth first, then stacked balls bottom-up.
+        Only preallocated scratch arrays are used, so a steady-state
+        update allocates nothing that scales with the number of balls.
+        """
+        n = self.count
+        if not n:
+            return
+        size = self.size[:n]
+        growing = np.less(size, self.max_size[:n], out=self._growing[:n])
+        growing &= self.is_rolling[:n]
+        np.add(size, self.growing_speed[:n], out=size, where=growing)
+
+        if self._levels is None:
+            self._build_levels()
+        x, y, size = self.x, self.y, self.size
+        for slots, below, scratch, term in self._levels:
+            # mode='clip' lets take() write straight into out without a buffer
+            x[slots] = x.take(below, out=scratch, mode='clip')
+            # y = y[below] - size[below] - size[slots]
+            y.take(below, out=scratch, mode='clip')
+            scratch -= size.take(below, out=term, mode='clip')
+            scratch -= size.take(slots, out=term, mode='clip')
+            y[slots] = scratch
@@ -0,0 +1,163 @@
+import math
+import numpy as np
+from pygame import Rect
+
+MELTED_SIZE = 8  # Snowballs never melt below this radius
+
+class TemperatureField:
+    """Air temperature over a world, in degrees Celsius on a coarse NumPy grid
+
+    Heat spreads between neighbouring cells, every cell relaxes towards
+    the ambient temperature, and heat sources keep warming the cells
+    around them. step() advances the field in fixed steps of
+    step_interval seconds whatever the tick rate, so the cost does not
+    depend on how often it is called. Like balls in inactive chunks, air
+    outside the area passed to step() is left as it is.
+    """
+    def __init__(self, rect, cell_size=32, ambient=-4.0, diffusion=2000.0, cooling=0.1, step_interval=0.25):
+        self.rect = Rect(rect)
+        self.cell_size = cell_size
+        self.ambient = ambient
+        self.diffusion = diffusion  # Square pixels per second
+        self.cooling = cooling  # Share of the gap to ambient closed per second
+        self.step_interval = step_interval
+        self.cols = max(-(-self.rect.w // cell_size), 1)
+        self.rows = max(-(-self.rect.h // cell_size), 1)
+        self.temperature = np.full((self.cols, self.rows), ambient, dtype=np.float64)  # Indexed [x, y]
+        self.heating = np.zeros((self.cols, self.rows), dtype=np.float64)  # Degrees per second from sources
+        self.sources = []  # (position, power, radius) of every heat source
+        self._pending = 0.0  # Seconds not stepped yet
+        self._laplacian = np.empty_like(self.temperature)  # Scratch for the stencil
+        self._scratch = None  # Per-ball scratch arrays for melt(), grown with the store
+        # Explicit diffusion blows up with long steps, so each step is split up
+        rate = diffusion / (cell_size * cell_size)
+        self._substeps = max(1, math.ceil(rate * step_interval / 0.2))
+
+    def _cell(self, position):
+        i = int((position[0] - self.rect.x) // self.cell_size)
+        j = int((position[1] - self.rect.y) // self.cell_size)
+        return min(max(i, 0), self.cols - 1), min(max(j, 0), self.rows - 1)
+
+    def add_source(self, position, power=6.0, radius=48):
+        """Warm the cells within radius of position by power degrees per second"""
+        self.sources.append(((position[0], position[1]), power, radius))
+        x0, y0 = self._cell((position[0] - radius, position[1] - radius))
+        x1, y1 = self._cell((position[0] + radius, position[1] + radius))
+        x = (np.arange(x0, x1 + 1, dtype=np.float32) + 0.5) * self.cell_size + self.rect.x - position[0]
+        y = (np.arange(y0, y1 + 1, dtype=np.float32) + 0.5) * self.cell_size + self.rect.y - position[1]
+        inside = x[:, None] ** 2 + y[None, :] ** 2 <= radius * radius
+        if not inside.any():
+            i, j = self._cell(position)
+            inside[i - x0, j - y0] = True  # Smaller than a cell
+        self.heating[x0:x1 + 1, y0:y1 + 1][inside] += power
+
+    def clear_sources(self):
+        self.sources = []
+        self.heating.fill(0)
+
+    def reset(self):
+        """Cool every cell back to ambient, keeping the sources"""
+        self.temperature.fill(self.ambient)
+        self._pending = 0.0
+
+    def temperature_at(self, position):
+        """Thermometer reading at a point"""
+        return float(self.temperature[self._cell(position)])
+
+    def step(self, dt, area=None):
+        """Advance the field by dt seconds; returns the seconds actually simulated
+
+        Time is banked until a whole step_interval is due, and the field
+        is then moved forward in one go. With area (world coordinates),
+        only the cells under it are stepped and its edges let no heat
+        through.
+        """
+        self._pending += dt
+        if self._pending < self.step_interval:
+            return 0.0
+        elapsed = self._pending
+        self._pending = 0.0
+        x0, y0, x1, y1 = 0, 0, self.cols, self.rows
+        if area is not None:
+            x0, y0 = self._cell(area.topleft)
+            x1, y1 = self._cell((area.right - 1, area.bottom - 1))
+            x1 += 1
+            y1 += 1
+        substeps = max(self._substeps, math.ceil(elapsed / self.step_interval) * self._substeps)
+        h = elapsed / substeps
+        spread = self.diffusion * h / (self.cell_size * self.cell_size)
+        relax = self.cooling * h
+        temperature = self.temperature[x0:x1, y0:y1]
+        laplacian = self._laplacian[x0:x1, y0:y1]
+        heating = self.heating[x0:x1, y0:y1]
+        for _ in range(substeps):
+            # Five-point stencil; edge cells mirror themselves so no heat leaks out
+            np.multiply(temperature, -4, out=laplacian)
+            laplacian[1:, :] += temperature[:-1, :]
+            laplacian[:-1, :] += temperature[1:, :]
+            laplacian[:, 1:] += temperature[:, :-1]
+            laplacian[:, :-1] += temperature[:, 1:]
+            laplacian[0, :] += temperature[0, :]
+            laplacian[-1, :] += temperature[-1, :]
+            laplacian[:, 0] += temperature[:, 0]
+            laplacian[:, -1] += temperature[:, -1]
+            laplacian *= spread
+            temperature += laplacian
+            temperature += (self.ambient - temperature) * relax + heating * h
+        return elapsed
+
+    def _buffers(self, n):
+        if self._scratch is None or len(self._scratch[0]) < n:
+            capacity = max(64, n * 2)
+            self._scratch = (
+                np.empty(capacity, dtype=np.float64),
+                np.empty(capacity, dtype=np.intp),
+                np.empty(capacity, dtype=np.intp),
+                np.empty(capacity, dtype=np.float64),
+                np.empty(capacity, dtype=np.bool_),
+                np.empty(capacity, dtype=np.bool_),
+            )
+        return [array[:n] for array in self._scratch]
+
+    def melt(self, store, dt, rate=0.05):
+        """Shrink every stored ball in a cell above freezing, all in one pass
+
+        Balls lose rate pixels of radius per second per degree, down to
+        MELTED_SIZE. Returns the stacked balls that now break the stacking
+        rules by being no smaller than the ball below them. Only scratch arrays are used, so the pass
+        allocates nothing that scales with the number of balls.
+        """
+        n = store.count
+        if not n:
+            return []
+        coord, i, j, values, mask, other = self._buffers(n)
+        cell = self.cell_size
+        # Flat cell index i * rows + j of every ball
+        np.subtract(store.x[:n], self.rect.x, out=coord)
+        np.floor_divide(coord, cell, out=coord)
+        i[:] = coord
+        np.clip(i, 0, self.cols - 1, out=i)
+        np.subtract(store.y[:n], self.rect.y, out=coord)
+        np.floor_divide(coord, cell, out=coord)
+        j[:] = coord
+        np.clip(j, 0, self.rows - 1, out=j)
+        i *= self.rows
+        i += j
+        warmth = self.temperature.ravel().take(i, out=values, mode='clip')
+        melting = np.greater(warmth, 0, out=mask)
+        if not melting.any():
+            return []
+        size = store.size[:n]
+        warmth *= rate * dt
+        np.subtract(size, warmth, out=size, where=melting)
+        np.maximum(size, MELTED_SIZE, out=size, where=melting)
+
+        # A stacked ball must stay smaller than the one below it
+        below = store.stacked_on[:n]
+        stacked = np.greater_equal(below, 0, out=mask)
+        underneath = size.take(below, out=values, mode='clip')
+        broken = np.greater_equal(size, underneath, out=other)
+        broken &= stacked
+        if not broken.any():
+            return []
+        return [store.balls[slot] for slot in np.flatnonzero(broken)]
@@ -0,0 +1,121 @@
+import math
+import numpy as np
+from pygame import Rect
+
+SNOW_PACKING = 0.125  # Share of scooped snow that ends up on the ball
+
+class SnowTerrain:
+    """Snow depth over a zone, stored as a NumPy grid of square tiles
+
+    Rolling a ball scoops snow from the tiles under it, and every tile
+    slowly fills back up to max_depth. Depth is also kept as a small
+    number of shade levels; tiles whose level changes are marked dirty so
+    a renderer only has to redraw those.
+    """
+    def __init__(self, rect, tile_size=4, max_depth=1.0, regen_per_second=0.05, levels=32, regen_interval=0.1):
+        self.rect = Rect(rect)
+        self.tile_size = tile_size
+        self.max_depth = max_depth
+        self.regen_per_second = regen_per_second  # Share of max_depth restored per second
+        self.levels = levels
+        self.regen_interval = regen_interval  # Seconds between regeneration passes
+        self.cols = -(-self.rect.w // tile_size)
+        self.rows = -(-self.rect.h // tile_size)
+        self.depth = np.full((self.cols, self.rows), max_depth, dtype=np.float32)  # Indexed [x, y]
+        self.level = np.full((self.cols, self.rows), levels, dtype=np.uint8)  # Shade last reported
+        self.dirty = np.zeros((self.cols, self.rows), dtype=np.bool_)
+        self._dirty_box = None  # Tile bounds (x0, y0, x1, y1) holding every dirty tile
+        self._low_box = None  # Tile bounds holding every tile below max_depth
+        self._pending = 0.0  # Seconds of regeneration not applied yet
+
+    @staticmethod
+    def _union(box, x0, y0, x1, y1):
+        if box is None:
+            return (x0, y0, x1, y1)
+        return (min(box[0], x0), min(box[1], y0), max(box[2], x1), max(box[3], y1))
+
+    def depth_at(self, position):
+        """Snow depth under a point, 0 outside the terrain"""
+        i = int((position[0] - self.rect.x) // self.tile_size)
+        j = int((position[1] - self.rect.y) // self.tile_size)
+        if 0 <= i < self.cols and 0 <= j < self.rows:
+            return float(self.depth[i, j])
+        return 0.0
+
+    def collect(self, position, radius, bite=0.5):
+        """Scoop a share of the snow under a disc; returns the volume taken
+
+        Volume is depth times area in square pixels.
+        """
+        tile = self.tile_size
+        x = position[0] - self.rect.x
+        y = position[1] - self.rect.y
+        x0 = max(int((x - radius) // tile), 0)
+        y0 = max(int((y - radius) // tile), 0)
+        x1 = min(int((x + radius) // tile) + 1, self.cols)
+        y1 = min(int((y + radius) // tile) + 1, self.rows)
+        if x0 >= x1 or y0 >= y1:
+            return 0.0
+        # Tiles whose centre lies under the disc
+        dx = (np.arange(x0, x1, dtype=np.float32) + 0.5) * tile - x
+        dy = (np.arange(y0, y1, dtype=np.float32) + 0.5) * tile - y
+        under = dx[:, None] ** 2 + dy[None, :] ** 2 <= radius * radius
+        depth = self.depth[x0:x1, y0:y1]
+        taken = np.where(under, depth * bite, 0)
+        depth -= taken
+        self._low_box = self._union(self._low_box, x0, y0, x1, y1)
+        self._update_levels(x0, y0, x1, y1)
+        return float(taken.sum()) * tile * tile
+
+    def regenerate(self, dt):
+        """Let snow fall back onto scooped tiles"""
+        if self._low_box is None:
+            return
+        self._pending += dt
+        if self._pending < self.regen_interval:
+            return
+        x0, y0, x1, y1 = self._low_box
+        depth = self.depth[x0:x1, y0:y1]
+        depth += self.regen_per_second * self.max_depth * self._pending
+        np.minimum(depth, self.max_depth, out=depth)
+        self._pending = 0.0
+        self._update_levels(x0, y0, x1, y1)
+        if depth.min() >= self.max_depth:
+            self._low_box = None
+
+    def _update_levels(self, x0, y0, x1, y1):
+        level = (self.depth[x0:x1, y0:y1] * (self.levels / self.max_depth)).astype(np.uint8)
+        changed = level != self.level[x0:x1, y0:y1]
+        if changed.any():
+            self.level[x0:x1, y0:y1] = level
+            self.dirty[x0:x1, y0:y1] |= changed
+            self._dirty_box = self._union(self._dirty_box, x0, y0, x1, y1)
+
+    def take_dirty(self):
+        """Tile indices (xs, ys) whose shade changed since the last call"""
+        if self._dirty_box is None:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        x0, y0, x1, y1 = self._dirty_box
+        box = self.dirty[x0:x1, y0:y1]
+        xs, ys = np.nonzero(box)
+        box[:] = False
+        self._dirty_box = None
+        return xs + x0, ys + y0
+
+    def reset(self):
+        """Cover every tile in fresh snow"""
+        self.depth.fill(self.max_depth)
+        self._low_box = None
+        self._pending = 0.0
+        self._update_levels(0, 0, self.cols, self.rows)
+
+def growth_from_snow(volume, radius, packing=SNOW_PACKING):
+    """Radius a ball of the given radius gains from a volume of snow
+
+    Snow packed around the rim adds area at 2*pi*radius per unit of
+    radius, so a ball rolled over fresh snow at a steady speed grows at
+    the same rate whatever its size.
+    """
+    if radius <= 0:
+        return 0.0
+    return packing * volume / (2 * math.pi * radius)
@@ -1,15 +1,268 @@
+import random
 from pygame import Rect
 
-class World:
-    def __init__(self, width, height):
-        # Create two zones - left for rolling, right for building
+# Zone kinds
+ROLLING = 'rolling'
+BUILDING = 'building'
+
+ZONE_COLORS = {
+    ROLLING: (200, 255, 200),  # Light green
+    BUILDING: (220, 255, 220),  # Slightly lighter green
+}
+
+class Zone:
+    """A rectangle of the world where one kind of action is allowed"""
+    __slots__ = ('kind', 'rect', 'color', 'label', 'label_color')
+
+    def __init__(self, kind, rect, color=None, label=None, label_color=None):
+        self.kind = kind
+        self.rect = Rect(rect)
+        self.color = color or ZONE_COLORS[kind]
+        self.label = label  # Text drawn near the top of the zone, if any
+        self.label_color = label_color
+
+class Chunk:
+    """One square cell of a ChunkedWorld with the zones and balls in it"""
+    __slots__ = ('key', 'rect', 'zones', 'balls')
+
+    def __init__(self, key, size):
+        self.key = key
+        self.rect = Rect(key[0] * size, key[1] * size, size, size)
+        self.zones = []  # Zones overlapping this chunk
+        self.balls = {}  # Snowball -> placement order, in placement order
+
+class ZoneSet:
+    """Every zone of one kind, usable where a single zone Rect was expected"""
+    def __init__(self, world, kind):
+        self.world = world
+        self.kind = kind
+
+    def collidepoint(self, point):
+        return self.world.zone_at(point, self.kind) is not None
+
+class ChunkedWorld:
+    """A world of any size stored as a sparse grid of square chunks
+
+    Zones and placed balls are filed under the chunks they touch, so
+    looking up what is at a point or on screen only visits a handful of
+    chunks however big the world is. Chunks near the camera are active;
+    update_active() reports balls that enter or leave the active area so
+    the caller can stop simulating them.
+    """
+    def __init__(self, width, height, chunk_size=1024, active_margin=None):
         self.width = width
         self.height = height
-        
+        self.rect = Rect(0, 0, width, height)
+        self.chunk_size = chunk_size
+        self.active_margin = chunk_size if active_margin is None else active_margin
+        self.chunks = {}  # (cx, cy) -> Chunk, created on first use
+        self.zones = []
+        self.active = set()  # Keys of active chunks
+        self._active_bounds = None  # Corner chunk keys of the active area
+        self.chunk_of = {}  # Snowball -> Chunk it is filed under
+        self._placed = 0
+        self.rolling_zone = ZoneSet(self, ROLLING)
+        self.building_zone = ZoneSet(self, BUILDING)
+
+    def _key(self, x, y):
+        return (int(x // self.chunk_size), int(y // self.chunk_size))
+
+    def keys_in(self, rect):
+        """Keys of every chunk overlapping rect"""
+        x0, y0 = self._key(rect.left, rect.top)
+        x1, y1 = self._key(rect.right - 1, rect.bottom - 1)
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def chunk(self, key):
+        """The chunk at key, created if needed"""
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = Chunk(key, self.chunk_size)
+        return chunk
+
+    def add_zone(self, kind, rect, **kwargs):
+        """Add a zone and file it under every chunk it overlaps"""
+        zone = Zone(kind, rect, **kwargs)
+        self.zones.append(zone)
+        for key in self.keys_in(zone.rect.clip(self.rect)):
+            self.chunk(key).zones.append(zone)
+        return zone
+
+    def zone_at(self, point, kind=None):
+        """The first zone (of kind, if given) containing point, or None"""
+        chunk = self.chunks.get(self._key(point[0], point[1]))
+        if chunk is not None:
+            for zone in chunk.zones:
+                if (kind is None or zone.kind == kind) and zone.rect.collidepoint(point):
+                    return zone
+        return None
+
+    def zones_in(self, rect):
+        """Zones overlapping rect, in the order they were added"""
+        found = set()
+        for key in self.keys_in(rect):
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                found.update(zone for zone in chunk.zones if zone.rect.colliderect(rect))
+        return [zone for zone in self.zones if zone in found] if len(found) > 1 else list(found)
+
+    def nearest_zone(self, kind, point):
+        """The zone of kind closest to point, searching outward chunk by chunk"""
+        def distance(zone):
+            rect = zone.rect
+            dx = max(rect.left - point[0], 0, point[0] - rect.right)
+            dy = max(rect.top - point[1], 0, point[1] - rect.bottom)
+            return dx * dx + dy * dy
+
+        search = Rect(0, 0, self.chunk_size, self.chunk_size)
+        search.center = (int(point[0]), int(point[1]))
+        while True:
+            zones = [zone for zone in self.zones_in(search) if zone.kind == kind]
+            if zones:
+                return min(zones, key=distance)
+            if search.contains(self.rect):
+                return None
+            search.inflate_ip(2 * self.chunk_size, 2 * self.chunk_size)
+
+    def add_ball(self, ball, anchor=None):
+        """File a placed ball under its chunk; returns True if that chunk is active
+
+        A ball stacked on anchor shares the anchor's chunk, so a snowman
+        is always activated and culled as a whole.
+        """
+        if anchor is not None and anchor in self.chunk_of:
+            chunk = self.chunk_of[anchor]
+        else:
+            x, y = ball._xy()
+            chunk = self.chunk(self._key(x, y))
+        chunk.balls[ball] = self._placed
+        self.chunk_of[ball] = chunk
+        self._placed += 1
+        return chunk.key in self.active
+
+    def remove_ball(self, ball):
+        chunk = self.chunk_of.pop(ball, None)
+        if chunk is not None:
+            del chunk.balls[ball]
+
+    def clear_balls(self):
+        for chunk in self.chunks.values():
+            chunk.balls.clear()
+        self.chunk_of.clear()
+        self.active.clear()
+        self._active_bounds = None
+        self._placed = 0
+
+    def balls_in(self, rect, margin=0):
+        """Placed balls whose centre lies within rect grown by margin, in placement order
+
+        margin should cover a ball's radius plus how far a stacked ball
+        sits from the chunk it is filed under.
+        """
+        area = rect.inflate(2 * margin, 2 * margin)
+        chunks = [self.chunks[key] for key in self.keys_in(area) if key in self.chunks]
+        left, top, right, bottom = area.left, area.top, area.right, area.bottom
+        found = []
+        for chunk in chunks:
+            if not chunk.balls:
+                continue
+            if area.contains(chunk.rect):
+                found.extend(chunk.balls)
+                continue
+            for ball in chunk.balls:
+                x, y = ball._xy()
+                if left <= x < right and top <= y < bottom:
+                    found.append(ball)
+        if len(chunks) > 1:
+            order = {}
+            for chunk in chunks:
+                order.update(chunk.balls)
+            found.sort(key=order.__getitem__)
+        return found
+
+    def update_active(self, view):
+        """Make the chunks around view active
+
+        Returns (activated, deactivated) lists of the balls in chunks that
+        just changed state.
+        """
+        margin = self.active_margin
+        bounds = (self._key(view.left - margin, view.top - margin),
+                  self._key(view.right + margin - 1, view.bottom + margin - 1))
+        if bounds == self._active_bounds:
+            return (), ()  # Still inside the same chunks
+        self._active_bounds = bounds
+        keys = set(self.keys_in(view.inflate(2 * margin, 2 * margin)))
+        activated = []
+        deactivated = []
+        for key in self.active - keys:
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                deactivated.extend(chunk.balls)
+        for key in keys - self.active:
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                activated.extend(chunk.balls)
+        self.active = keys
+        return activated, deactivated
+
+class World(ChunkedWorld):
+    def __init__(self, width, height):
+        super().__init__(width, height, chunk_size=max(width, height, 1))
+        # Create two zones - left for rolling, right for building
+        rolling = self.add_zone(ROLLING, (0, 0, width // 2, height),
+                                label="SNOWBALL", label_color=(255, 0, 0))  # Red
+        building = self.add_zone(BUILDING, (width // 2, 0, width // 2, height),
+                                 label="SNOWMAN", label_color=(0, 100, 0))  # Dark green
+
         # Define zones
-        self.rolling_zone = Rect(0, 0, width // 2, height)
-        self.building_zone = Rect(width // 2, 0, width // 2, height)
-        
+        self.rolling_zone = rolling.rect
+        self.building_zone = building.rect
+
         # Zone colors for debug visualization
-        self.rolling_zone_color = (200, 255, 200)  # Light green
-        self.building_zone_color = (220, 255, 220)  # Slightly lighter green
+        self.rolling_zone_color = rolling.color
+        self.building_zone_color = building.color
+
+def generate_world(width, height, seed=None, cell_width=1600, cell_height=1200, chunk_size=1024):
+    """A large world tiled with cells, each split into a rolling and a building zone"""
+    rng = random.Random(seed)
+    world = ChunkedWorld(width, height, chunk_size)
+    for top in range(0, height, cell_height):
+        for left in range(0, width, cell_width):
+            cell = Rect(left, top, cell_width, cell_height).clip(world.rect)
+            kinds = [ROLLING, BUILDING]
+            rng.shuffle(kinds)
+            if rng.random() < 0.5:
+                split = cell.w // 2
+                first = Rect(cell.left, cell.top, split, cell.h)
+                second = Rect(cell.left + split, cell.top, cell.w - split, cell.h)
+            else:
+                split = cell.h // 2
+                first = Rect(cell.left, cell.top, cell.w, split)
+                second = Rect(cell.left, cell.top + split, cell.w, cell.h - split)
+            for kind, rect in zip(kinds, (first, second)):
+                if rect.w and rect.h:
+                    world.add_zone(kind, rect)
+    return world
+
+class Camera:
+    """The part of the world shown on screen, in world coordinates"""
+    def __init__(self, width, height, world):
+        self.world = world
+        self.rect = Rect(0, 0, width, height)
+
+    def follow(self, position):
+        """Centre the view on position without leaving the world"""
+        self.rect.center = (int(position[0]), int(position[1]))
+        self.rect.clamp_ip(self.world.rect)
+
+    @property
+    def offset(self):
+        """Added to world coordinates to get screen coordinates"""
+        return -self.rect.x, -self.rect.y
+
+    def to_screen(self, point):
+        return point[0] - self.rect.x, point[1] - self.rect.y
+
+    def to_world(self, point):
+        return point[0] + self.rect.x, point[1] + self.rect.y
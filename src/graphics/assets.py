@@ -0,0 +1,200 @@
+import hashlib
+import os
+import struct
+import threading
+import pygame
+
+# Images shipped with the game, found relative to this package rather than the CWD
+ASSET_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'images')
+
+_CACHE_MAGIC = b'SSA1'
+_CACHE_HEADER = struct.Struct('<4sII')  # Magic, width, height; RGBA bytes follow
+
+def default_cache_dir():
+    """Per-user directory for preprocessed assets"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'snowball_snowman', 'assets')
+
+def display_format(surface, alpha=True):
+    """surface converted to the display's pixel format, if there is a display yet"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+class SpriteAtlas:
+    """Small sprites packed into a few large surfaces with a shelf packer
+
+    Each sprite is handed out as a subsurface of a page, so they all
+    share one pixel format and a handful of allocations.
+    """
+    def __init__(self, page_size=512, padding=1):
+        self.page_size = page_size
+        self.padding = padding  # Empty pixels between sprites
+        self.pages = []
+        self._x = self._y = self._shelf = 0  # Cursor and shelf height on the last page
+
+    def _new_page(self):
+        page = display_format(pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA))
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self._x = self._y = self._shelf = 0
+        return page
+
+    def add(self, surface):
+        """Copy surface into the atlas and return the subsurface holding it"""
+        width, height = surface.get_size()
+        if width > self.page_size or height > self.page_size:
+            raise ValueError("sprite of %dx%d does not fit a %d atlas page" % (width, height, self.page_size))
+        page = self.pages[-1] if self.pages else self._new_page()
+        if self._x + width > self.page_size:
+            # Start the next shelf
+            self._x = 0
+            self._y += self._shelf + self.padding
+            self._shelf = 0
+        if self._y + height > self.page_size:
+            page = self._new_page()
+        rect = pygame.Rect(self._x, self._y, width, height)
+        # Adding onto cleared pixels copies colour and alpha exactly
+        page.blit(surface, rect, special_flags=pygame.BLEND_RGBA_ADD)
+        self._x += width + self.padding
+        self._shelf = max(self._shelf, height)
+        return page.subsurface(rect)
+
+class AssetManager:
+    """Loads images on first use and keeps them in the display format
+
+    Names are paths relative to root. Decoded pixels are cached on disk
+    under cache_dir (keyed by path, size and modification time) so later
+    cold starts skip PNG decoding, and preload() decodes in a background
+    thread. Images no larger than atlas_max on both sides, and sprites
+    drawn by code, are packed into a SpriteAtlas.
+    """
+    def __init__(self, root=ASSET_ROOT, cache_dir=None, atlas_size=512, atlas_max=64):
+        self.root = root
+        self.cache_dir = cache_dir  # None keeps no disk cache
+        self.atlas_size = atlas_size
+        self.atlas_max = atlas_max
+        self.atlas = SpriteAtlas(atlas_size)
+        self.images = {}  # (name, alpha) -> surface in the display format
+        self.sprites = {}  # Sprite name -> atlas subsurface
+        self._decoded = {}  # Name -> surface as loaded
+        self._pending = {}  # Name -> Event set once a preload has finished with it
+        self._lock = threading.Lock()
+        self.loads = 0  # Images decoded from their source files
+        self.cache_hits = 0  # Images read back from the disk cache
+
+    def path(self, name):
+        return os.path.join(self.root, *name.split('/'))
+
+    def _cache_path(self, path):
+        stat = os.stat(path)
+        key = '%s:%d:%d' % (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.rgba')
+
+    def _read_cache(self, path):
+        try:
+            with open(self._cache_path(path), 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < _CACHE_HEADER.size:
+            return None
+        magic, width, height = _CACHE_HEADER.unpack_from(data)
+        if magic != _CACHE_MAGIC or len(data) != _CACHE_HEADER.size + width * height * 4:
+            return None
+        return pygame.image.frombytes(data[_CACHE_HEADER.size:], (width, height), 'RGBA')
+
+    def _write_cache(self, path, surface):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            target = self._cache_path(path)
+            header = _CACHE_HEADER.pack(_CACHE_MAGIC, *surface.get_size())
+            temporary = '%s.%d.tmp' % (target, threading.get_ident())
+            with open(temporary, 'wb') as f:
+                f.write(header + pygame.image.tobytes(surface, 'RGBA'))
+            os.replace(temporary, target)  # Readers never see half a file
+        except OSError:
+            pass  # A read-only cache only costs speed
+
+    def _decode(self, name):
+        """Load name from the disk cache or its source file; safe off the main thread"""
+        path = self.path(name)
+        if self.cache_dir is not None:
+            surface = self._read_cache(path)
+            if surface is not None:
+                self.cache_hits += 1
+                return surface
+        surface = pygame.image.load(path)
+        self.loads += 1
+        if self.cache_dir is not None:
+            self._write_cache(path, surface)
+        return surface
+
+    def _decoded_surface(self, name):
+        with self._lock:
+            surface = self._decoded.get(name)
+            pending = self._pending.get(name)
+        if surface is None and pending is not None:
+            pending.wait()  # Being decoded by preload() right now
+            with self._lock:
+                surface = self._decoded.get(name)
+        if surface is None:
+            surface = self._decode(name)
+            with self._lock:
+                self._decoded[name] = surface
+        return surface
+
+    def preload(self, names):
+        """Decode names in a background thread; returns the thread"""
+        with self._lock:
+            names = [name for name in names if name not in self._decoded and name not in self._pending]
+            for name in names:
+                self._pending[name] = threading.Event()
+
+        def work():
+            for name in names:
+                try:
+                    surface = self._decode(name)
+                except (OSError, pygame.error):
+                    surface = None  # image() raises it again on the main thread
+                with self._lock:
+                    if surface is not None:
+                        self._decoded.setdefault(name, surface)
+                    self._pending.pop(name).set()
+
+        thread = threading.Thread(target=work, name='asset-preload', daemon=True)
+        thread.start()
+        return thread
+
+    def image(self, name, alpha=True):
+        """The image at name in the display format, loaded on first use"""
+        key = (name, alpha)
+        surface = self.images.get(key)
+        if surface is None:
+            surface = self._decoded_surface(name)
+            width, height = surface.get_size()
+            if alpha and width <= self.atlas_max and height <= self.atlas_max:
+                surface = self.atlas.add(surface)
+            else:
+                surface = display_format(surface, alpha)
+            self.images[key] = surface
+        return surface
+
+    def sprite(self, name, create):
+        """Atlas copy of the surface returned by create(), which runs only once"""
+        surface = self.sprites.get(name)
+        if surface is None:
+            surface = self.sprites[name] = self.atlas.add(create())
+        return surface
+
+    def refresh(self):
+        """Forget converted surfaces, e.g. once the display mode is set
+
+        Decoded pixels are kept, so nothing is read from disk again.
+        """
+        self.images.clear()
+        self.sprites.clear()
+        self.atlas = SpriteAtlas(self.atlas_size)
+
+# Shared by the game; main() gives it the per-user disk cache, so importers never write one
+assets = AssetManager()
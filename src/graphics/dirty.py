@@ -0,0 +1,80 @@
+import pygame
+
+class DirtyRectRenderer:
+    """Redraws only the parts of the screen that changed since the last frame
+
+    Each frame the caller passes a static background surface and the list
+    of drawables as (key, rect, surface) tuples in draw order. Anything
+    that appeared, disappeared, moved or changed surface marks its old and
+    new rects dirty. Those areas are restored from the background and
+    every drawable touching them is blitted again, clipped to the area.
+    """
+    def __init__(self, max_rects=32):
+        self.max_rects = max_rects  # Beyond this a full redraw is cheaper
+        self.previous = {}  # key -> (rect, surface) drawn last frame
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Force the next frame to be redrawn completely"""
+        self.full_redraw = True
+
+    def _changed_rects(self, items):
+        current = {}
+        dirty = []
+        previous = self.previous
+        for key, rect, surface in items:
+            current[key] = (rect, surface)
+            old = previous.get(key)
+            if old is None:
+                dirty.append(rect)
+            elif old[0] != rect or old[1] is not surface:
+                dirty.append(old[0])
+                dirty.append(rect)
+        if len(current) != len(previous) or dirty:
+            for key, old in previous.items():
+                if key not in current:
+                    dirty.append(old[0])
+        self.previous = current
+        return dirty
+
+    @staticmethod
+    def _merge(rects):
+        """Union overlapping rects so no pixel is redrawn twice"""
+        merged = []
+        for rect in rects:
+            rect = rect.copy()
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def render(self, screen, background, items, damaged=()):
+        """Draw the frame and return the list of rects to present
+
+        damaged lists areas where the background itself changed.
+        """
+        screen_rect = screen.get_rect()
+        dirty = self._changed_rects(items)
+        dirty.extend(damaged)
+        if not self.full_redraw:
+            dirty = [rect.clip(screen_rect) for rect in dirty]
+            dirty = self._merge([rect for rect in dirty if rect.w and rect.h])
+            if len(dirty) > self.max_rects:
+                self.full_redraw = True
+
+        if self.full_redraw:
+            self.full_redraw = False
+            screen.blit(background, (0, 0))
+            screen.blits([(surface, rect) for _, rect, surface in items], False)
+            return [screen_rect]
+
+        if not dirty:
+            return []
+        for area in dirty:
+            screen.set_clip(area)
+            screen.blit(background, area, area)
+            screen.blits([(surface, rect) for _, rect, surface in items if area.colliderect(rect)], False)
+        screen.set_clip(None)
+        return dirty
@@ -0,0 +1,177 @@
+import numpy as np
+import pygame
+
+SNOW_COLORS = ((255, 255, 255), (235, 245, 255), (220, 235, 255))
+CONFETTI_COLORS = ((255, 70, 70), (255, 200, 40), (80, 200, 90), (70, 140, 255), (200, 90, 230))
+
+class ParticleSystem:
+    """Particles kept in preallocated NumPy arrays with a hard budget
+
+    There are no per-particle objects: emit() writes into the next free
+    rows, update() integrates every live particle in one vectorized step
+    and packs dead ones out, and draw() writes pixels straight into the
+    surface through surfarray. Emitting past capacity drops the extras.
+    """
+    def __init__(self, capacity=4096, gravity=300.0):
+        self.capacity = capacity
+        self.gravity = gravity  # Pixels per second squared, downwards
+        self.count = 0
+        self.dropped = 0  # Particles refused because the budget was full
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)  # Seconds left
+        self.fade = np.zeros(capacity, dtype=np.float32)  # Seconds of fading out at the end
+        self.weight = np.zeros(capacity, dtype=np.float32)  # Share of gravity felt
+        self.drag = np.zeros(capacity, dtype=np.float32)  # Fraction of velocity lost per second
+        self.size = np.zeros(capacity, dtype=np.uint8)  # Square side in pixels
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self._arrays = (self.x, self.y, self.vx, self.vy, self.life, self.fade,
+                        self.weight, self.drag, self.size, self.color)
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, n, x, y, vx=0.0, vy=0.0, life=1.0, fade=0.5, weight=1.0, drag=0.0, size=1, color=(255, 255, 255)):
+        """Add up to n particles; every argument is a scalar or a length-n array
+
+        Returns how many were added.
+        """
+        room = self.capacity - self.count
+        if n > room:
+            self.dropped += n - room
+        added = min(n, room)
+        if added <= 0:
+            return 0
+        rows = slice(self.count, self.count + added)
+        for array, value in ((self.x, x), (self.y, y), (self.vx, vx), (self.vy, vy),
+                             (self.life, life), (self.fade, fade), (self.weight, weight),
+                             (self.drag, drag), (self.size, size)):
+            value = np.asarray(value)
+            array[rows] = value[:added] if value.ndim else value
+        color = np.asarray(color, dtype=np.uint8)
+        self.color[rows] = color[:added] if color.ndim == 2 else color
+        self.count += added
+        return added
+
+    def update(self, dt):
+        """Advance every particle by dt seconds and drop the dead ones"""
+        n = self.count
+        if not n:
+            return
+        vx, vy = self.vx[:n], self.vy[:n]
+        vy += self.weight[:n] * (self.gravity * dt)
+        damping = 1.0 - self.drag[:n] * dt
+        vx *= damping
+        vy *= damping
+        self.x[:n] += vx * dt
+        self.y[:n] += vy * dt
+        life = self.life[:n]
+        life -= dt
+        if life.min() <= 0:
+            alive = np.flatnonzero(life > 0)
+            for array in self._arrays:
+                array[:len(alive)] = array[alive]
+            self.count = len(alive)
+
+    def clear(self):
+        self.count = 0
+
+    def draw(self, surface, offset=(0, 0), scale=1):
+        """Write every live particle into surface, offset added to positions
+
+        Positions and sizes are multiplied by scale after the offset, for
+        a surface drawn below full resolution. Particles fade into what is
+        already drawn during their last fade seconds. Returns the number
+        of particles on screen.
+        """
+        n = self.count
+        if not n:
+            return 0
+        width, height = surface.get_size()
+        xs = self.x[:n] + offset[0]
+        ys = self.y[:n] + offset[1]
+        size = self.size[:n]
+        if scale != 1:
+            xs *= scale
+            ys *= scale
+            size = np.maximum(size * scale, 1)
+        xs = xs.astype(np.intp)
+        ys = ys.astype(np.intp)
+        size = size.astype(np.intp)
+        on_screen = (xs > -size) & (xs < width) & (ys > -size) & (ys < height)
+        if not on_screen.any():
+            return 0
+        xs, ys, size = xs[on_screen], ys[on_screen], size[on_screen]
+        color = self.color[:n][on_screen].astype(np.float32)
+        fade = self.fade[:n][on_screen]
+        alpha = np.clip(self.life[:n][on_screen] / np.maximum(fade, 1e-6), 0.0, 1.0)[:, None]
+
+        if surface.get_bytesize() == 4:
+            # Blend once per particle against the pixel under its corner,
+            # then scatter the packed colour into each pixel of its square
+            pixels = pygame.surfarray.pixels2d(surface)
+            shifts = surface.get_shifts()[:3]
+            corner = (xs >= 0) & (ys >= 0)
+            packed = pixels[np.maximum(xs, 0), np.maximum(ys, 0)]
+            under = np.stack([(packed >> shift) & 0xFF for shift in shifts], axis=1).astype(np.float32)
+            under[~corner] = color[~corner]
+            blended = (under + (color - under) * alpha).astype(np.uint32)
+            value = (packed & ~np.uint32(sum(0xFF << shift for shift in shifts))) | (
+                (blended[:, 0] << shifts[0]) | (blended[:, 1] << shifts[1]) | (blended[:, 2] << shifts[2]))
+        else:
+            pixels = pygame.surfarray.pixels3d(surface)
+            value = None
+        try:
+            # One scatter per pixel offset inside the largest square
+            largest = int(size.max())
+            for dx in range(largest):
+                for dy in range(largest):
+                    px, py = xs + dx, ys + dy
+                    mask = (size > max(dx, dy)) & (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                    if not mask.any():
+                        continue
+                    px, py = px[mask], py[mask]
+                    if value is not None:
+                        pixels[px, py] = value[mask]
+                    else:
+                        under = pixels[px, py].astype(np.float32)
+                        pixels[px, py] = under + (color[mask] - under) * alpha[mask]
+        finally:
+            del pixels  # Unlock the surface
+        return len(xs)
+
+def emit_snowfall(particles, rect, n, rng):
+    """Snowflakes drifting down from just above rect"""
+    return particles.emit(
+        n,
+        rng.uniform(rect.left, rect.right, n),
+        rng.uniform(rect.top - 20, rect.top, n),
+        vx=rng.normal(0, 15, n),
+        vy=rng.uniform(20, 60, n),
+        life=rect.height / 40.0,
+        fade=1.0,
+        weight=0.15,
+        drag=0.8,
+        size=rng.integers(1, 4, n),
+        color=np.asarray(SNOW_COLORS, dtype=np.uint8)[rng.integers(0, len(SNOW_COLORS), n)],
+    )
+
+def emit_confetti(particles, position, n, rng):
+    """A burst of confetti thrown up and out from position"""
+    angle = rng.uniform(-np.pi * 0.9, -np.pi * 0.1, n)  # Upwards fan
+    speed = rng.uniform(150, 450, n)
+    return particles.emit(
+        n,
+        position[0],
+        position[1],
+        vx=np.cos(angle) * speed,
+        vy=np.sin(angle) * speed,
+        life=rng.uniform(1.5, 3.0, n),
+        fade=0.75,
+        weight=1.0,
+        drag=1.5,
+        size=rng.integers(2, 4, n),
+        color=np.asarray(CONFETTI_COLORS, dtype=np.uint8)[rng.integers(0, len(CONFETTI_COLORS), n)],
+    )
@@ -0,0 +1,23 @@
+import pygame
+
+class ScreenRenderer:
+    """Draws each frame to a pygame surface and flips the display"""
+    def __init__(self, screen, draw_fn):
+        self.screen = screen
+        self.draw_fn = draw_fn  # Called with the screen surface every frame
+
+    def render(self):
+        """Draw the current frame"""
+        self.draw_fn(self.screen)
+
+    def present(self):
+        """Show the drawn frame"""
+        pygame.display.flip()
+
+class NullRenderer:
+    """Renderer that draws nothing, for headless simulation"""
+    def render(self):
+        pass
+
+    def present(self):
+        pass
@@ -0,0 +1,135 @@
+import queue
+import struct
+import threading
+import zlib
+import numpy as np
+import pygame
+
+def capture(surface):
+    """Snapshot a surface's pixels as a (width, height, 3) uint8 array
+
+    The pixels are read through the surface's buffer view, and the only
+    cost on the calling thread is a single array copy. Encoding happens
+    elsewhere.
+    """
+    return np.array(surface.get_view('3'), dtype=np.uint8, copy=True)
+
+def load_pixels(path):
+    """Load an image file as a (width, height, 3) uint8 array"""
+    return pygame.surfarray.array3d(pygame.image.load(path))
+
+def _png_chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+def encode_png(pixels, level=1):
+    """Encode a (width, height, 3) uint8 array as PNG bytes
+
+    Uses zlib directly, which releases the GIL while compressing, so a
+    writer thread does not stall the game loop the way image.save does.
+    """
+    width, height = pixels.shape[:2]
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # Leading 0 = no filter
+    rows[:, 1:] = pixels.transpose(1, 0, 2).reshape(height, width * 3)
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)  # 8-bit RGB
+    return b''.join((
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', header),
+        _png_chunk(b'IDAT', zlib.compress(rows.tobytes(), level)),
+        _png_chunk(b'IEND', b''),
+    ))
+
+def save_pixels(pixels, path):
+    """Encode a (width, height, 3) array to an image file"""
+    if path.lower().endswith('.png'):
+        with open(path, 'wb') as f:
+            f.write(encode_png(pixels))
+    else:
+        pygame.image.save(pygame.surfarray.make_surface(pixels), path)
+
+class ScreenshotWriter:
+    """Background thread that encodes and writes captured frames
+
+    submit() only copies the pixels and queues them. If the bounded queue
+    is full the frame is dropped (and counted) rather than stalling the
+    game loop, unless block=True is passed.
+    """
+    def __init__(self, max_pending=8):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.written = 0
+        self.dropped = 0
+        self.errors = []
+        self.thread = threading.Thread(target=self._run, name='screenshot-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, surface, path, block=False):
+        """Queue a copy of surface to be saved at path; returns False if dropped"""
+        try:
+            self.queue.put((capture(surface), path), block=block)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                pixels, path = item
+                try:
+                    save_pixels(pixels, path)
+                    self.written += 1
+                except (pygame.error, OSError) as e:
+                    self.errors.append((path, str(e)))
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Wait until every queued frame is written"""
+        self.queue.join()
+
+    def close(self):
+        """Write what is queued and stop the thread"""
+        self.queue.put(None)
+        self.thread.join()
+
+class ImageDiff:
+    """Result of comparing two images pixel by pixel"""
+    def __init__(self, delta, tolerance, max_mismatch):
+        self.delta = delta  # Per-pixel largest channel difference, (width, height)
+        self.mismatched = int(np.count_nonzero(delta > tolerance))
+        self.mismatch_ratio = self.mismatched / delta.size if delta.size else 0.0
+        self.max_delta = int(delta.max(initial=0))
+        self.passed = self.mismatch_ratio <= max_mismatch
+
+    def __bool__(self):
+        return self.passed
+
+    def diff_image(self):
+        """Red-on-black image of where the two inputs differ"""
+        pixels = np.zeros(self.delta.shape + (3,), dtype=np.uint8)
+        pixels[..., 0] = np.where(self.delta > 0, np.maximum(self.delta, 64), 0)
+        return pixels
+
+    def save(self, path):
+        """Write the diff image to path"""
+        save_pixels(self.diff_image(), path)
+
+def compare_images(actual, expected, tolerance=0, max_mismatch=0.0):
+    """Compare two pixel arrays (or image paths)
+
+    A pixel mismatches when any channel differs by more than tolerance;
+    the comparison passes when at most max_mismatch (a fraction) of the
+    pixels mismatch. Images of different sizes never pass.
+    """
+    if isinstance(actual, str):
+        actual = load_pixels(actual)
+    if isinstance(expected, str):
+        expected = load_pixels(expected)
+    if actual.shape != expected.shape:
+        diff = ImageDiff(np.full(actual.shape[:2], 255, dtype=np.uint8), tolerance, max_mismatch)
+        diff.passed = False
+        return diff
+    delta = np.abs(actual.astype(np.int16) - expected.astype(np.int16)).max(axis=2).astype(np.uint8)
+    return ImageDiff(delta, tolerance, max_mismatch)
@@ -1,7 +1,77 @@
 import pygame
+from graphics.assets import assets
 
 def create_player_sprite():
     """Create a simple circular player sprite"""
     surface = pygame.Surface((32, 32), pygame.SRCALPHA)
     pygame.draw.circle(surface, (0, 0, 255), (16, 16), 16)  # Blue circle
     return surface
+
+def player_sprite(manager=None):
+    """The shared player sprite, drawn once into the asset atlas"""
+    return (manager or assets).sprite('player', create_player_sprite)
+
+# Snowball sprite variants
+PLAIN = 'plain'  # White ball with a black outline
+COMPLETE = 'complete'  # Plain ball plus the light green ring of a finished snowman
+INDICATOR = 'indicator'  # Filled green disc drawn behind a stack target
+
+# Sprite background, never used by any snowball colour
+COLORKEY = (255, 0, 255)
+
+class SnowballSpriteCache:
+    """Pre-rendered snowball surfaces keyed by quantized radius and variant
+
+    Drawing a ball becomes a single blit instead of two or three
+    draw.circle calls. Sprites are opaque with an RLE colorkey rather than
+    per-pixel alpha, which blits several times faster. With the default
+    step of one pixel they match what draw.circle puts on screen.
+    """
+    def __init__(self, step=1):
+        self.step = step
+        self.sprites = {}  # (radius, variant) -> (surface, offset)
+
+    def quantize(self, size):
+        """Radius used for a ball of the given size"""
+        radius = int(size)
+        if self.step > 1:
+            radius -= radius % self.step
+        return radius
+
+    def _render(self, radius, variant):
+        outer = radius + 2 if variant == COMPLETE else radius
+        surface = pygame.Surface((2 * outer + 1, 2 * outer + 1))
+        surface.fill(COLORKEY)
+        center = (outer, outer)
+        if variant == INDICATOR:
+            # Same opaque green the screen gets from draw.circle
+            pygame.draw.circle(surface, (0, 255, 0), center, radius)
+        else:
+            pygame.draw.circle(surface, (255, 255, 255), center, radius)
+            pygame.draw.circle(surface, (0, 0, 0), center, radius, 1)
+            if variant == COMPLETE:
+                pygame.draw.circle(surface, (200, 255, 200), center, radius + 2, 1)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return surface, outer
+
+    def get(self, size, variant=PLAIN):
+        """Return (surface, offset); blit it at center minus offset"""
+        key = (self.quantize(size), variant)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self._render(key[0], variant)
+            self.sprites[key] = sprite
+        return sprite
+
+    def prewarm(self, min_size, max_size):
+        """Render every radius between min_size and max_size up front"""
+        for radius in range(self.quantize(min_size), int(max_size) + 1):
+            for variant in (PLAIN, COMPLETE):
+                self.get(radius, variant)
+            self.get(radius + 5, INDICATOR)
+
+    def clear(self):
+        """Drop all sprites, e.g. after the display format changes"""
+        self.sprites.clear()
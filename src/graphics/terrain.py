@@ -0,0 +1,51 @@
+import numpy as np
+import pygame
+from pygame import Rect
+
+GROUND_COLOR = (140, 185, 140)  # Where every bit of snow has been scooped up
+
+class TerrainSurface:
+    """Cached picture of a SnowTerrain, repainted only where tiles changed
+
+    The surface starts as a flat snow_color (exactly the zone colour when
+    the snow is untouched). refresh() writes the new shade of each dirty
+    tile straight into the pixels, so a frame costs nothing while the snow
+    is still and only the changed tiles otherwise.
+    """
+    def __init__(self, terrain, snow_color, ground_color=GROUND_COLOR):
+        self.terrain = terrain
+        self.surface = pygame.Surface(terrain.rect.size, 0, 32)
+        self.surface.fill(snow_color)
+        # Packed pixel value for every shade level
+        levels = terrain.levels
+        shades = [
+            tuple(round(g + (s - g) * level / levels) for s, g in zip(snow_color, ground_color))
+            for level in range(levels + 1)
+        ]
+        self.palette = np.array([self.surface.map_rgb(shade) for shade in shades], dtype=np.uint32)
+
+    def refresh(self):
+        """Repaint dirty tiles; returns the repainted area in world coordinates, or None"""
+        xs, ys = self.terrain.take_dirty()
+        if not len(xs):
+            return None
+        tile = self.terrain.tile_size
+        width, height = self.surface.get_size()
+        values = self.palette[self.terrain.level[xs, ys]]
+        pixels = pygame.surfarray.pixels2d(self.surface)
+        try:
+            # One scatter per pixel inside a tile
+            for dx in range(tile):
+                for dy in range(tile):
+                    px = xs * tile + dx
+                    py = ys * tile + dy
+                    keep = (px < width) & (py < height)  # Edge tiles may be cut off
+                    if keep.all():
+                        pixels[px, py] = values
+                    else:
+                        pixels[px[keep], py[keep]] = values[keep]
+        finally:
+            del pixels  # Unlock the surface
+        x0, y0 = int(xs.min()), int(ys.min())
+        area = Rect(x0 * tile, y0 * tile, (int(xs.max()) - x0 + 1) * tile, (int(ys.max()) - y0 + 1) * tile)
+        return area.clip(self.surface.get_rect()).move(self.terrain.rect.topleft)
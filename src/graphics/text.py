@@ -0,0 +1,86 @@
+from collections import OrderedDict
+import pygame
+
+# (font name, size) -> pygame.font.Font; None is pygame's default font
+_fonts = {}
+
+def get_font(name, size):
+    """Return a shared Font, creating it on first use"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+def clear_fonts():
+    """Drop every cached Font (they are invalid once pygame.font quits)"""
+    _fonts.clear()
+
+pygame.register_quit(clear_fonts)
+
+class TextCache:
+    """LRU cache of rendered text surfaces
+
+    Entries are keyed by (font, size, text, antialias, color) and evicted
+    least recently used first once either the entry or the byte budget
+    is exceeded.
+    """
+    def __init__(self, max_entries=256, max_bytes=4 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (surface, bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def render(self, text, size, color, antialias=True, font=None):
+        """Return a surface with the rendered text, reusing earlier renders"""
+        key = (font, size, text, antialias, tuple(color))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        surface = get_font(font, size).render(text, antialias, color)
+        nbytes = surface.get_bytesize() * surface.get_width() * surface.get_height()
+        self.entries[key] = (surface, nbytes)
+        self.bytes += nbytes
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        """Forget every cached surface and reset the counters"""
+        self.entries.clear()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return hit/miss counters and memory use as a dict"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+# Shared cache for menus, zone labels and HUD text
+text_cache = TextCache()
+
+def render_text(text, size, color, antialias=True, font=None):
+    """Render text through the shared cache"""
+    return text_cache.render(text, size, color, antialias, font)
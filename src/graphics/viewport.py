@@ -0,0 +1,89 @@
+import pygame
+from pygame import Rect
+
+class Viewport:
+    """Maps the logical screen onto the frame being drawn and the display
+
+    Game code lays out everything in logical coordinates (the 800x600
+    screen the game was designed for). Frames are drawn at render_scale
+    times that size and stretched to the display when presented, so a
+    weak device can draw a quarter of the pixels at scale 0.5 and pay
+    for one scale per frame instead. At scale 1 on a display of the
+    logical size, frames go straight to the display and every mapping
+    returns its input unchanged.
+    """
+    def __init__(self, logical_size, render_scale=1.0, display_size=None, smooth=False):
+        self.logical_size = tuple(logical_size)
+        self.display_size = tuple(display_size or logical_size)
+        self.scale = render_scale
+        self.size = tuple(max(1, round(side * render_scale)) for side in self.logical_size)
+        self.smooth = smooth  # smoothscale instead of nearest-neighbour when presenting
+        self.direct = render_scale == 1 and self.display_size == self.logical_size
+        self.frame = None  # Offscreen surface frames are drawn on, unless direct
+        self._images = {}  # Surface -> its copy at render scale
+
+    @property
+    def scaled(self):
+        return self.scale != 1
+
+    def target(self, display):
+        """The surface to draw the next frame on: display itself, or the offscreen frame"""
+        if self.direct:
+            return display
+        if self.frame is None:
+            # Same pixel format as the display, so presenting never converts
+            self.frame = pygame.Surface(self.size, 0, display)
+        return self.frame
+
+    def present(self, display):
+        """Stretch the offscreen frame over the whole display"""
+        if self.direct:
+            return
+        if self.frame.get_size() == display.get_size():
+            display.blit(self.frame, (0, 0))
+        elif self.smooth and display.get_bitsize() in (24, 32):
+            pygame.transform.smoothscale(self.frame, display.get_size(), display)
+        else:
+            pygame.transform.scale(self.frame, display.get_size(), display)
+
+    def point(self, point):
+        """Logical point on the frame"""
+        if self.scale == 1:
+            return point
+        return int(point[0] * self.scale), int(point[1] * self.scale)
+
+    def length(self, value):
+        """Logical distance (a radius, font size or line width) on the frame"""
+        if self.scale == 1:
+            return value
+        return max(1, int(value * self.scale))
+
+    def rect(self, rect):
+        """Logical rect on the frame; both corners are scaled so neighbours still meet"""
+        if self.scale == 1:
+            return rect
+        left, top = self.point(rect.topleft)
+        right, bottom = self.point(rect.bottomright)
+        return Rect(left, top, right - left, bottom - top)
+
+    def image(self, surface, size=None):
+        """surface resized to render scale (or to size), cached until forget(surface)"""
+        if self.scale == 1:
+            return surface
+        if size is None:
+            size = tuple(max(1, round(side * self.scale)) for side in surface.get_size())
+        image = self._images.get(surface)
+        if image is None or image.get_size() != tuple(size):
+            image = self._images[surface] = pygame.transform.scale(surface, size)
+        return image
+
+    def forget(self, surface):
+        """Drop the scaled copy of a surface whose pixels changed"""
+        self._images.pop(surface, None)
+
+    def to_logical(self, position):
+        """Display position (e.g. a mouse click) in logical coordinates"""
+        if self.display_size == self.logical_size:
+            return position
+        return (position[0] * self.logical_size[0] // self.display_size[0],
+                position[1] * self.logical_size[1] // self.display_size[1])
@@ -3,32 +3,110 @@ Snowball Snowman - A creative puzzle game about building snowmen!
 """
 import os
 import sys
-import argparse
+import time
+import numpy as np
 import pygame
 from pygame import Rect, Surface
 from game.player import Player
 from game.snowman import Snowball
-from game.world import World
+from game.world import World, Camera, generate_world, ROLLING, BUILDING
 from game.snowman import Snowman
+from game.spatial import SnowballIndex
+from game.stacking import find_stackable_snowball, stack_placed_ball
+from game.store import SnowballStore
+from game.pool import SnowballPool
+from game.rewind import RewindBuffer, restore
+from game.terrain import SnowTerrain, growth_from_snow
+from game.temperature import TemperatureField
+from game.level import LevelFile, LevelStream
+from game.scoring import ScoreStore, SnowmanScore, default_score_path
+from game.controls import KeyboardInput, BotInput
+from graphics.renderer import NullRenderer
+from graphics.dirty import DirtyRectRenderer
+from graphics.text import render_text
+from graphics.sprites import SnowballSpriteCache, PLAIN, COMPLETE, INDICATOR
+from graphics.screenshots import ScreenshotWriter
+from graphics.particles import ParticleSystem, emit_confetti, emit_snowfall
+from graphics.terrain import TerrainSurface
+from graphics.assets import assets, default_cache_dir
+from graphics.viewport import Viewport
+from utils.timestep import FixedTimestep
+from utils.profiler import FrameProfiler, NullProfiler
 
-# Parse command line arguments
-parser = argparse.ArgumentParser()
-parser.add_argument('--agent', action='store_true', help='Enable agent mode for automated testing')
+def window_size(text):
+    """argparse type for WIDTHxHEIGHT; a ValueError becomes a usage error"""
+    width, height = (int(value) for value in text.lower().split('x'))
+    if width <= 0 or height <= 0:
+        raise ValueError(text)
+    return width, height
+
+def render_scale(text):
+    """argparse type for a render scale above zero"""
+    scale = float(text)
+    if not scale > 0:
+        raise ValueError(text)
+    return scale
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    import argparse  # Only scripts pay for it, not importers
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--agent', action='store_true', help='Enable agent mode for automated testing')
+    parser.add_argument('--headless', action='store_true', help='Run the simulation without a display')
+    parser.add_argument('--ticks', type=int, default=10000, help='Number of ticks to simulate in headless mode')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for the headless bot')
+    parser.add_argument('--tick-rate', type=int, default=60, help='Simulation ticks per second')
+    parser.add_argument('--fps', type=int, default=60, help='Render frame cap (0 for uncapped)')
+    parser.add_argument('--dirty-rects', action='store_true', help='Only redraw and present changed screen regions (at render scale 1)')
+    parser.add_argument('--render-scale', type=render_scale, default=1.0,
+                        help='Draw frames at this fraction of 800x600 and scale them to the window, e.g. 0.5')
+    parser.add_argument('--smooth-scale', action='store_true', help='Present scaled frames with smoothscale')
+    parser.add_argument('--window', type=window_size, help='Window size as WIDTHxHEIGHT (default 800x600)')
+    parser.add_argument('--profile', action='store_true', help='Time each phase of the main loop')
+    parser.add_argument('--profile-overlay', action='store_true', help='Show p50/p95/p99 frame times on screen')
+    parser.add_argument('--profile-out', help='Export profiler samples to this .csv or .json file at exit')
+    parser.add_argument('--capture-dir', help='Save rendered frames to this directory in the background')
+    parser.add_argument('--capture-every', type=int, default=1, help='Capture every Nth frame')
+    parser.add_argument('--world-size', help='Play on a generated WIDTHxHEIGHT world, e.g. 50000x50000')
+    parser.add_argument('--campfires', action='store_true', help='Put a campfire that melts nearby snowballs in every building zone')
+    parser.add_argument('--level', help='Play a level file (.ssl), streamed in as the camera moves')
+    parser.add_argument('--player', default=os.environ.get('USER', 'player'), help='Name scores are recorded under')
+    parser.add_argument('--scores', help='Score database (default: per-user; headless runs record only with this)')
+    return parser.parse_args(argv)
 
 # Only parse args if script is run directly
 if __name__ == '__main__':
-    args = parser.parse_args()
-    DEBUG_AUTO_CLOSE = args.agent
+    args = parse_args()
 else:
     # For testing, create a mock args object
     class Args:
         def __init__(self):
             self.agent = False
+            self.headless = False
+            self.ticks = 10000
+            self.seed = None
+            self.tick_rate = 60
+            self.fps = 60
+            self.dirty_rects = False
+            self.render_scale = 1.0
+            self.smooth_scale = False
+            self.window = None
+            self.profile = False
+            self.profile_overlay = False
+            self.profile_out = None
+            self.capture_dir = None
+            self.capture_every = 1
+            self.world_size = None
+            self.level = None
+            self.campfires = False
+            self.player = 'player'
+            self.scores = None
     args = Args()
 
-# Initialize pygame
-pygame.init()
-pygame.font.init()
+HEADLESS = args.headless  # True if simulating without a display
+DEBUG_AUTO_CLOSE = args.agent
+
+# Nothing here initializes SDL; main() and init_screen() do that
 
 # Window dimensions
 WIDTH = 800
@@ -44,9 +122,35 @@ WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0, 100)  # Semi-transparent green for stacking indicator
 
+# Simulation timing
+MAX_CATCH_UP_TICKS = 5  # Most ticks simulated in one rendered frame
+
+# Large worlds
+VIEW_MARGIN = 320  # Covers a ball's radius and how far a snowman reaches above its base
+
+# Celebration particles
+PARTICLE_BUDGET = 4096  # Most particles alive at once
+CONFETTI_BURST = 800  # Confetti thrown when a snowman is completed
+SNOWFALL_PER_TICK = 4  # Snowflakes added each tick while celebrating
+
+# Snow on the ground
+SNOW_TILE = 4  # Pixels per side of a snow-depth tile
+
+# Temperature
+TEMPERATURE_CELL = 32  # Pixels per side of a temperature cell
+TEMPERATURE_MAX_CELLS = 512  # Most cells across; large worlds get coarser cells
+CAMPFIRE_HEAT = 8.0  # Degrees per second a campfire adds to the cells around it
+CAMPFIRE_RADIUS = 48
+CAMPFIRE_INSET = 60  # Distance from a building zone's bottom-right corner
+MELT_RATE = 0.05  # Pixels of radius lost per second per degree above freezing
+
+# Rewind
+REWIND_SECONDS = 3  # How far the R key steps back
+REWIND_BUDGET = 8 * 1024 * 1024  # Bytes of history kept
+
 # Debug settings
 AGENT_MODE = args.agent  # True if running in agent/test mode
-DEBUG_START_TIME = pygame.time.get_ticks()  # Get the start time
+DEBUG_START_TIME = 0  # pygame ticks when main() started
 
 # Game state variables
 _game_state = MENU  # Start in menu state
@@ -54,6 +158,21 @@ player = None
 active_snowball = None
 placed_snowballs = []
 snowmen = []
+snowball_index = SnowballIndex()  # Free placed balls, for stack-target lookup
+snowball_store = SnowballStore()  # Array-backed state of every placed ball
+rewind_buffer = RewindBuffer(REWIND_BUDGET)  # Recent world states for rewinding
+snowball_pool = SnowballPool()  # Recycled balls, kept across games
+particles = ParticleSystem(PARTICLE_BUDGET)  # Celebration snow and confetti
+snow_fields = {}  # Rolling zone -> TerrainSurface over its SnowTerrain, made on first use, dropped out of range
+particle_rng = None  # NumPy Generator for particles, made by init_game()
+game_tick = 0  # Ticks played since the game started
+snowman_started = {}  # Snowman -> game_tick when its second ball was stacked
+session_points = 0  # Including pending_scores
+session_snowmen = 0
+pending_scores = []  # (rewind tick, SnowmanScore) a rewind can still undo, oldest first
+score_store = None  # ScoreStore opened by main(); None records nothing
+keyboard_input = KeyboardInput()  # Default input provider
+profiler = NullProfiler()  # Replaced by a FrameProfiler with --profile
 
 def get_game_state():
     """Get the current game state"""
@@ -67,219 +186,541 @@ def set_game_state(state):
 
 def init_game():
     """Initialize the game state"""
-    global _game_state, player, active_snowball, placed_snowballs, snowmen
+    global _game_state, player, active_snowball, placed_snowballs, snowmen, snowball_index, snowball_store, rewind_buffer
+    global _background, particle_rng, game_tick
     set_game_state(MENU)
+    settle_scores(everything=True)  # The old game's history goes with its rewind buffer
+    recycle_snowballs()
+    particles.clear()
+    if particle_rng is None:
+        particle_rng = np.random.default_rng(args.seed)
+    snow_fields.clear()
+    temperature.reset()
+    if level_stream is not None:
+        level_stream.reset()  # Its balls were just recycled
+    _background = None  # Drawn with the old snow
+    game_tick = 0
+    snowman_started.clear()
     player = None
     active_snowball = None
     placed_snowballs = []
     snowmen = []
+    snowball_index = SnowballIndex()
+    snowball_store = SnowballStore()
+    rewind_buffer = RewindBuffer(REWIND_BUDGET)
 
 def reset_game():
     """Reset the game objects without changing state"""
-    global player, active_snowball, placed_snowballs, snowmen
+    global player, active_snowball, placed_snowballs, snowmen, snowball_index, snowball_store, rewind_buffer
+    recycle_snowballs()
     player = None
     active_snowball = None
     placed_snowballs = []
     snowmen = []
+    snowball_index = SnowballIndex()
+    snowball_store = SnowballStore()
+    rewind_buffer = RewindBuffer(REWIND_BUDGET)
+
+def recycle_snowballs():
+    """Hand every ball in the current world back to the pool"""
+    snowball_store.clear()
+    world.clear_balls()
+    for ball in placed_snowballs:
+        snowball_pool.release(ball)
+    if player and player.rolling_snowball:
+        snowball_pool.release(player.rolling_snowball)
+
+def start_game():
+    """Switch to the playing state with a fresh player"""
+    global player
+    set_game_state(PLAYING)
+    player = Player(*level_stream.level.spawn) if level_stream is not None else Player(WIDTH // 2, HEIGHT // 2)
+    camera.follow(player.position)
+    sync_active_chunks()
+    print("Game started!")
+
+def rewind_game(seconds=REWIND_SECONDS):
+    """Step the world back in time, returning False if there is no history"""
+    global placed_snowballs, snowmen, snowball_index
+    state = rewind_buffer.rewind(int(seconds * args.tick_rate))
+    if state is None:
+        return False
+    undo_scores(rewind_buffer.tick)
+    dropped = set(snowball_store.balls[state[0]:])  # Placed after the restored tick
+    rebuilt = restore(state, player, snowball_store, snowball_pool)
+    # Snowmen in inactive chunks are not in the store, and are left as they are
+    snowmen = rebuilt + [
+        snowman for snowman in snowmen
+        if snowman.base is not None and snowman.base._store is None and snowman.base not in dropped
+    ]
+    placed_snowballs = [ball for ball in placed_snowballs if ball not in dropped]
+    for ball in dropped:
+        world.remove_ball(ball)
+        snowball_pool.release(ball)
+    snowball_index = SnowballIndex()
+    for ball in placed_snowballs:
+        snowball_index.track(ball)
+    set_game_state(PLAYING)  # A completed snowman may have been undone
+    dirty_renderer.invalidate()
+    return True
 
 def handle_mouse_click(pos):
     """Handle mouse click events"""
     if get_game_state() == MENU:
-        if play_button_rect.collidepoint(pos):
-            set_game_state(PLAYING)
-            global player
-            player = Player(WIDTH // 2, HEIGHT // 2)
-            print("Game started!")
+        if load_play_button()[1].collidepoint(pos):
+            start_game()
 
 def on_mouse_down(pos):
     """Handle mouse down event (compatibility wrapper)"""
     handle_mouse_click(pos)
 
-# Set up the display
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Snowball Snowman")
-clock = pygame.time.Clock()
+# Play button, loaded on first use
+PLAY_BUTTON = 'play_button.png'
+play_button_img = None
+play_button_rect = None
 
-# Load play button
-play_button_img = pygame.image.load(os.path.join('src', 'images', 'play_button.png'))
-play_button_rect = play_button_img.get_rect()
-play_button_rect.centerx = WIDTH // 2
-play_button_rect.centery = 2 * HEIGHT // 3
+def load_play_button():
+    """Return (image, rect) of the play button, loading it if needed"""
+    global play_button_img, play_button_rect
+    if play_button_img is None:
+        play_button_img = assets.image(PLAY_BUTTON)
+        play_button_rect = play_button_img.get_rect(center=(WIDTH // 2, 2 * HEIGHT // 3))
+    return play_button_img, play_button_rect
 
 # Game objects
-world = World(WIDTH, HEIGHT)
+def create_world():
+    """The single-screen world, or a generated one with --world-size"""
+    if args.world_size:
+        width, height = (int(value) for value in args.world_size.lower().split('x'))
+        return generate_world(width, height, args.seed)
+    return World(WIDTH, HEIGHT)
+
+def create_temperature():
+    """Temperature over the world, with a campfire in every building zone with --campfires"""
+    cell = max(TEMPERATURE_CELL, -(-max(world.width, world.height) // TEMPERATURE_MAX_CELLS))
+    field = TemperatureField(world.rect, cell)
+    for zone in world.zones:
+        if args.campfires and zone.kind == BUILDING:
+            position = (zone.rect.right - CAMPFIRE_INSET, zone.rect.bottom - CAMPFIRE_INSET)
+            field.add_source(position, CAMPFIRE_HEAT, CAMPFIRE_RADIUS)
+    return field
+
+world = create_world()
+camera = Camera(WIDTH, HEIGHT, world)  # Follows the player
+
+def create_viewport():
+    """The window and internal render resolution from --window and --render-scale"""
+    return Viewport((WIDTH, HEIGHT), args.render_scale, args.window, args.smooth_scale)
+
+viewport = Viewport((WIDTH, HEIGHT))  # Logical screen -> drawn frame; replaced by main()
+temperature = create_temperature()
+level_stream = None  # LevelStream of the level being played, if any
+
+def load_level(path=None):
+    """Play the level file at path, or the built-in world if None"""
+    global world, camera, temperature, level_stream
+    init_game()  # Recycles the current world's balls
+    if level_stream is not None:
+        level_stream.level.close()
+        level_stream = None
+    if path is None:
+        world = create_world()
+    else:
+        level = LevelFile(path)
+        world = level.build_world()
+        level_stream = LevelStream(level, snowball_pool)
+    camera = Camera(WIDTH, HEIGHT, world)
+    temperature = create_temperature()
 
 def draw_menu(screen):
     """Draw the main menu with Snowball Snowman title and play button"""
     screen.fill(BLACK)
     
     # Draw title
-    title_font = pygame.font.Font(None, 64)
-    title_text = title_font.render("Snowball Snowman", True, WHITE)
-    title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT // 3))
+    title_text = render_text("Snowball Snowman", viewport.length(64), WHITE)
+    title_rect = title_text.get_rect(center=viewport.point((WIDTH // 2, HEIGHT // 3)))
     screen.blit(title_text, title_rect)
     
     # Draw play button
-    screen.blit(play_button_img, play_button_rect)
+    image, rect = load_play_button()
+    rect = viewport.rect(rect)
+    screen.blit(viewport.image(image, rect.size), rect)
     
     # Draw debug outline for play button in agent mode
     if AGENT_MODE:
-        pygame.draw.rect(screen, (255, 0, 0), play_button_rect, 1)
+        pygame.draw.rect(screen, (255, 0, 0), rect, 1)
 
 def update():
     """Update game state"""
     if get_game_state() == PLAYING:
         handle_input()
+    elif get_game_state() == CELEBRATION:
+        update_celebration()
+
+def simulate(timestep, frame_time):
+    """Run the ticks due after frame_time seconds, charged to 'update' in every game state"""
+    for _ in range(timestep.advance(frame_time)):
+        update()
+    profiler.mark('update')
+
+def record_snowman(snowman):
+    """Score a finished snowman and queue it for the leaderboard"""
+    global session_points, session_snowmen
+    started = snowman_started.pop(snowman, None)
+    build_seconds = None if started is None else (game_tick - started) / args.tick_rate
+    score = SnowmanScore.of(args.player, snowman, build_seconds)
+    session_points += score.points
+    session_snowmen += 1
+    pending_scores.append((rewind_buffer.tick, score))
+    settle_scores()
+    print(f"Scored {score.points} points!")
+    return score
+
+def settle_scores(everything=False):
+    """Submit pending scores that no rewind can reach any more"""
+    oldest = rewind_buffer.oldest_tick
+    while pending_scores and (everything or oldest is None or pending_scores[0][0] <= oldest):
+        _, score = pending_scores.pop(0)
+        if score_store is not None:
+            score_store.submit(score)
+
+def undo_scores(tick):
+    """Take back the scores of snowmen finished at or after tick"""
+    global session_points, session_snowmen
+    while pending_scores and pending_scores[-1][0] >= tick:
+        _, score = pending_scores.pop()
+        session_points -= score.points
+        session_snowmen -= 1
+
+def celebrate(snowman):
+    """Throw confetti from the top of a finished snowman"""
+    top = snowman.head or snowman.middle or snowman.base
+    emit_confetti(particles, top.position, CONFETTI_BURST, particle_rng)
+
+def update_celebration():
+    """One tick of the celebration: snow keeps falling over the view"""
+    emit_snowfall(particles, camera.rect, SNOWFALL_PER_TICK, particle_rng)
+    particles.update(1 / args.tick_rate)
 
-def draw_screen(screen):
-    """Draw the current game state"""
+def draw_screen(screen, alpha=1.0):
+    """Draw the current game state
+
+    alpha is how far the frame lies between the previous and the current
+    simulation tick, used to interpolate moving objects.
+    """
     if get_game_state() == MENU:
         draw_menu(screen)
-    elif get_game_state() == PLAYING:
-        draw_game(screen)
+    elif get_game_state() in (PLAYING, CELEBRATION):
+        draw_game(screen, alpha)
+        particles.draw(screen, camera.offset, viewport.scale)
+
+def handle_input(controls=None):
+    """Handle one tick of input for the game
 
-def handle_input():
-    """Handle keyboard input for the game"""
-    global player, placed_snowballs, snowmen
+    controls is any input provider with a poll() method returning an
+    InputState; it defaults to the real keyboard and event queue.
+    """
+    global player, placed_snowballs, snowmen, game_tick
     
     # Auto-close after 5 seconds in agent mode
     if AGENT_MODE and pygame.time.get_ticks() - DEBUG_START_TIME > 5000:
         print("Agent mode: Auto-closing after 5 seconds")
         return False
     
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            return False
-        elif event.type == pygame.MOUSEBUTTONDOWN and get_game_state() == MENU:
-            if play_button_rect.collidepoint(event.pos):
-                set_game_state(PLAYING)
-                player = Player(WIDTH // 2, HEIGHT // 2)
-                print("Game started!")
+    inputs = (controls or keyboard_input).poll()
+    if inputs.quit:
+        return False
+    for pos in inputs.clicks:
+        if get_game_state() == MENU and load_play_button()[1].collidepoint(pos):
+            start_game()
     
     if get_game_state() == PLAYING and player:
-        keys = pygame.key.get_pressed()
-        dx = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
-        dy = keys[pygame.K_DOWN] - keys[pygame.K_UP]
-        player.move(dx, dy)
+        if inputs.rewind:
+            rewind_game()
+            return True
+        game_tick += 1
+        player.previous_position.update(player.position)
+        player.move(inputs.dx, inputs.dy)
+        camera.follow(player.position)
+        sync_active_chunks()
         
-        if keys[pygame.K_SPACE]:
-            player.start_rolling(world)
+        if inputs.roll:
+            player.start_rolling(world, snowball_pool)
         elif player.rolling_snowball:
             placed = player.place_snowball(world)
             if placed:
                 # Try to stack the snowball
-                stackable = find_stackable_snowball(placed, placed_snowballs, snowmen)
+                stackable, snowman = stack_placed_ball(placed, placed_snowballs, snowmen, snowball_index)
                 if stackable:
-                    placed.stack_on(stackable)
                     print("Stacked snowball!")
-                    
-                    # Check if this creates or adds to a snowman
-                    added_to_snowman = False
-                    for snowman in snowmen:
-                        if stackable in snowman.all_balls:
-                            snowman.add_ball(placed)
-                            added_to_snowman = True
-                            if snowman.is_complete:
-                                print("Snowman completed!")
-                                if get_game_state() != CELEBRATION:
-                                    set_game_state(CELEBRATION)
-                            break
-                    
-                    if not added_to_snowman and not stackable.stacked_on:
-                        # Start a new snowman with these balls
-                        snowmen.append(Snowman(stackable))
-                        snowmen[-1].add_ball(placed)
+                    if snowman:
+                        snowman_started.setdefault(snowman, game_tick)
+                    if snowman and snowman.is_complete:
+                        print("Snowman completed!")
+                        record_snowman(snowman)
+                        celebrate(snowman)
+                        if get_game_state() != CELEBRATION:
+                            set_game_state(CELEBRATION)
                 
-                placed_snowballs.append(placed)
+                add_placed_snowball(placed)
+        profiler.mark('input')
         
-        # Update all snowballs
-        if player.rolling_snowball:
-            player.rolling_snowball.update(player.position)
-        for snowball in placed_snowballs:
-            snowball.update(snowball.position)
+        # Update all snowballs; the rolling one grows by the snow it picks up
+        rolling = player.rolling_snowball
+        if rolling:
+            growth = 0.0
+            terrain = snow_terrain_at(player.position)
+            if terrain is not None and rolling.size < rolling.max_size:
+                growth = growth_from_snow(terrain.collect(player.position, rolling.size), rolling.size)
+            rolling.update(player.position, growth)
+        for field in snow_fields.values():
+            field.terrain.regenerate(1 / args.tick_rate)
+        margin = world.active_margin
+        elapsed = temperature.step(1 / args.tick_rate, camera.rect.inflate(2 * margin, 2 * margin))
+        if elapsed:
+            melt_snowballs(elapsed)
+        snowball_store.update()
+        rewind_buffer.record(player, snowball_store)
+        if pending_scores:
+            settle_scores()
+        if particles.count:
+            particles.update(1 / args.tick_rate)  # Leftover confetti after a rewind
+        profiler.mark('snowballs')
     
     return True
 
-def draw_game(screen):
-    """Draw the game screen with player, snowballs, and zones"""
-    # Draw world zones
-    pygame.draw.rect(screen, world.rolling_zone_color, world.rolling_zone)
-    pygame.draw.rect(screen, world.building_zone_color, world.building_zone)
+def add_placed_snowball(ball):
+    """Put a placed ball into the world, the array store and the stacking index"""
+    placed_snowballs.append(ball)
+    if world.add_ball(ball, ball.stacked_on):
+        snowball_store.add(ball)
+    snowball_index.track(ball)
+
+def melt_snowballs(dt):
+    """Shrink balls in warm air and take apart stacks that no longer hold"""
+    global snowmen
+    broken = temperature.melt(snowball_store, dt, MELT_RATE)
+    if not broken:
+        return
+    for ball in broken:
+        if ball.snowman is not None:
+            ball.snowman.dismantle()
+        elif ball.stacked_on is not None:
+            ball.unstack()
+    snowmen = [snowman for snowman in snowmen if snowman.base is not None]
+
+def sync_active_chunks():
+    """Only simulate balls in chunks near the camera"""
+    if level_stream is not None:
+        stream_level()
+    if snow_fields:
+        drop_distant_snow()
+    activated, deactivated = world.update_active(camera.rect)
+    if not activated and not deactivated:
+        return
+    for ball in deactivated:
+        snowball_store.remove(ball)
+    for ball in activated:
+        snowball_store.add(ball)
+    rewind_buffer.clear()  # Store slots moved, so older history no longer lines up
+
+def stream_level():
+    """Place the level's balls in regions coming into range"""
+    margin = world.active_margin
+    balls, new_snowmen = level_stream.load(camera.rect.inflate(2 * margin, 2 * margin))
+    if not balls:
+        return
+    for ball in balls:
+        add_placed_snowball(ball)
+    snowmen.extend(new_snowmen)
+    rewind_buffer.clear()  # Do not rewind to before they were there
+
+def drop_distant_snow():
+    """Forget the snow of rolling zones outside the active area; it is whole again on return"""
+    margin = world.active_margin
+    area = camera.rect.inflate(2 * margin, 2 * margin)
+    for zone in [zone for zone in snow_fields if not zone.rect.colliderect(area)]:
+        viewport.forget(snow_fields.pop(zone).surface)
+
+def snow_terrain_at(position):
+    """The SnowTerrain of the rolling zone under position, or None"""
+    zone = world.zone_at(position, ROLLING)
+    if zone is None:
+        return None
+    field = snow_fields.get(zone)
+    if field is None:
+        field = snow_fields[zone] = TerrainSurface(SnowTerrain(zone.rect, SNOW_TILE), zone.color)
+    return field.terrain
+
+def refresh_snow():
+    """Repaint changed snow tiles; returns the changed areas in world coordinates"""
+    areas = []
+    for field in snow_fields.values():
+        area = field.refresh()
+        if area is not None:
+            areas.append(area)
+            viewport.forget(field.surface)
+    return areas
+
+def draw_zones(screen, area=None):
+    """Draw the zones in view, their snow and their labels
+
+    With area (screen coordinates), only that part of the screen is drawn.
+    """
+    view = camera.rect
+    if area is not None:
+        screen.set_clip(area)
+    if not world.rect.contains(view):
+        screen.fill(BLACK)
+    zones = world.zones_in(view)
+    for zone in zones:
+        field = snow_fields.get(zone)
+        rect = viewport.rect(zone.rect.move(-view.x, -view.y))
+        if field is not None:
+            screen.blit(viewport.image(field.surface, rect.size), rect)
+        else:
+            pygame.draw.rect(screen, zone.color, rect)
+    draw_campfires(screen)
+    if level_stream is not None:
+        draw_targets(screen)
     
     # Draw zone labels
-    font = pygame.font.Font(None, 36)
-    snowball_text = font.render("SNOWBALL", True, (255, 0, 0))  # Red
-    snowman_text = font.render("SNOWMAN", True, (0, 100, 0))  # Dark green
-    
-    screen.blit(snowball_text, (world.width//4 - snowball_text.get_width()//2, 30))
-    screen.blit(snowman_text, (3*world.width//4 - snowman_text.get_width()//2, 30))
-    
-    # Draw player
+    for zone in zones:
+        if zone.label:
+            text = render_text(zone.label, viewport.length(36), zone.label_color)
+            x, y = viewport.point((zone.rect.centerx - view.x, zone.rect.top + 30 - view.y))
+            screen.blit(text, (x - text.get_width()//2, y))
+    if area is not None:
+        screen.set_clip(None)
+
+def draw_campfires(screen):
+    """Draw every heat source in view as a small fire"""
+    view = camera.rect.inflate(2 * CAMPFIRE_RADIUS, 2 * CAMPFIRE_RADIUS)
+    for position, _, _ in temperature.sources:
+        if view.collidepoint(position):
+            x, y = camera.to_screen(position)
+            pygame.draw.circle(screen, (230, 90, 20), viewport.point((x, y)), viewport.length(12))
+            pygame.draw.circle(screen, (255, 210, 60), viewport.point((x, y + 3)), viewport.length(6))
+
+def draw_targets(screen):
+    """Outline the level's snowman targets in view"""
+    view = camera.rect
+    for x, y, radius, _ in level_stream.targets_in(view).tolist():
+        center = viewport.point(camera.to_screen((int(x), int(y))))
+        pygame.draw.circle(screen, (120, 120, 255), center, viewport.length(int(radius)), viewport.length(2))
+
+def thermometer(position):
+    """(surface, rect) of the temperature readout for the top-right corner"""
+    degrees = int(round(temperature.temperature_at(position)))
+    color = (200, 40, 0) if degrees > 0 else (0, 60, 160)
+    surface = render_text("%d\u00b0C" % degrees, viewport.length(32), color)
+    return surface, surface.get_rect(topright=viewport.point((WIDTH - 10, 10)))
+
+def snowball_sprite(position, size, variant=PLAIN):
+    """Return (surface, rect) to blit a snowball sprite centred on position
+
+    position is in world coordinates; the rect is on the drawn frame.
+    """
+    view = camera.rect
+    x, y = int(position.x) - view.x, int(position.y) - view.y
+    scale = viewport.scale
+    if scale != 1:
+        # Viewport.point and length inlined; this runs for every ball on screen
+        size, x, y = size * scale, int(x * scale), int(y * scale)
+    surface, offset = snowball_sprites.get(size, variant)
+    rect = surface.get_rect(topleft=(x - offset, y - offset))
+    return surface, rect
+
+def game_drawables(alpha=1.0):
+    """Everything drawn over the zones, in draw order
+
+    Each entry is (key, rect, surface): the surface is blitted at rect, and
+    a different surface or rect for the same key means it changed.
+    """
+    items = []
     if player:
-        player.draw(screen)
+        # The rolling snowball follows the player, so both share the
+        # interpolated position
+        position = player.interpolated_position(alpha)
+        camera.follow(position)
+        surface = viewport.image(player.surface)
+        rect = surface.get_rect(center=viewport.point(position)).move(viewport.point(camera.offset))
+        items.append(('player', rect, surface))
         if player.rolling_snowball:
-            # Draw snowball
-            pygame.draw.circle(
-                screen,
-                WHITE,
-                (int(player.rolling_snowball.position.x), int(player.rolling_snowball.position.y)),
-                int(player.rolling_snowball.size)
-            )
-            pygame.draw.circle(
-                screen,
-                BLACK,
-                (int(player.rolling_snowball.position.x), int(player.rolling_snowball.position.y)),
-                int(player.rolling_snowball.size),
-                1  # Line width
-            )
+            surface, rect = snowball_sprite(position, player.rolling_snowball.size)
+            items.append(('rolling', rect, surface))
             
             # Draw stacking indicator if near a stackable ball
             if world.building_zone.collidepoint(player.position):
-                stackable = find_stackable_snowball(player.rolling_snowball, placed_snowballs, snowmen)
+                stackable = find_stackable_snowball(
+                    player.rolling_snowball, placed_snowballs, snowmen, snowball_index
+                )
                 if stackable:
-                    # Draw green circle around stackable ball
-                    pygame.draw.circle(
-                        screen,
-                        GREEN,
-                        (int(stackable.position.x), int(stackable.position.y)),
-                        int(stackable.size + 5)  # Slightly larger than the ball
-                    )
+                    # Green circle slightly larger than the ball
+                    surface, rect = snowball_sprite(stackable.position, stackable.size + 5, INDICATOR)
+                    items.append(('indicator', rect, surface))
     
-    # Draw placed snowballs and snowmen
-    for snowball in placed_snowballs:
-        pygame.draw.circle(
-            screen,
-            WHITE,
-            (int(snowball.position.x), int(snowball.position.y)),
-            int(snowball.size)
-        )
-        pygame.draw.circle(
-            screen,
-            BLACK,
-            (int(snowball.position.x), int(snowball.position.y)),
-            int(snowball.size),
-            1  # Line width
-        )
-        
-        # Draw completion indicator for complete snowmen
-        for snowman in snowmen:
-            if snowman.is_complete and snowball in snowman.all_balls:
-                pygame.draw.circle(
-                    screen,
-                    (200, 255, 200),  # Light green
-                    (int(snowball.position.x), int(snowball.position.y)),
-                    int(snowball.size + 2),
-                    1  # Line width
-                )
+    # Placed snowballs and snowmen, culled to the view
+    for snowball in world.balls_in(camera.rect, VIEW_MARGIN):
+        variant = PLAIN
+        if snowball.snowman and snowball.snowman.is_complete:
+            variant = COMPLETE  # Completion indicator for complete snowmen
+        surface, rect = snowball_sprite(snowball.position, snowball.size, variant)
+        items.append((snowball, rect, surface))
+    if player and temperature.sources:
+        surface, rect = thermometer(player.position)
+        items.append(('thermometer', rect, surface))
+    return items
+
+def draw_game(screen, alpha=1.0):
+    """Draw the game screen with player, snowballs, and zones"""
+    items = game_drawables(alpha)  # Moves the camera first
+    refresh_snow()
+    draw_zones(screen)
+    screen.blits([(surface, rect) for _, rect, surface in items], False)
+
+# Pre-rendered snowballs, one blit per ball
+snowball_sprites = SnowballSpriteCache()
+
+# Static background for dirty-rect rendering
+_background = None
+_background_view = None  # Camera position the background was drawn at
+dirty_renderer = DirtyRectRenderer()
+
+def draw_game_dirty(screen, alpha=1.0):
+    """Redraw only what changed since the last frame
+
+    Returns the rects to pass to pygame.display.update().
+    """
+    global _background, _background_view
+    items = game_drawables(alpha)  # Moves the camera first
+    snow = refresh_snow()
+    if (_background is None or _background.get_size() != screen.get_size()
+            or _background_view != camera.rect.topleft):
+        _background = Surface(screen.get_size())
+        draw_zones(_background)
+        _background_view = camera.rect.topleft
+        dirty_renderer.invalidate()  # Scrolling moves everything
+        snow = []
+    # Scooped or refilled snow changes the background itself
+    damaged = [area.move(-camera.rect.x, -camera.rect.y) for area in snow]
+    for area in damaged:
+        draw_zones(_background, area)
+    return dirty_renderer.render(screen, _background, items, damaged)
 
 # Initialize screen
 screen = None
 
 def init_screen():
     """Initialize the game screen"""
-    global screen
+    global screen, play_button_img
     if not screen:
-        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        screen = pygame.display.set_mode(viewport.display_size)
+        # Sprites rendered before the display existed are not in its format
+        assets.refresh()
+        play_button_img = None
+        snowball_sprites.clear()
+        snowball_sprites.prewarm(viewport.length(Snowball(0, 0).min_size), viewport.length(Snowball(0, 0).max_size))
     return screen
 
 def draw():
@@ -289,11 +730,91 @@ def draw():
         screen = init_screen()
     draw_screen(screen)
 
+def run_simulation(controls, renderer, max_ticks=None, keep_playing=False):
+    """Step the game as fast as possible, returning the number of ticks run
+
+    With keep_playing, a completed snowman does not end play, so soak
+    tests and bots can keep building.
+    """
+    ticks = 0
+    while max_ticks is None or ticks < max_ticks:
+        if not handle_input(controls):
+            break
+        if keep_playing and get_game_state() == CELEBRATION:
+            set_game_state(PLAYING)
+        renderer.render()
+        renderer.present()
+        ticks += 1
+    return ticks
+
+def run_headless(max_ticks, seed=None):
+    """Run a bot-driven game with no display and report ticks/sec"""
+    init_game()
+    start_game()
+    controls = BotInput(world, player.position, seed)
+    start = time.perf_counter()
+    ticks = run_simulation(controls, NullRenderer(), max_ticks, keep_playing=True)
+    elapsed = time.perf_counter() - start
+    print(f"Headless: {ticks} ticks in {elapsed:.2f}s ({ticks / elapsed:.0f} ticks/sec), "
+          f"{len(placed_snowballs)} balls placed, {len(snowmen)} snowmen")
+    return ticks
+
+# Profiler overlay, refreshed a few times a second
+OVERLAY_SIZE = (330, 25)
+_overlay_text = None
+
+def overlay_rect():
+    """Bottom-left corner of the display, which may be larger than the logical screen"""
+    return Rect(5, viewport.display_size[1] - OVERLAY_SIZE[1] - 5, *OVERLAY_SIZE)
+
+def draw_profile_overlay(screen):
+    """Draw frame-time percentiles on the display and return the rect used"""
+    global _overlay_text
+    rect = overlay_rect()
+    if _overlay_text is None or profiler.frames % 30 == 0:
+        frame = profiler.percentiles().get('frame')
+        if frame:
+            _overlay_text = "frame p50 %.1f  p95 %.1f  p99 %.1f ms" % tuple(frame)
+    pygame.draw.rect(screen, BLACK, rect)
+    if _overlay_text:
+        screen.blit(render_text(_overlay_text, 24, WHITE), rect.move(5, 5))
+    return rect
+
+def close_scores(session_start):
+    """Record this session's result and wait for the score writer to finish"""
+    settle_scores(everything=True)
+    if score_store is None:
+        return
+    score_store.record_session(args.player, session_start, time.time(), session_snowmen, session_points)
+    score_store.flush()
+    for error in score_store.errors:
+        print(f"Could not save scores: {error}")
+    if session_snowmen:
+        rank = score_store.player_rank(args.player)
+        print(f"{session_snowmen} snowmen for {session_points} points" + (f", best rank {rank[0]}" if rank else ""))
+    score_store.close()
+
 def main():
     """Main game loop"""
-    global game_state
+    global game_state, profiler, DEBUG_START_TIME, score_store, viewport
+    session_start = time.time()
+    if args.level:
+        load_level(args.level)
+    if args.scores or not HEADLESS:
+        score_store = ScoreStore(args.scores or default_score_path())
+    if HEADLESS:
+        # Never open a real window; SDL video stays on the dummy driver
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        run_headless(args.ticks, args.seed)
+        close_scores(session_start)
+        pygame.quit()
+        return
+    assets.cache_dir = default_cache_dir()  # Decoded images are kept per user
+    assets.preload([PLAY_BUTTON])  # Decoded while the window opens
+    viewport = create_viewport()
     pygame.init()
     pygame.font.init()
+    DEBUG_START_TIME = pygame.time.get_ticks()
     screen = init_screen()
     pygame.display.set_caption("Snowball Snowman")
     
@@ -301,45 +822,68 @@ def main():
     init_game()
     
     clock = pygame.time.Clock()
+    timestep = FixedTimestep(args.tick_rate, MAX_CATCH_UP_TICKS)
     running = True
     start_time = pygame.time.get_ticks()
+    if args.profile or args.profile_overlay or args.profile_out:
+        profiler = FrameProfiler()
+    screenshot_writer = None
+    if args.capture_dir:
+        os.makedirs(args.capture_dir, exist_ok=True)
+        screenshot_writer = ScreenshotWriter()
+    frame = 0
     
     while running:
+        profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                handle_mouse_click(event.pos)
+                handle_mouse_click(viewport.to_logical(event.pos))
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                if get_game_state() in (PLAYING, CELEBRATION):
+                    rewind_game()
+        profiler.mark('events')
         
-        update()
-        draw_screen(screen)
-        pygame.display.flip()
-        clock.tick(60)
+        # Simulate at a fixed tick rate no matter how fast we render
+        simulate(timestep, clock.get_time() / 1000)
+        if args.dirty_rects and viewport.direct and get_game_state() == PLAYING and not particles.count:
+            rects = draw_game_dirty(screen, timestep.alpha)
+        else:
+            dirty_renderer.invalidate()
+            draw_screen(viewport.target(screen), timestep.alpha)
+            viewport.present(screen)
+            rects = None
+        if args.profile_overlay:
+            overlay_rect = draw_profile_overlay(screen)
+            if rects is not None:
+                rects.append(overlay_rect)
+        if screenshot_writer and frame % args.capture_every == 0:
+            screenshot_writer.submit(screen, os.path.join(args.capture_dir, f'frame_{frame:06d}.png'))
+        frame += 1
+        profiler.mark('draw')
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        profiler.mark('present')
+        clock.tick(args.fps)
+        profiler.mark('idle')
+        profiler.end_frame()
         
         if DEBUG_AUTO_CLOSE and pygame.time.get_ticks() - start_time > 5000:
             print("Debug: Auto-closing after 5 seconds")
             running = False
     
+    if screenshot_writer:
+        screenshot_writer.close()
+        print(f"Captured {screenshot_writer.written} frames to {args.capture_dir} "
+              f"({screenshot_writer.dropped} dropped)")
+    if args.profile_out:
+        profiler.export(args.profile_out)
+        print(f"Profile written to {args.profile_out}")
+    close_scores(session_start)
     pygame.quit()
 
-def find_stackable_snowball(new_ball, placed_balls, snowmen):
-    """Find a snowball that the new ball can stack on"""
-    # First check existing snowmen for incomplete stacks
-    for snowman in snowmen:
-        if not snowman.is_complete:
-            stackable = snowman.get_stackable_ball()
-            if stackable and new_ball.can_stack_on(stackable):
-                return stackable
-    
-    # Then check for new potential base balls
-    # Sort balls by size (largest first) to prefer stacking on larger balls
-    unattached_balls = [b for b in placed_balls if not b.stacked_on and not b.stacked_by]
-    sorted_balls = sorted(unattached_balls, key=lambda b: b.size, reverse=True)
-    
-    for ball in sorted_balls:
-        if new_ball.can_stack_on(ball):
-            return ball
-    return None
-
 if __name__ == '__main__':
     main()
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from pygame import Vector2
+from game.controls import BotInput, InputState
+from game.world import World
+from net import protocol
+
+class GameClient:
+    """Connects to a GameServer, sends one input per tick and applies snapshots
+
+    controls is any input provider with a poll() method; with none the
+    player stands still. After each snapshot the client acks it and sends
+    its input for the next tick, so latencies records, per tick, the time
+    from sending an input to receiving the snapshot it produced.
+    """
+    def __init__(self, host, port, controls=None, history=64):
+        self.host = host
+        self.port = port
+        self.controls = controls
+        self.history = history  # Decoded snapshots kept as delta bases
+        self.player_id = None
+        self.tick = 0  # Tick of the newest snapshot
+        self.position = Vector2()  # This client's player, updated in place
+        self.players = {}  # Player id -> (x, y, rolling ball size)
+        self.balls = None  # BALL array of every placed ball
+        self.bytes_received = 0
+        self.snapshots = 0
+        self.deltas = 0  # Snapshots that arrived as deltas
+        self.latencies = []
+        self._bases = {}  # Tick -> BALL array
+        self._sent = {}  # Tick -> perf_counter() when its input was sent
+        self._reader = None
+        self._writer = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        kind, body = await self._read()
+        if kind != protocol.HELLO:
+            raise protocol.ProtocolError("expected HELLO, got message type %d" % kind)
+        self.player_id, self.tick, self.tick_rate = protocol.decode_hello(body)
+        return self
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read(self):
+        kind, body = await protocol.read_message(self._reader)
+        self.bytes_received += protocol.HEADER.size + len(body)
+        return kind, body
+
+    def _input_message(self, tick):
+        state = self.controls.poll() if self.controls is not None else InputState()
+        self._sent[tick] = time.perf_counter()
+        return protocol.encode_input(tick, state)
+
+    def apply_snapshot(self, body):
+        """Decode a snapshot into players, balls and position; returns its tick"""
+        tick, base_tick, players, balls = protocol.decode_snapshot(body, self._bases)
+        self._bases[tick] = balls
+        self._bases.pop(tick - self.history, None)
+        self.tick = tick
+        self.balls = balls
+        self.players = {player_id: (x, y, size) for player_id, x, y, size in players}
+        if self.player_id in self.players:
+            self.position.update(self.players[self.player_id][:2])
+        self.snapshots += 1
+        if base_tick != protocol.NO_BASE:
+            self.deltas += 1
+        return tick
+
+    async def run(self, ticks):
+        """Play until ticks snapshots have arrived"""
+        self._writer.write(self._input_message(self.tick))
+        received = 0
+        while received < ticks:
+            kind, body = await self._read()
+            if kind != protocol.SNAPSHOT:
+                continue
+            tick = self.apply_snapshot(body)
+            sent = self._sent.pop(tick - 1, None)
+            if sent is not None:
+                self.latencies.append(time.perf_counter() - sent)
+            received += 1
+            self._writer.write(protocol.encode_ack(tick) + self._input_message(tick))
+            await self._writer.drain()
+
+def bot_client(host, port, seed=None, world=None):
+    """A GameClient driven by a BotInput on a copy of the server's world"""
+    client = GameClient(host, port)
+    client.controls = BotInput(world or World(800, 600), client.position, seed)
+    return client
@@ -0,0 +1,102 @@
+import json
+import threading
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from game.scoring import SnowmanScore
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON API over a ScoreStore
+
+        GET  /top?k=10            best scores
+        GET  /players?k=10        best players
+        GET  /rank?player=NAME    a player's rank and best score
+        POST /scores              {"player", "points", "sizes", "build_seconds"}
+    """
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        store = self.server.store
+        try:
+            k = max(1, min(int(query.get('k', ['10'])[0]), self.server.max_k))
+        except ValueError:
+            return self._send(400, {'error': 'k must be a number'})
+        if url.path == '/top':
+            return self._send(200, [
+                {'player': player, 'points': points, 'created': created}
+                for player, points, created in store.top(k)
+            ])
+        if url.path == '/players':
+            return self._send(200, [{'player': player, 'best': best} for player, best in store.top_players(k)])
+        if url.path == '/rank':
+            player = query.get('player', [''])[0]
+            rank = store.player_rank(player)
+            if rank is None:
+                return self._send(404, {'error': 'no scores for %r' % player})
+            return self._send(200, {'player': player, 'rank': rank[0], 'best': rank[1]})
+        self._send(404, {'error': 'unknown path'})
+
+    def do_POST(self):
+        if urllib.parse.urlsplit(self.path).path != '/scores':
+            return self._send(404, {'error': 'unknown path'})
+        try:
+            data = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            score = SnowmanScore(str(data['player']), int(data['points']), data.get('sizes', ()),
+                                 data.get('build_seconds'))
+        except (ValueError, KeyError, TypeError):
+            return self._send(400, {'error': 'expected player, points, sizes and build_seconds'})
+        self.server.store.submit(score)
+        self._send(202, {'queued': True})
+
+    def log_message(self, format, *args):
+        pass  # Keep the game's output clean
+
+class LeaderboardServer:
+    """Local HTTP stand-in for the online leaderboard, serving a ScoreStore
+
+    Runs in a background thread; port 0 picks a free port.
+    """
+    def __init__(self, store, host='127.0.0.1', port=0, max_k=100):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.store = store
+        self.httpd.max_k = max_k  # Largest k a query may ask for
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return 'http://%s:%d' % (host, port)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='leaderboard', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+def fetch(url, timeout=5):
+    """GET a leaderboard URL and decode its JSON"""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+def post_score(base_url, score, timeout=5):
+    """Send a SnowmanScore to a leaderboard server"""
+    body = json.dumps({
+        'player': score.player, 'points': score.points,
+        'sizes': list(score.sizes), 'build_seconds': score.build_seconds,
+    }).encode()
+    request = urllib.request.Request(base_url + '/scores', body, {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
@@ -0,0 +1,132 @@
+import struct
+import zlib
+import numpy as np
+from game.controls import InputState
+
+# Message types
+HELLO = 1  # Server -> client: your player id, the current tick and the tick rate
+INPUT = 2  # Client -> server: input for one tick
+ACK = 3  # Client -> server: the newest snapshot received, usable as a delta base
+SNAPSHOT = 4  # Server -> client: world state after a tick
+
+HEADER = struct.Struct('<IB')  # Body length, message type
+HELLO_BODY = struct.Struct('<HIH')  # Player id, tick, tick rate
+INPUT_BODY = struct.Struct('<Ibbb')  # Tick, dx, dy, flags
+ACK_BODY = struct.Struct('<I')
+SNAPSHOT_HEAD = struct.Struct('<IIBHII')  # Tick, base tick, flags, players, balls, changed balls
+PLAYER_RECORD = struct.Struct('<Hfff')  # Id, x, y, rolling ball size (-1 for none)
+
+NO_BASE = 0xFFFFFFFF  # Base tick of a snapshot that is not a delta
+ROLL = 1  # INPUT flag
+COMPRESSED = 1  # SNAPSHOT flag: the ball section is zlib-compressed
+COMPRESS_OVER = 128  # Ball sections longer than this many bytes are compressed
+
+# One placed ball in a snapshot
+BALL = np.dtype([
+    ('x', '<f4'),
+    ('y', '<f4'),
+    ('size', '<f4'),
+    ('below', '<i4'),  # Id of the ball it is stacked on, -1 for none
+    ('complete', 'u1'),  # Part of a finished snowman
+])
+
+class ProtocolError(Exception):
+    pass
+
+def message(kind, body=b''):
+    """Frame a message body with its header"""
+    return HEADER.pack(len(body), kind) + body
+
+async def read_message(reader):
+    """(type, body) of the next message on an asyncio StreamReader
+
+    Raises asyncio.IncompleteReadError when the peer disconnects.
+    """
+    length, kind = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return kind, await reader.readexactly(length)
+
+def encode_hello(player_id, tick, tick_rate):
+    return message(HELLO, HELLO_BODY.pack(player_id, tick, tick_rate))
+
+def decode_hello(body):
+    return HELLO_BODY.unpack(body)
+
+def encode_input(tick, state):
+    flags = ROLL if state.roll else 0
+    return message(INPUT, INPUT_BODY.pack(tick, state.dx, state.dy, flags))
+
+def decode_input(body):
+    """(tick, InputState)"""
+    tick, dx, dy, flags = INPUT_BODY.unpack(body)
+    return tick, InputState(dx, dy, bool(flags & ROLL))
+
+def encode_ack(tick):
+    return message(ACK, ACK_BODY.pack(tick))
+
+def decode_ack(body):
+    return ACK_BODY.unpack(body)[0]
+
+def ball_records(session):
+    """Every placed ball of a Session as a BALL array, indexed by id"""
+    store = session.store
+    n = store.count
+    balls = np.empty(n, dtype=BALL)
+    balls['x'] = store.x[:n]
+    balls['y'] = store.y[:n]
+    balls['size'] = store.size[:n]
+    balls['below'] = store.stacked_on[:n]
+    balls['complete'] = session.complete[:n]
+    return balls
+
+def player_records(session):
+    """(id, x, y, rolling size) of every player of a Session"""
+    return [
+        (player_id, player.position.x, player.position.y,
+         player.rolling_snowball.size if player.rolling_snowball else -1.0)
+        for player_id, player in sorted(session.players.items())
+    ]
+
+def encode_snapshot(tick, players, balls, base_tick=NO_BASE, base=None):
+    """A SNAPSHOT message of the balls, as a delta against base if given
+
+    A delta only carries the ids and records of balls that are new or
+    differ from base; balls never disappear, so base is always a prefix
+    of the id range.
+    """
+    if base is None:
+        base_tick = NO_BASE
+        changed = np.arange(len(balls), dtype='<u4')
+    else:
+        old = len(base)
+        differs = np.flatnonzero(balls[:old] != base)
+        changed = np.concatenate([differs, np.arange(old, len(balls))]).astype('<u4')
+    section = changed.tobytes() + balls[changed].tobytes()
+    flags = 0
+    if len(section) > COMPRESS_OVER:
+        section = zlib.compress(section, 1)
+        flags |= COMPRESSED
+    head = SNAPSHOT_HEAD.pack(tick, base_tick, flags, len(players), len(balls), len(changed))
+    return message(SNAPSHOT, b''.join([head] + [PLAYER_RECORD.pack(*player) for player in players] + [section]))
+
+def decode_snapshot(body, bases):
+    """(tick, base tick, players, balls) from a SNAPSHOT body
+
+    bases maps tick -> BALL array of snapshots already decoded; a delta
+    whose base is missing raises ProtocolError.
+    """
+    tick, base_tick, flags, player_count, ball_count, changed_count = SNAPSHOT_HEAD.unpack_from(body)
+    offset = SNAPSHOT_HEAD.size
+    players = [PLAYER_RECORD.unpack_from(body, offset + i * PLAYER_RECORD.size) for i in range(player_count)]
+    section = body[offset + player_count * PLAYER_RECORD.size:]
+    if flags & COMPRESSED:
+        section = zlib.decompress(section)
+    changed = np.frombuffer(section, dtype='<u4', count=changed_count)
+    records = np.frombuffer(section, dtype=BALL, count=changed_count, offset=changed.nbytes)
+    balls = np.zeros(ball_count, dtype=BALL)
+    if base_tick != NO_BASE:
+        base = bases.get(base_tick)
+        if base is None:
+            raise ProtocolError("snapshot %d is a delta against unknown tick %d" % (tick, base_tick))
+        balls[:len(base)] = base
+    balls[changed] = records
+    return tick, base_tick, players, balls
@@ -0,0 +1,165 @@
+import asyncio
+import time
+from game.controls import InputState
+from game.session import Session
+from net import protocol
+
+MAX_BUFFERED = 256 * 1024  # Skip snapshots to a client with this many bytes still unsent
+
+class _Connection:
+    """Server-side state of one connected client"""
+    def __init__(self, player_id, writer):
+        self.player_id = player_id
+        self.writer = writer
+        self.inputs = {}  # Tick -> InputState received ahead of time
+        self.last_input = InputState()  # Repeated when an input arrives too late
+        self.acked = None  # Newest snapshot tick the client has, its delta base
+        self.bytes_sent = 0
+        self.late = 0  # Ticks stepped without this client's input
+
+class GameServer:
+    """Authoritative lockstep server for a shared Session
+
+    Each tick waits until every client has sent its input for that tick,
+    or until input_timeout passes, in which case a missing player repeats
+    their last input. The session is then stepped once and every client is
+    sent a snapshot, delta-compressed against the newest one it acked.
+    A client joins the game with its first input.
+    tick_rate caps the ticks per second; None runs as fast as the slowest
+    client answers.
+    """
+    def __init__(self, session=None, tick_rate=30, input_timeout=None, host='127.0.0.1', port=0, history=64):
+        self.session = session or Session()
+        self.tick_rate = tick_rate
+        if input_timeout is None:
+            input_timeout = 1 / tick_rate if tick_rate else 0.1
+        self.input_timeout = input_timeout
+        self.host = host
+        self.port = port
+        self.history = history  # Snapshots kept as possible delta bases
+        self.connections = {}  # Player id -> _Connection of every player in the game
+        self.tick_times = []  # Seconds spent stepping and sending each tick
+        self._states = {}  # Tick -> BALL array sent for it
+        self._next_id = 1
+        self._input_arrived = asyncio.Event()
+        self._server = None
+        self._loop_task = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._loop_task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self):
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+        for connection in list(self.connections.values()):
+            connection.writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        player_id = self._next_id
+        self._next_id += 1
+        connection = _Connection(player_id, writer)
+        writer.write(protocol.encode_hello(player_id, self.session.tick, self.tick_rate or 0))
+        try:
+            while True:
+                kind, body = await protocol.read_message(reader)
+                if kind == protocol.INPUT:
+                    tick, state = protocol.decode_input(body)
+                    if player_id not in self.connections:
+                        # The player joins with their first input, at the current tick
+                        self.connections[player_id] = connection
+                        self.session.add_player(player_id)
+                        tick = self.session.tick
+                    if tick >= self.session.tick:  # Late inputs are dropped
+                        connection.inputs[tick] = state
+                        self._input_arrived.set()
+                elif kind == protocol.ACK:
+                    tick = protocol.decode_ack(body)
+                    if connection.acked is None or tick > connection.acked:
+                        connection.acked = tick
+                else:
+                    raise protocol.ProtocolError("unexpected message type %d" % kind)
+        except (asyncio.IncompleteReadError, ConnectionError, protocol.ProtocolError):
+            pass
+        finally:
+            if self.connections.pop(player_id, None) is not None:
+                self.session.remove_player(player_id)
+            self._input_arrived.set()  # Nobody waits for this player any more
+            writer.close()
+
+    def _have_all_inputs(self, tick):
+        return all(tick in connection.inputs for connection in self.connections.values())
+
+    async def _wait_for_inputs(self, tick):
+        expired = []
+
+        def expire():
+            expired.append(True)
+            self._input_arrived.set()
+
+        timer = asyncio.get_running_loop().call_later(self.input_timeout, expire)
+        try:
+            while not self._have_all_inputs(tick) and not expired:
+                self._input_arrived.clear()
+                await self._input_arrived.wait()
+        finally:
+            timer.cancel()
+
+    async def _run(self):
+        interval = 1 / self.tick_rate if self.tick_rate else 0
+        next_tick = time.perf_counter()
+        while True:
+            if not self.connections:
+                await asyncio.sleep(interval or 0.01)
+                next_tick = time.perf_counter()
+                continue
+            await self._wait_for_inputs(self.session.tick)
+            start = time.perf_counter()
+            self.step()
+            self.tick_times.append(time.perf_counter() - start)
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay < 0:
+                next_tick -= delay  # Fell behind: do not try to catch up in a burst
+            await asyncio.sleep(max(delay, 0))
+
+    def step(self):
+        """Step the session with the inputs at hand and send the snapshots"""
+        tick = self.session.tick
+        inputs = {}
+        for player_id, connection in self.connections.items():
+            state = connection.inputs.pop(tick, None)
+            if state is None:
+                state = connection.last_input
+                connection.late += 1
+            inputs[player_id] = connection.last_input = state
+        self.session.step(inputs)
+        self._broadcast()
+
+    def _broadcast(self):
+        tick = self.session.tick
+        balls = protocol.ball_records(self.session)
+        players = protocol.player_records(self.session)
+        self._states[tick] = balls
+        self._states.pop(tick - self.history, None)
+        messages = {}  # Base tick -> message, shared by clients on the same base
+        for connection in self.connections.values():
+            if connection.writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+                continue  # Catches up with a later delta once it drains
+            base_tick = connection.acked if connection.acked in self._states else None
+            data = messages.get(base_tick)
+            if data is None:
+                base = self._states[base_tick] if base_tick is not None else None
+                data = messages[base_tick] = protocol.encode_snapshot(
+                    tick, players, balls, protocol.NO_BASE if base_tick is None else base_tick, base)
+            connection.writer.write(data)
+            connection.bytes_sent += len(data)
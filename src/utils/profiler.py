@@ -0,0 +1,95 @@
+import csv
+import json
+from time import perf_counter_ns
+import numpy as np
+
+# Phases of one main-loop frame, in the order they run; 'update' is the rest
+# of the simulation ticks (menu, celebration, rewinds) after input and snowballs
+PHASES = ('events', 'input', 'snowballs', 'update', 'draw', 'present', 'idle')
+
+class FrameProfiler:
+    """Times each phase of the main loop into a fixed-size ring buffer
+
+    Call begin_frame() at the top of the loop, mark(phase) at the end of
+    each phase and end_frame() at the bottom. Time since the previous mark
+    is charged to the named phase, so a phase that runs several times per
+    frame (e.g. several simulation ticks) adds up.
+    """
+    def __init__(self, capacity=1024, phases=PHASES):
+        self.phases = phases
+        self.columns = {phase: i for i, phase in enumerate(phases)}
+        self.capacity = capacity
+        self.samples = np.zeros((capacity, len(phases) + 1), dtype=np.int64)  # Last column is the frame total
+        self.frames = 0  # Frames recorded so far, including overwritten ones
+        self._current = [0] * len(phases)
+        self._frame_start = 0
+        self._last = 0
+
+    def begin_frame(self):
+        now = perf_counter_ns()
+        self._frame_start = self._last = now
+        for i in range(len(self._current)):
+            self._current[i] = 0
+
+    def mark(self, phase):
+        """Charge the time since the last mark to phase"""
+        now = perf_counter_ns()
+        self._current[self.columns[phase]] += now - self._last
+        self._last = now
+
+    def end_frame(self):
+        row = self.samples[self.frames % self.capacity]
+        row[:-1] = self._current
+        row[-1] = perf_counter_ns() - self._frame_start
+        self.frames += 1
+
+    def recorded(self):
+        """The buffered samples, oldest first, in nanoseconds"""
+        if self.frames <= self.capacity:
+            return self.samples[:self.frames]
+        start = self.frames % self.capacity
+        return np.concatenate((self.samples[start:], self.samples[:start]))
+
+    def percentiles(self, q=(50, 95, 99)):
+        """Percentiles of frame and phase times in milliseconds
+
+        Returns {'frame': [p50, p95, p99], 'events': [...], ...}.
+        """
+        samples = self.recorded()
+        if not len(samples):
+            return {}
+        values = np.percentile(samples, q, axis=0) / 1e6
+        names = self.phases + ('frame',)
+        return {name: values[:, i].tolist() for i, name in enumerate(names)}
+
+    def export(self, path):
+        """Write the buffer to CSV or JSON, chosen by the file extension"""
+        samples = self.recorded()
+        names = self.phases + ('frame',)
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({
+                    'unit': 'ns',
+                    'frames': self.frames,
+                    'columns': list(names),
+                    'samples': samples.tolist(),
+                    'percentiles_ms': self.percentiles(),
+                }, f)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow([f'{name}_ns' for name in names])
+                writer.writerows(samples.tolist())
+
+class NullProfiler:
+    """Profiler that records nothing, used when profiling is off"""
+    frames = 0
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self):
+        pass
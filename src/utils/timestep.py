@@ -0,0 +1,32 @@
+class FixedTimestep:
+    """Accumulator that turns variable frame times into fixed simulation ticks
+
+    Each frame, advance() is given the real time since the last frame and
+    returns how many ticks to simulate. Leftover time carries over, and
+    alpha says how far between the last two ticks the frame should be drawn.
+    """
+    def __init__(self, tick_rate=60, max_steps=5):
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate  # Seconds of game time per tick
+        self.max_steps = max_steps  # Catch-up limit per frame
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # Time skipped because we fell too far behind
+
+    def advance(self, frame_time):
+        """Add frame_time seconds and return the number of ticks to run"""
+        self.accumulator += frame_time
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            # Too far behind (slow machine, debugger, window drag): slow the
+            # game down instead of spiralling into ever longer frames
+            self.dropped_time += (steps - self.max_steps) * self.dt
+            steps = self.max_steps
+            self.accumulator = min(self.accumulator - steps * self.dt, self.dt)
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """Interpolation factor between the previous and current tick, 0..1"""
+        return min(self.accumulator / self.dt, 1.0)
@@ -0,0 +1,33 @@
+"""
+Tests for the parallel agent session runner
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import agent_runner
+
+def test_batch_report_across_processes():
+    """Sessions run in worker processes and are gathered into one report"""
+    sessions = agent_runner.build_sessions(4, ticks=3000, seed_base=10)
+    report = agent_runner.run_batch(sessions, workers=2)
+    assert report['sessions'] == 4
+    assert [result['seed'] for result in report['results']] == [10, 11, 12, 13]
+    assert report['total_ticks'] == sum(result['ticks'] for result in report['results'])
+    assert all(result['final_state'] in ('playing', 'celebration') for result in report['results'])
+
+def test_sessions_are_deterministic():
+    """The same seed gives the same game in and out of the pool"""
+    session = {'seed': 5, 'ticks': 4000, 'keep_playing': True}
+    local = agent_runner.run_session(session)
+    pooled = agent_runner.run_batch([session], workers=2)['results'][0]
+    for key in ('ticks', 'balls_placed', 'snowmen_started', 'snowmen_completed', 'final_state'):
+        assert local[key] == pooled[key]
+
+def test_scripted_session():
+    """Scripted sessions replay their inputs and stop when the script ends"""
+    script = [[0, 0, 1]] * 20 + [[-1, 0, 1]] * 10
+    result = agent_runner.run_session({'script': script, 'ticks': 1000})
+    assert result['ticks'] == len(script)
+    assert result['balls_placed'] == 0
@@ -0,0 +1,170 @@
+"""
+Tests that the per-tick hot loop does not allocate per ball
+"""
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from game.controls import InputState, ScriptedInput
+from game.player import Player
+from game.pool import SnowballPool
+from game.snowman import Snowball, Snowman
+from graphics.renderer import NullRenderer
+
+class _SameInput:
+    def __init__(self, state):
+        self.state = state
+
+    def poll(self):
+        return self.state
+
+def traced(fn, repeat=1):
+    """(bytes retained over all runs, largest transient bytes in one run) of fn"""
+    tracemalloc.start()
+    try:
+        first, _ = tracemalloc.get_traced_memory()
+        transient = 0
+        for _ in range(repeat):
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn()
+            current, peak = tracemalloc.get_traced_memory()
+            transient = max(transient, peak - start)
+    finally:
+        tracemalloc.stop()
+    return current - first, transient
+
+def steady_frame(balls, seed=0):
+    """Fill the world with full-grown balls and return one tick of play"""
+    rng = random.Random(seed)
+    main.init_game()
+    main.start_game()
+    zone = main.world.building_zone
+    placed = []
+    for _ in range(balls):
+        ball = Snowball(rng.uniform(zone.left, zone.right), rng.uniform(zone.top, zone.bottom))
+        ball.size = ball.max_size
+        placed.append(ball)
+    for i in range(0, balls - 2, 30):
+        base, middle, head = placed[i:i + 3]
+        middle.size, head.size = 40, 22
+        snowman = Snowman(base)
+        snowman.add_ball(middle)
+        snowman.add_ball(head)
+        main.snowmen.append(snowman)
+    for ball in placed:
+        main.add_placed_snowball(ball)
+    # Carry a full-grown ball around the building zone
+    main.player.position.update(zone.center)
+    main.player.rolling_snowball = Snowball(*zone.center)
+    main.player.rolling_snowball.is_rolling = True
+    main.player.rolling_snowball.size = 60
+    controls = _SameInput(InputState(roll=True))
+    frame = lambda: main.handle_input(controls)
+    for _ in range(10 + int(main.temperature.step_interval * main.args.tick_rate)):
+        frame()  # Build stacking levels and rewind and melting scratch buffers
+    return frame
+
+def test_entities_have_no_instance_dict():
+    """Hot-loop entities use __slots__"""
+    ball = Snowball(0, 0)
+    for obj in (ball, Snowman(ball), Player(0, 0)):
+        assert not hasattr(obj, '__dict__')
+
+def test_snowball_update_moves_in_place():
+    """Rolling and stacked balls move in place and keep no new blocks"""
+    base = Snowball(100, 100)
+    base.size = 50
+    top = Snowball(100, 30)
+    Snowman(base).add_ball(top)
+    rolling = Snowball(0, 0)
+    rolling.is_rolling = True
+    target = Player(10, 20).position
+    position = rolling.position
+
+    def tick():
+        rolling.update(target)
+        top.update(target)
+
+    tick()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(100):
+            tick()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    # Only count blocks allocated from the game package, not by the interpreter itself
+    game = [tracemalloc.Filter(True, os.path.join('*', 'game', '*'))]
+    growth = after.filter_traces(game).compare_to(before.filter_traces(game), 'lineno')
+    assert sum(stat.count_diff for stat in growth) == 0
+    assert rolling.position is position  # Updated, not replaced
+    assert rolling.position == target and rolling.position is not target
+    assert top.position == (100, 100 - 50 - 20)
+
+def test_all_balls_is_cached():
+    """all_balls builds its list once per change of parts"""
+    base = Snowball(0, 0)
+    base.size = 50
+    snowman = Snowman(base)
+    first = snowman.all_balls
+    assert snowman.all_balls is first
+    middle = Snowball(0, 0)
+    snowman.add_ball(middle)
+    assert snowman.all_balls == [base, middle]
+    assert snowman.all_balls is not first
+
+def test_steady_state_frame_allocations_do_not_scale():
+    """A tick with thousands of balls allocates no more than one with a hundred"""
+    results = {}
+    for balls in (100, 5000):
+        frame = steady_frame(balls)
+        retained, peak = traced(frame, repeat=20)
+        results[balls] = (retained / 20, peak)
+    small, large = results[100], results[5000]
+    # What stays is the rewind history's per-tick delta, which has a fixed budget.
+    # NumPy's small-block cache makes the exact figure vary from run to run.
+    assert small[0] < 2048
+    assert large[0] < 2048
+    # Transient temporaries must not grow with the number of balls
+    assert large[1] < 32 * 1024
+    assert large[1] <= small[1] + 1024
+
+def test_pool_recycles_balls():
+    """Released balls come back reset to their starting state"""
+    pool = SnowballPool(max_free=1)
+    ball = pool.acquire(5, 6)
+    ball.size = 55
+    ball.is_rolling = True
+    other = Snowball(0, 0)
+    pool.release(ball)
+    pool.release(other)  # Over max_free, left to the garbage collector
+    assert len(pool) == 1
+    again = pool.acquire(7, 8)
+    assert again is ball
+    assert again.position == (7, 8)
+    assert again.size == 20 and not again.is_rolling
+    assert again.stacked_on is None and again.snowman is None
+    assert pool.acquire(0, 0) is not ball
+
+def test_rewind_returns_dropped_balls_to_pool():
+    """Balls undone by a rewind are reused for the next roll"""
+    main.init_game()
+    main.start_game()
+    main.snowball_pool.clear()
+    zone = main.world.building_zone
+    main.player.position.update(main.world.rolling_zone.center)
+    script = [InputState(roll=True)] * 5
+    script += [InputState(dx=1, roll=True)] * int((zone.centerx - main.player.position.x) // main.player.speed)
+    script += [InputState()]
+    main.run_simulation(ScriptedInput(script), NullRenderer())
+    assert len(main.placed_snowballs) == 1
+    placed = main.placed_snowballs[0]
+    main.rewind_game(1 / main.args.tick_rate)
+    assert main.placed_snowballs == []
+    assert main.snowball_pool.free == [placed]
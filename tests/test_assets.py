@@ -0,0 +1,117 @@
+"""
+Tests for the asset manager, its disk cache and the sprite atlas
+"""
+import os
+import shutil
+import subprocess
+import sys
+
+import pygame
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.player import Player
+from graphics.assets import AssetManager, SpriteAtlas, ASSET_ROOT
+from graphics.sprites import create_player_sprite
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+def pixels(surface):
+    return pygame.image.tobytes(surface, 'RGBA')
+
+def copy_assets(tmp_path):
+    root = tmp_path / 'images'
+    root.mkdir()
+    shutil.copy(os.path.join(ASSET_ROOT, 'play_button.png'), root)
+    return str(root)
+
+def test_paths_do_not_depend_on_the_working_directory(tmp_path, monkeypatch):
+    """Images are found next to the package wherever the game is started from"""
+    monkeypatch.chdir(tmp_path)
+    image = AssetManager().image('play_button.png')
+    assert image.get_size() == (331, 146)
+
+def test_main_imports_from_another_directory(tmp_path):
+    """Importing the game no longer needs the repository as the working directory"""
+    home = tmp_path / 'home'
+    home.mkdir()
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC), SDL_VIDEODRIVER='dummy',
+               HOME=str(home), XDG_CACHE_HOME=str(home / '.cache'))
+    result = subprocess.run(
+        [sys.executable, '-c', 'import main; main.draw_menu(main.Surface((800, 600)))'],
+        cwd=str(tmp_path), env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert not os.listdir(home)  # Only main() sets up the per-user disk cache
+
+def test_images_load_once_and_lazily():
+    """Nothing is decoded until asked for, and then only once"""
+    manager = AssetManager()
+    assert manager.loads == 0
+    first = manager.image('play_button.png')
+    assert manager.image('play_button.png') is first
+    assert manager.loads == 1
+
+def test_disk_cache_skips_decoding(tmp_path):
+    """A second manager reads the preprocessed pixels back instead of the PNG"""
+    root = copy_assets(tmp_path)
+    cache = str(tmp_path / 'cache')
+    cold = AssetManager(root, cache)
+    expected = pixels(cold.image('play_button.png'))
+    assert cold.loads == 1 and len(os.listdir(cache)) == 1
+
+    warm = AssetManager(root, cache)
+    assert pixels(warm.image('play_button.png')) == expected
+    assert warm.loads == 0 and warm.cache_hits == 1
+
+def test_disk_cache_follows_source_changes(tmp_path):
+    """Editing the source image or damaging the cache falls back to decoding"""
+    root = copy_assets(tmp_path)
+    cache = str(tmp_path / 'cache')
+    AssetManager(root, cache).image('play_button.png')
+    source = os.path.join(root, 'play_button.png')
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    changed = AssetManager(root, cache)
+    changed.image('play_button.png')
+    assert changed.loads == 1
+
+    for name in os.listdir(cache):
+        with open(os.path.join(cache, name), 'wb') as f:
+            f.write(b'SSA1')
+    damaged = AssetManager(root, cache)
+    assert damaged.image('play_button.png').get_size() == (331, 146)
+    assert damaged.loads == 1
+
+def test_preload_decodes_in_the_background(tmp_path):
+    """image() uses what the preload thread decoded"""
+    manager = AssetManager(copy_assets(tmp_path))
+    thread = manager.preload(['play_button.png', 'missing.png'])
+    image = manager.image('play_button.png')  # Waits for the preload if needed
+    thread.join(5)
+    assert not thread.is_alive()
+    assert image.get_size() == (331, 146)
+    assert manager.loads == 1
+
+def test_atlas_packs_sprites_exactly():
+    """Sprites share a page, keep their pixels and never overlap"""
+    atlas = SpriteAtlas(page_size=66)
+    player = create_player_sprite()
+    opaque = pygame.Surface((20, 20))
+    opaque.fill((10, 20, 30))
+    sprites = [atlas.add(player), atlas.add(opaque), atlas.add(player), atlas.add(player)]
+    assert len(atlas.pages) == 1
+    assert pixels(sprites[0]) == pixels(player) == pixels(sprites[3])
+    assert sprites[1].get_at((5, 5)) == (10, 20, 30, 255)
+    rects = [pygame.Rect(sprite.get_abs_offset(), sprite.get_size()) for sprite in sprites]
+    for i, rect in enumerate(rects):
+        assert rect.collidelist(rects[:i] + rects[i + 1:]) == -1
+    atlas.add(player)
+    assert len(atlas.pages) == 2  # The first page is full
+
+def test_players_share_one_atlas_sprite():
+    """Creating a player no longer draws a new surface"""
+    first, second = Player(0, 0), Player(10, 10)
+    assert first.surface is second.surface
+    assert first.surface.get_parent() is not None
+    assert pixels(first.surface) == pixels(create_player_sprite())
@@ -0,0 +1,110 @@
+"""
+Tests for the vectorized BatchEnv against the object-based game rules
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_batch
+from game.batch import BatchEnv, OBS_FIELDS, STACK_REWARD
+from game.controls import BotInput
+from game.scoring import score_snowman, score_stacks
+from game.session import Session
+from game.snowman import Snowball, Snowman
+from game.world import World
+
+@pytest.mark.parametrize('width, height', [(800, 600), (160, 120)])
+def test_worlds_match_sessions(width, height):
+    """Bot players give the same balls, stacks and snowmen in both"""
+    sessions, bots = [], []
+    for seed in range(6):
+        session = Session(World(width, height))
+        player = session.add_player(0)
+        sessions.append(session)
+        bots.append(BotInput(session.world, player.position, seed))
+    env = BatchEnv(len(sessions), World(width, height), max_balls=256, max_ticks=10 ** 6)
+    rewards = np.zeros(len(sessions))
+    for _ in range(3000):
+        states = [bot.poll() for bot in bots]
+        for session, state in zip(sessions, states):
+            session.step({0: state})
+        _, reward, done, _ = env.step([(state.dx, state.dy, state.roll) for state in states])
+        rewards += reward
+        assert not done.any()
+
+    for i, session in enumerate(sessions):
+        count = len(session.placed)
+        store = session.store
+        assert env.count[i] == count
+        assert tuple(session.players[0].position) == (env.px[i], env.py[i])
+        for name in ('x', 'y', 'size'):
+            assert np.array_equal(getattr(env, name)[i, :count], getattr(store, name)[:count])
+        assert np.array_equal(env.below[i, :count], store.stacked_on[:count])
+        assert env.snowmen[i] == len(session.snowmen)
+        assert env.completed[i] == session.completed
+        assert rewards[i] >= STACK_REWARD * (len(session.snowmen) + session.completed)
+    assert env.completed.sum() > 0
+
+def test_snowman_scores_match():
+    sizes = [(50, 35, 24.5), (60, 59, 10), (30, 25, 20.2)]
+    snowmen = []
+    for row in sizes:
+        balls = []
+        for size in row:
+            ball = Snowball(100, 100)
+            ball.size = size
+            balls.append(ball)
+        snowman = Snowman(balls[0])
+        for ball in balls[1:]:
+            snowman.add_ball(ball)
+        snowmen.append(snowman)
+    seconds = [5.0, 12.5, 40.0]
+    expected = [score_snowman(snowman, s) for snowman, s in zip(snowmen, seconds)]
+    assert score_stacks(sizes, seconds).tolist() == expected
+
+def test_done_worlds_reset_in_place():
+    env = BatchEnv(3, max_ticks=5)
+    actions = np.zeros((3, 3), dtype=np.int64)
+    actions[:, 0] = (-1, 0, 1)
+    obs = env.reset()
+    assert obs.shape == (3, len(OBS_FIELDS))
+    for _ in range(4):
+        obs, _, done, info = env.step(actions)
+        assert not done.any() and not info
+    obs, _, done, info = env.step(actions)
+    assert done.all()
+    final = info['final_observation']
+    assert final[:, 0].tolist() == [400 - 25, 400, 400 + 25]
+    assert obs[:, 0].tolist() == [400, 400, 400] and not obs[:, OBS_FIELDS.index('tick')].any()
+
+def test_step_results_are_not_overwritten():
+    """Observations and rewards kept from one step survive the next"""
+    env = BatchEnv(2)
+    actions = np.array([(1, 0, 0), (-1, 0, 0)])
+    obs, reward, _, _ = env.step(actions)
+    kept_obs, kept_reward = obs.copy(), reward.copy()
+    obs2, reward2, _, _ = env.step(actions)
+    assert obs2 is not obs and reward2 is not reward
+    assert np.array_equal(obs, kept_obs) and np.array_equal(reward, kept_reward)
+    assert not np.array_equal(obs, obs2)
+
+def test_zone_edges_follow_collidepoint():
+    """Rect.collidepoint truncates, so -0.5 is in a zone starting at 0"""
+    env = BatchEnv(4)
+    rolling = World(800, 600).rolling_zone
+    x = np.array([-0.5, 399.9, 400.0, -1.0])
+    y = np.full(4, 300.0)
+    inside = env._inside(env.rolling_rects, x, y)
+    assert inside.tolist() == [rolling.collidepoint(p, 300.0) for p in x]
+
+def test_throughput():
+    """A small run of the benchmark; the full one steps thousands of worlds"""
+    results = bench_batch.bench(worlds=(1024,), ticks=200)
+    rate, placed, _ = results[1024]
+    assert rate > 0 and results['session'] > 0
+    assert placed > 0
@@ -0,0 +1,22 @@
+"""
+Tests for the benchmark suite's runner and regression check
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import suite
+
+def test_every_case_runs_at_small_scale():
+    """Each case builds and times without errors"""
+    results = suite.run_suite(scales=(10,), min_time=0.001)['results']
+    assert set(results) == set(suite.CASES)
+    assert all(results[name]['10'] > 0 for name in results)
+
+def test_compare_flags_slowdowns_only():
+    """Only cases slower than the threshold are reported"""
+    baseline = {'results': {'draw_game': {'10': 1.0, '100': 1.0}, 'store_update': {'10': 1.0}}}
+    current = {'results': {'draw_game': {'10': 1.2, '100': 1.5}, 'store_update': {'10': 0.5}, 'new_case': {'10': 9.0}}}
+    regressions = suite.compare(current, baseline, threshold=0.25)
+    assert [(name, scale) for name, scale, *_ in regressions] == [('draw_game', '100')]
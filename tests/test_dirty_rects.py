@@ -0,0 +1,45 @@
+"""
+Tests for dirty-rectangle rendering
+"""
+import os
+import sys
+
+import pygame
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from game.controls import BotInput
+from graphics.renderer import NullRenderer
+
+def test_dirty_frames_match_full_redraw():
+    """Redrawing only dirty regions gives the same pixels as a full redraw"""
+    pygame.init()
+    main.init_game()
+    main.start_game()
+    bot = BotInput(main.world, main.player.position, seed=11)
+    dirty_screen = pygame.Surface((main.WIDTH, main.HEIGHT))
+    full_screen = pygame.Surface((main.WIDTH, main.HEIGHT))
+    main.dirty_renderer.invalidate()
+
+    for frame in range(300):
+        main.run_simulation(bot, NullRenderer(), 5, keep_playing=True)
+        main.draw_game_dirty(dirty_screen)
+        main.draw_game(full_screen)
+        if frame % 5 == 0:
+            assert pygame.image.tobytes(dirty_screen, 'RGB') == pygame.image.tobytes(full_screen, 'RGB')
+    assert main.placed_snowballs, "Bot should have placed some balls"
+
+def test_idle_frame_is_empty():
+    """Nothing changes when nothing moves"""
+    pygame.init()
+    main.init_game()
+    main.start_game()
+    screen = pygame.Surface((main.WIDTH, main.HEIGHT))
+    main.dirty_renderer.invalidate()
+    assert main.draw_game_dirty(screen) == [screen.get_rect()]
+    assert main.draw_game_dirty(screen) == []
+
+    main.player.move(1, 0)
+    rects = main.draw_game_dirty(screen)
+    assert rects and sum(r.w * r.h for r in rects) < main.WIDTH * main.HEIGHT // 50
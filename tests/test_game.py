@@ -284,3 +284,34 @@ def test_game_start_and_screenshot():
 
     # Draw game frame and save screenshot
     main.draw()
+
+def test_snowman_membership():
+    """Balls know which snowman they belong to"""
+    base = Snowball(100, 100)
+    middle = Snowball(100, 50)
+    head = Snowball(100, 0)
+    base.size, middle.size, head.size = 60, 40, 20
+    loose = Snowball(300, 100)
+
+    snowman = Snowman(base)
+    snowman.add_ball(middle)
+    snowman.add_ball(head)
+    assert base.snowman is snowman and middle.snowman is snowman and head.snowman is snowman
+    assert loose.snowman is None
+
+def test_unstack_leaves_snowman():
+    """Unstacking a ball drops it and everything above it from the snowman"""
+    base = Snowball(100, 100)
+    middle = Snowball(100, 50)
+    head = Snowball(100, 0)
+    base.size, middle.size, head.size = 60, 40, 20
+    snowman = Snowman(base)
+    snowman.add_ball(middle)
+    snowman.add_ball(head)
+
+    middle.unstack()
+    assert not snowman.is_complete
+    assert snowman.all_balls == [base]
+    assert middle.snowman is None and head.snowman is None
+    assert base.snowman is snowman
+    assert snowman.get_stackable_ball() is base
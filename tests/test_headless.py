@@ -0,0 +1,42 @@
+"""
+Tests for headless simulation with scripted input
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from game.controls import InputState, ScriptedInput, BotInput
+from graphics.renderer import NullRenderer
+
+def setup_function():
+    main.init_game()
+
+def test_click_starts_game():
+    """A scripted click on the play button starts the game"""
+    button_center = (main.WIDTH // 2, 2 * main.HEIGHT // 3)
+    controls = ScriptedInput([InputState(clicks=[button_center])])
+    assert main.handle_input(controls)
+    assert main.get_game_state() == main.PLAYING
+    assert main.player is not None
+
+def test_scripted_roll_and_place():
+    """Rolling in the left zone and releasing in the right zone places a ball"""
+    main.start_game()
+    main.player.position.x = main.WIDTH // 4
+    script = [InputState(roll=True)] * 10
+    script += [InputState(dx=1, roll=True)] * 100  # Carry the ball to the building zone
+    script += [InputState()]  # Release space to place it
+    ticks = main.run_simulation(ScriptedInput(script), NullRenderer())
+    assert ticks == len(script)
+    assert len(main.placed_snowballs) == 1
+    assert main.player.rolling_snowball is None
+
+def test_bot_builds_snowmen_headless():
+    """A seeded bot keeps placing balls with no display attached"""
+    main.start_game()
+    controls = BotInput(main.world, main.player.position, seed=3)
+    ticks = main.run_simulation(controls, NullRenderer(), 5000, keep_playing=True)
+    assert ticks == 5000
+    assert len(main.placed_snowballs) > 5
@@ -0,0 +1,150 @@
+"""
+Tests for the binary level format, its JSON form and region streaming
+"""
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+from pygame import Rect
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_level
+import main
+from game.level import Level, LevelFile, LevelStream, convert, load_json
+from game.world import ROLLING, BUILDING
+
+def sample_level():
+    """Two regions across: a snowman near each end and a target in each"""
+    level = Level(4000, 1000, region_size=2000, spawn=(300, 500))
+    level.add_zone(ROLLING, (0, 0, 2000, 1000), 'SNOWBALL', (255, 0, 0))
+    level.add_zone(BUILDING, (2000, 0, 2000, 1000))
+    far = level.add_ball(3500, 500, 50)
+    near = level.add_ball(500, 500, 55)
+    level.add_ball(3500, 500, 35, on=far)
+    middle = level.add_ball(500, 500, 40, on=near)
+    level.add_ball(500, 500, 25, on=middle)
+    level.add_ball(1200, 300, 30)
+    level.add_target(600, 600, 80)
+    level.add_target(3000, 400, 60, height=2)
+    return level
+
+def write(level, tmp_path, name='level.ssl'):
+    path = str(tmp_path / name)
+    level.write(path)
+    return path
+
+def canonical(level):
+    """Balls as nested stacks, which survive the reordering by region"""
+    def stack(index):
+        x, y, size, _ = level.balls[index]
+        above = [i for i, ball in enumerate(level.balls) if ball[3] == index]
+        return (x, y, size, stack(above[0]) if above else None)
+    bases = sorted(stack(i) for i, ball in enumerate(level.balls) if ball[3] is None)
+    return level.width, level.height, level.zones, bases, sorted(level.targets)
+
+def test_binary_and_json_round_trip(tmp_path):
+    level = sample_level()
+    binary = write(level, tmp_path)
+    text = str(tmp_path / 'level.json')
+    convert(binary, text)
+    assert canonical(load_json(text)) == canonical(level)
+    again = str(tmp_path / 'again.ssl')
+    convert(text, again)
+    with LevelFile(again) as reread:
+        assert canonical(reread.to_level()) == canonical(level)
+        assert reread.spawn == (300, 500)
+
+def test_records_are_grouped_by_region(tmp_path):
+    with LevelFile(write(sample_level(), tmp_path)) as level:
+        assert level.regions_in(Rect(0, 0, 100, 100)) == [0]
+        left, right = level.region_balls(0), level.region_balls(1)
+        assert sorted(left['size'].tolist()) == [25, 30, 40, 55]
+        assert sorted(right['size'].tolist()) == [35, 50]
+        # Stacked balls point at their base within the same region
+        start = level.regions['ball_start'][1]
+        assert right['below'].tolist().count(-1) == 1
+        assert all(start <= below < start + len(right) for below in right['below'] if below >= 0)
+        assert level.region_targets(1)['height'].tolist() == [2]
+
+def test_streaming_only_builds_regions_in_view(tmp_path):
+    with LevelFile(write(sample_level(), tmp_path)) as level:
+        stream = LevelStream(level)
+        balls, snowmen = stream.load(Rect(0, 0, 800, 600))
+        assert len(balls) == 4
+        assert len(snowmen) == 1 and snowmen[0].is_complete
+        assert snowmen[0].head.stacked_on is snowmen[0].middle
+        assert stream.load(Rect(0, 0, 800, 600)) == ([], [])  # Already loaded
+        assert len(stream.targets_in(Rect(0, 0, 800, 600))) == 1
+        balls, snowmen = stream.load(Rect(3000, 0, 800, 600))
+        assert len(balls) == 2 and not snowmen[0].is_complete
+        stream.reset()
+
+def test_damaged_files_are_rejected(tmp_path):
+    path = write(sample_level(), tmp_path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    for bad in (b'XXXX' + data[4:], data[:-8], b''):
+        with open(path, 'wb') as f:
+            f.write(bad)
+        with pytest.raises(ValueError):
+            LevelFile(path)
+
+def test_invalid_stacks_are_rejected():
+    level = Level(800, 600)
+    base = level.add_ball(100, 100, 30)
+    with pytest.raises(ValueError):
+        level.add_ball(100, 100, 40, on=base)
+    with pytest.raises(ValueError):
+        level.add_ball(100, 100, 20, on=5)
+
+def test_stacks_follow_the_snowman_rules():
+    """One ball on each ball and no more than three high, also when read from JSON"""
+    level = Level(800, 600)
+    base = level.add_ball(100, 100, 50)
+    middle = level.add_ball(100, 100, 40, on=base)
+    with pytest.raises(ValueError):
+        level.add_ball(100, 100, 30, on=base)  # A second ball on the base
+    head = level.add_ball(100, 100, 30, on=middle)
+    with pytest.raises(ValueError):
+        level.add_ball(100, 100, 20, on=head)  # A fourth ball up
+    data = level.to_json()
+    data['balls'].append({'x': 100, 'y': 100, 'size': 35, 'on': base})
+    with pytest.raises(ValueError):
+        Level.from_json(data)
+
+def test_game_streams_a_level(tmp_path):
+    """The game starts at the level's spawn and loads only the nearby region"""
+    path = write(sample_level(), tmp_path)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.load_level(path)
+            main.start_game()
+        assert tuple(main.player.position) == (300, 500)
+        assert len(main.placed_snowballs) == 4
+        assert len(main.snowmen) == 1 and main.snowmen[0].is_complete
+        assert len(main.world.zones) == 2
+
+        main.player.position.update(3500, 500)
+        main.camera.follow(main.player.position)
+        main.sync_active_chunks()
+        assert len(main.placed_snowballs) == 6
+        assert len(main.snowmen) == 2
+
+        main.init_game()
+        with contextlib.redirect_stdout(io.StringIO()):
+            main.start_game()
+        assert len(main.placed_snowballs) == 4  # Streamed in again for the new game
+    finally:
+        main.load_level(None)
+        main.init_game()
+
+def test_load_benchmark():
+    """A small run of the level benchmark"""
+    results = bench_level.bench(balls=20000, targets=2000)
+    assert results['all_balls'] == 20000
+    assert results['binary_bytes'] < results['json_bytes']
+    assert results['first_view_balls'] < results['all_balls']
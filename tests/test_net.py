@@ -0,0 +1,111 @@
+"""
+Tests for the shared session, the snapshot protocol and the asyncio server/client
+"""
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_multiplayer
+from game.controls import BotInput, InputState
+from game.session import Session
+from net import protocol
+from net.client import GameClient, bot_client
+from net.server import GameServer
+
+def bot_session(players=4, ticks=600):
+    """A session played by seeded bots, each steering their own player"""
+    session = Session()
+    bots = {}
+    for player_id in range(1, players + 1):
+        player = session.add_player(player_id)
+        bots[player_id] = BotInput(session.world, player.position, player_id)
+    for _ in range(ticks):
+        session.step({player_id: bot.poll() for player_id, bot in bots.items()})
+    return session
+
+def test_session_is_deterministic():
+    """The same inputs always build the same world"""
+    first, second = bot_session(), bot_session()
+    assert first.store.count > 0
+    assert np.array_equal(protocol.ball_records(first), protocol.ball_records(second))
+    assert protocol.player_records(first) == protocol.player_records(second)
+
+def test_input_round_trip():
+    message = protocol.encode_input(7, InputState(-1, 1, True))
+    kind, body = protocol.HEADER.unpack_from(message)[1], message[protocol.HEADER.size:]
+    tick, state = protocol.decode_input(body)
+    assert (kind, tick, state.dx, state.dy, state.roll) == (protocol.INPUT, 7, -1, 1, True)
+
+def test_snapshot_deltas_rebuild_the_full_state():
+    """A delta applied to its base gives exactly the full snapshot, in fewer bytes"""
+    session = bot_session(ticks=400)
+    base_tick, base = session.tick, protocol.ball_records(session)
+    for _ in range(5):
+        session.step({})
+    balls = protocol.ball_records(session)
+    balls['size'][:3] += 1  # A few balls changed since the base
+    players = protocol.player_records(session)
+
+    full = protocol.encode_snapshot(session.tick, players, balls)
+    delta = protocol.encode_snapshot(session.tick, players, balls, base_tick, base)
+    assert len(delta) < len(full)
+    _, _, _, from_full = protocol.decode_snapshot(full[protocol.HEADER.size:], {})
+    tick, got_base, got_players, from_delta = protocol.decode_snapshot(delta[protocol.HEADER.size:], {base_tick: base})
+    assert (tick, got_base) == (session.tick, base_tick)
+    assert np.array_equal(from_full, balls) and np.array_equal(from_delta, balls)
+    assert [player[0] for player in got_players] == [1, 2, 3, 4]
+
+def test_delta_against_an_unknown_base_is_rejected():
+    session = bot_session(players=1, ticks=10)
+    balls = protocol.ball_records(session)
+    delta = protocol.encode_snapshot(11, [], balls, 10, balls)
+    try:
+        protocol.decode_snapshot(delta[protocol.HEADER.size:], {})
+    except protocol.ProtocolError:
+        pass
+    else:
+        assert False, "expected ProtocolError"
+
+async def play(make_clients, ticks):
+    """Run the clients made by make_clients(server) for ticks snapshots each"""
+    server = await GameServer(tick_rate=None).start()
+    clients = make_clients(server)
+    try:
+        for client in clients:
+            await client.connect()
+        await asyncio.wait_for(asyncio.gather(*(client.run(ticks) for client in clients)), 30)
+    finally:
+        for client in clients:
+            await client.close()
+        await server.stop()
+    return server, clients
+
+def test_clients_see_the_server_state():
+    """Every client ends with the balls the server had at the last tick they saw"""
+    def clients(server):
+        bots = [bot_client(server.host, server.port, seed) for seed in range(3)]
+        return bots + [GameClient(server.host, server.port)]  # The last one stands still
+
+    server, bots = asyncio.run(play(clients, 400))
+    assert server.session.store.count > 0
+    for bot in bots:
+        assert bot.snapshots == 400
+        assert bot.deltas == 399  # Only the first snapshot is sent in full
+        assert bot.tick == bots[0].tick
+        assert np.array_equal(bot.balls, server._states[bot.tick])
+        assert len(bot.players) == 4
+    idle = bots[-1]
+    assert idle.position == server.session.spawn
+
+def test_load_test_reports_bandwidth_and_latency():
+    """A small run of the load test benchmark"""
+    results = asyncio.run(bench_multiplayer.load_test(clients=12, ticks=60))
+    assert results['ticks'] >= 60
+    assert results['delta_fraction'] > 0.9
+    assert 0 < results['bytes_per_client_per_tick'] < 2048
+    assert 0 < results['latency_p50_ms'] <= results['latency_p95_ms'] <= results['latency_p99_ms']
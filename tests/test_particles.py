@@ -0,0 +1,95 @@
+"""
+Tests for the NumPy particle system and the celebration screen
+"""
+import os
+import sys
+
+import numpy as np
+import pygame
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_particles
+import main
+from game.controls import InputState, ScriptedInput
+from game.snowman import Snowball, Snowman
+from graphics.particles import ParticleSystem
+
+def test_budget_is_hard():
+    """Emitting past capacity drops the extra particles"""
+    particles = ParticleSystem(capacity=100)
+    assert particles.emit(60, 0, 0) == 60
+    assert particles.emit(60, 0, 0) == 40
+    assert len(particles) == 100
+    assert particles.dropped == 20
+    assert particles.emit(1, 0, 0) == 0
+
+def test_update_integrates_and_drops_dead():
+    """One step applies gravity, drag and velocity, and packs out expired particles"""
+    particles = ParticleSystem(capacity=10, gravity=100.0)
+    particles.emit(2, x=[0, 10], y=[0, 10], vx=[10, 0], vy=[0, -10], life=[1.0, 0.05], weight=1.0)
+    particles.update(0.1)
+    assert len(particles) == 1
+    assert particles.x[0] == np.float32(1.0)
+    assert particles.vy[0] == np.float32(10.0)
+    assert particles.y[0] == np.float32(1.0)
+
+def test_draw_writes_pixels_and_skips_offscreen():
+    """Particles are written into the surface at their offset positions"""
+    surface = pygame.Surface((50, 50))
+    particles = ParticleSystem(capacity=10)
+    particles.emit(3, x=[10, 20, 500], y=[10, 20, 10], size=[1, 2, 1], color=(255, 0, 0), life=5.0, fade=1.0)
+    assert particles.draw(surface, offset=(5, 0)) == 2
+    assert surface.get_at((15, 10))[:3] == (255, 0, 0)
+    assert surface.get_at((26, 21))[:3] == (255, 0, 0)
+    assert surface.get_at((27, 22))[:3] == (0, 0, 0)
+    surface.blit(surface, (0, 0))  # The surface is unlocked again
+
+def test_fading_blends_into_background():
+    """A particle in its fade window is mixed with what is below"""
+    surface = pygame.Surface((10, 10))
+    surface.fill((0, 0, 200))
+    particles = ParticleSystem(capacity=1)
+    particles.emit(1, 5, 5, life=0.5, fade=1.0, color=(200, 0, 0))
+    particles.draw(surface)
+    assert surface.get_at((5, 5))[:3] == (100, 0, 100)
+
+def test_full_budget_stays_alive_and_on_screen():
+    """A short run of the particle benchmark; its frame budget is checked there"""
+    results = bench_particles.bench(particles=5000, frames=30)
+    assert results['alive'] == 5000 and results['dropped'] == 0
+    assert 0 < results['drawn'] <= 5000
+    system = bench_particles.celebration(100)
+    assert system.emit(1, 0, 0) == 0 and system.dropped == 1
+
+def test_completing_a_snowman_starts_the_celebration():
+    """Finishing a snowman throws confetti that is drawn over the game"""
+    main.init_game()
+    main.start_game()
+    base = Snowball(600, 300)
+    base.size = 50
+    middle = Snowball(600, 220)
+    middle.size = 35
+    snowman = Snowman(base)
+    snowman.add_ball(middle)
+    for ball in (base, middle):
+        main.add_placed_snowball(ball)
+    main.snowmen.append(snowman)
+    main.player.position.update(600, 170)
+    main.player.rolling_snowball = Snowball(600, 170)
+    main.player.rolling_snowball.size = 20
+    main.handle_input(ScriptedInput([InputState()]))  # Release space to place
+    assert main.get_game_state() == main.CELEBRATION
+    assert len(main.particles) == main.CONFETTI_BURST
+
+    screen = pygame.Surface((main.WIDTH, main.HEIGHT))
+    plain = pygame.Surface((main.WIDTH, main.HEIGHT))
+    main.draw_game(plain)
+    for _ in range(10):
+        main.update()
+    assert len(main.particles) == main.CONFETTI_BURST + 10 * main.SNOWFALL_PER_TICK
+    main.draw_screen(screen)
+    assert pygame.image.tobytes(screen, 'RGB') != pygame.image.tobytes(plain, 'RGB')
+    main.init_game()
+    assert len(main.particles) == 0
@@ -0,0 +1,85 @@
+"""
+Tests for the per-frame phase profiler
+"""
+import csv
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from game.controls import InputState, ScriptedInput
+from utils.profiler import FrameProfiler, NullProfiler, PHASES
+from utils.timestep import FixedTimestep
+
+def record(profiler, frames):
+    for _ in range(frames):
+        profiler.begin_frame()
+        for phase in PHASES:
+            profiler.mark(phase)
+        profiler.end_frame()
+
+def test_ring_buffer_wraps():
+    """Only the most recent frames are kept"""
+    profiler = FrameProfiler(capacity=8)
+    record(profiler, 20)
+    assert profiler.frames == 20
+    assert len(profiler.recorded()) == 8
+
+def test_phases_add_up_to_frame():
+    """Phase times never exceed the frame total"""
+    profiler = FrameProfiler(capacity=16)
+    record(profiler, 10)
+    samples = profiler.recorded()
+    assert (samples[:, :-1].sum(axis=1) <= samples[:, -1]).all()
+    p50, p95, p99 = profiler.percentiles()['frame']
+    assert 0 <= p50 <= p95 <= p99
+
+def test_export_csv_and_json(tmp_path):
+    """The buffer exports to both formats"""
+    profiler = FrameProfiler(capacity=16)
+    record(profiler, 5)
+
+    csv_path = str(tmp_path / 'profile.csv')
+    profiler.export(csv_path)
+    with open(csv_path) as f:
+        rows = list(csv.reader(f))
+    assert rows[0][-1] == 'frame_ns'
+    assert len(rows) == 6
+
+    json_path = str(tmp_path / 'profile.json')
+    profiler.export(json_path)
+    with open(json_path) as f:
+        data = json.load(f)
+    assert data['frames'] == 5
+    assert data['columns'] == list(PHASES) + ['frame']
+    assert 'frame' in data['percentiles_ms']
+
+def test_null_profiler_is_a_drop_in():
+    """The disabled profiler accepts the same calls"""
+    record(NullProfiler(), 3)
+
+class MarkLog(NullProfiler):
+    """Remembers which phases were marked"""
+    def __init__(self):
+        self.marks = []
+
+    def mark(self, phase):
+        self.marks.append(phase)
+
+def test_update_is_marked_in_every_game_state(monkeypatch):
+    """Menu and celebration ticks never reach handle_input's marks, so the loop marks 'update' itself"""
+    main.init_game()
+    monkeypatch.setattr(main, 'keyboard_input', ScriptedInput([InputState()] * 10))
+    timestep = FixedTimestep(main.args.tick_rate)
+    for state in (main.MENU, main.PLAYING, main.CELEBRATION):
+        if state == main.PLAYING:
+            main.start_game()
+        main.set_game_state(state)
+        log = MarkLog()
+        monkeypatch.setattr(main, 'profiler', log)
+        main.simulate(timestep, 2 / main.args.tick_rate)
+        assert log.marks.count('update') == 1 and log.marks[-1] == 'update', state
+        assert ('input' in log.marks) == (state == main.PLAYING)
+    main.init_game()
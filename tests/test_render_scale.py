@@ -0,0 +1,94 @@
+"""
+Tests for drawing at an internal render resolution and scaling to the display
+"""
+import os
+import sys
+
+import numpy as np
+import pygame
+import pytest
+from pygame import Rect
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_render_scale
+import main
+from game.controls import BotInput
+from graphics.renderer import NullRenderer
+from graphics.viewport import Viewport
+from utils.profiler import FrameProfiler
+
+def test_full_scale_draws_straight_to_the_display():
+    viewport = Viewport((800, 600))
+    display = pygame.Surface((800, 600))
+    rect = Rect(10, 20, 30, 40)
+    assert viewport.direct and viewport.target(display) is display
+    assert viewport.rect(rect) is rect and viewport.image(display) is display
+    assert viewport.point((1.5, 2.5)) == (1.5, 2.5) and viewport.length(36) == 36
+
+def test_logical_coordinates_map_to_the_frame_and_back():
+    viewport = Viewport((800, 600), 0.5, (1600, 1200))
+    display = pygame.Surface((1600, 1200))
+    assert viewport.target(display).get_size() == (400, 300)
+    assert viewport.point((401, 300)) == (200, 150)
+    # Neighbouring zones still meet after scaling
+    left, right = viewport.rect(Rect(0, 0, 401, 600)), viewport.rect(Rect(401, 0, 399, 600))
+    assert left.right == right.left and right.right == 400
+    assert viewport.to_logical((800, 600)) == (400, 300)
+
+def test_scaled_frame_looks_like_the_full_one():
+    """A game frame drawn at half resolution and scaled up is close to the full-size one"""
+    pygame.init()
+    main.init_game()
+    main.start_game()
+    bot = BotInput(main.world, main.player.position, seed=4)
+    main.run_simulation(bot, NullRenderer(), 3000, keep_playing=True)
+    main.set_game_state(main.PLAYING)
+    main.particles.clear()
+    assert main.placed_snowballs
+
+    full = pygame.Surface((main.WIDTH, main.HEIGHT))
+    main.draw_screen(full)
+    display = pygame.Surface((main.WIDTH, main.HEIGHT))
+    viewport = Viewport((main.WIDTH, main.HEIGHT), 0.5, smooth=True)
+    try:
+        main.viewport = viewport
+        main.draw_screen(viewport.target(display))
+        viewport.present(display)
+    finally:
+        main.viewport = Viewport((main.WIDTH, main.HEIGHT))
+    difference = np.abs(pygame.surfarray.array3d(full).astype(int) - pygame.surfarray.array3d(display))
+    assert difference.mean() < 8
+    main.init_game()
+
+def test_menu_clicks_use_logical_coordinates():
+    viewport = Viewport((main.WIDTH, main.HEIGHT), 1.0, (2 * main.WIDTH, 2 * main.HEIGHT))
+    pygame.init()
+    main.init_game()
+    _, button = main.load_play_button()
+    main.handle_mouse_click(viewport.to_logical((2 * button.centerx, 2 * button.centery)))
+    assert main.get_game_state() == main.PLAYING
+    main.init_game()
+
+def test_render_scale_benchmark():
+    """A small run of the benchmark; every scale fills the whole display"""
+    results = bench_render_scale.bench(balls=100, frames=10, scales=(1.0, 0.5))
+    assert set(results) == {1.0, 0.5}
+    assert all(draw > 0 for draw, _ in results.values())
+    assert main.viewport.direct
+
+def test_profile_overlay_sits_at_the_bottom_of_the_window(monkeypatch):
+    pygame.init()
+    monkeypatch.setattr(main, 'viewport', Viewport((main.WIDTH, main.HEIGHT), 0.5, (1600, 1200)))
+    monkeypatch.setattr(main, 'profiler', FrameProfiler())
+    display = pygame.Surface((1600, 1200))
+    rect = main.draw_profile_overlay(display)
+    assert rect.bottom == 1195 and rect.left == 5
+
+def test_bad_window_and_scale_are_usage_errors(capsys):
+    assert main.parse_args(['--window', '1600X1200']).window == (1600, 1200)
+    for argv in (['--window', '1600'], ['--window', 'big'], ['--window', '0x600'], ['--render-scale', '-1']):
+        with pytest.raises(SystemExit):
+            main.parse_args(argv)
+        assert 'invalid' in capsys.readouterr().err
@@ -0,0 +1,105 @@
+"""
+Tests for the rewind ring buffer
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_rewind
+import main
+from game.controls import BotInput, InputState, ScriptedInput
+from game.rewind import RewindBuffer, BALL_FIELDS
+from graphics.renderer import NullRenderer
+
+def snapshot():
+    """Copy of everything rewind has to bring back"""
+    store = main.snowball_store
+    return {
+        'player': (main.player.position.x, main.player.position.y),
+        'rolling': main.player.rolling_snowball.size if main.player.rolling_snowball else None,
+        'arrays': {name: getattr(store, name)[:store.count].copy() for name in BALL_FIELDS},
+        'snowmen': sorted(
+            (s.base._slot, s.middle._slot if s.middle else -1, s.head._slot if s.head else -1, s.is_complete)
+            for s in main.snowmen if s.base
+        ),
+        'balls': list(main.placed_snowballs),
+    }
+
+def test_rewind_restores_earlier_world():
+    """Rewinding N ticks brings back exactly the world from N ticks ago"""
+    main.init_game()
+    main.start_game()
+    bot = BotInput(main.world, main.player.position, seed=4)
+    main.run_simulation(bot, NullRenderer(), 3000, keep_playing=True)
+    before = snapshot()
+    main.run_simulation(bot, NullRenderer(), 500, keep_playing=True)
+    assert len(main.placed_snowballs) > len(before['balls'])
+
+    assert main.rewind_game(500 / main.args.tick_rate)
+    after = snapshot()
+    assert after['player'] == before['player']
+    assert after['rolling'] == before['rolling']
+    assert after['balls'] == before['balls']
+    assert after['snowmen'] == before['snowmen']
+    for name in BALL_FIELDS:
+        assert np.array_equal(after['arrays'][name], before['arrays'][name]), name
+    for ball in main.placed_snowballs:
+        if ball.stacked_on:
+            assert ball.stacked_on.stacked_by is ball
+
+def test_rewind_from_input():
+    """A rewind input steps back and play carries on from there"""
+    main.init_game()
+    main.start_game()
+    start = main.player.position.copy()
+    script = [InputState(dx=-1)] * 30 + [InputState(rewind=True)] + [InputState(dy=1)] * 5
+    main.run_simulation(ScriptedInput(script), NullRenderer())
+    # Three seconds is more history than there is, so it stops at the first recorded tick
+    speed = main.player.speed
+    assert main.player.position.x == start.x - speed
+    assert main.player.position.y == start.y + 5 * speed
+
+def test_memory_budget_is_fixed():
+    """Old keyframe groups are dropped to stay under the byte budget"""
+    main.init_game()
+    main.start_game()
+    main.rewind_buffer = RewindBuffer(max_bytes=64 * 1024, keyframe_interval=30)
+    bot = BotInput(main.world, main.player.position, seed=8)
+    main.run_simulation(bot, NullRenderer(), 5000, keep_playing=True)
+    buffer = main.rewind_buffer
+    assert buffer.nbytes <= 64 * 1024
+    assert buffer.frames[0].keyframe
+    assert buffer.oldest_tick > 0
+    assert buffer.state_at(buffer.oldest_tick) is not None
+
+def test_keyframe_group_over_the_budget():
+    """A single group bigger than max_bytes is kept whole, so every tick can still be rebuilt"""
+    bench_rewind.populate(100)
+    store = main.snowball_store
+    buffer = RewindBuffer(max_bytes=10000, keyframe_interval=30)
+    recorded = {}
+    for _ in range(100):
+        store.x[:store.count] += 1  # Every ball changes every tick
+        recorded[buffer.tick] = store.x[:store.count].copy()
+        buffer.record(main.player, store)
+        assert buffer.frames[0].keyframe
+    assert buffer.nbytes > buffer.max_bytes and buffer.oldest_tick == 90
+    for tick in range(buffer.oldest_tick, buffer.tick):
+        _, _, arrays, _ = buffer.state_at(tick)
+        assert np.array_equal(arrays['x'], recorded[tick])
+    main.init_game()
+
+def test_recording_many_growing_balls():
+    """A short run of the recording benchmark; its per-tick budget is checked there"""
+    results = bench_rewind.bench(balls=1000, ticks=60)
+    buffer = results['buffer']
+    store = main.snowball_store
+    assert len(buffer) == 60 and buffer.frames[0].keyframe
+    count, _, arrays, _ = buffer.state_at(buffer.frames[-1].tick)
+    assert count == store.count
+    assert np.array_equal(arrays['size'], store.size[:count])
+    main.init_game()
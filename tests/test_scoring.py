@@ -0,0 +1,151 @@
+"""
+Tests for snowman scoring, the SQLite score store and the HTTP leaderboard
+"""
+import os
+import random
+import sys
+import threading
+import urllib.error
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_scores
+import main
+from game.controls import BotInput, ScriptedInput
+from game.scoring import ScoreStore, SnowmanScore, proportion, score_snowman
+from game.snowman import Snowball, Snowman
+from net.leaderboard import LeaderboardServer, fetch, post_score
+
+def build_snowman(*sizes):
+    balls = []
+    for size in sizes:
+        ball = Snowball(100, 100)
+        ball.size = size
+        balls.append(ball)
+    snowman = Snowman(balls[0])
+    for ball in balls[1:]:
+        snowman.add_ball(ball)
+    return snowman
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScoreStore(str(tmp_path / 'scores.sqlite'))
+    yield store
+    store.close()
+
+def test_scores_reward_size_shape_and_speed():
+    ideal = build_snowman(50, 35, 24.5)
+    lopsided = build_snowman(50, 49, 10)
+    assert proportion([50, 35, 24.5]) == pytest.approx(1.0)
+    assert score_snowman(ideal) > score_snowman(lopsided)
+    assert score_snowman(build_snowman(60, 42, 29.4)) > score_snowman(ideal)
+    assert score_snowman(ideal, 5) > score_snowman(ideal, 25) > score_snowman(ideal, 60) == score_snowman(ideal)
+
+def test_writes_happen_off_the_calling_thread(store):
+    """submit() only queues; the writer thread commits in batches"""
+    writers = []
+    gate = threading.Event()
+    original = store._write
+
+    def write(writer, items):
+        gate.wait(5)  # Hold the first transaction while the rest queue up
+        writers.append((threading.current_thread(), len(items)))
+        original(writer, items)
+
+    store._write = write
+    for points in range(100):
+        store.submit(SnowmanScore('ada', points, (50, 35, 24)))
+    gate.set()
+    store.flush()
+    assert store.written == 100 and not store.errors
+    assert {thread for thread, _ in writers} == {store.thread}
+    assert len(writers) <= 2  # The scores queued meanwhile share one transaction
+    assert [points for _, points, _ in store.top(3)] == [99, 98, 97]
+
+def test_ranks_match_a_full_sort(store):
+    """Per-player bests and ranks agree with sorting every result"""
+    rng = random.Random(3)
+    players = ['p%d' % i for i in range(40)]
+    results = [SnowmanScore(rng.choice(players), rng.randint(0, 60), (50, 35, 24)) for _ in range(500)]
+    for score in results[:200]:
+        store.submit(score)
+    store.flush()
+    store.bulk_load(results[200:])
+
+    best = {}
+    for score in results:
+        best[score.player] = max(score.points, best.get(score.player, score.points))
+    for player, points in best.items():
+        expected = 1 + sum(1 for other in best.values() if other > points)
+        assert store.player_rank(player) == (expected, points)
+    assert store.player_rank('nobody') is None
+    assert store.top_players(1)[0][1] == max(best.values())
+    assert [points for _, points, _ in store.top(5)] == sorted((s.points for s in results), reverse=True)[:5]
+
+def test_scores_survive_reopening(tmp_path):
+    path = str(tmp_path / 'scores.sqlite')
+    first = ScoreStore(path)
+    first.submit(SnowmanScore('ada', 120, (50, 35, 24)))
+    first.record_session('ada', 0.0, 60.0, 1, 120)
+    first.close()
+    second = ScoreStore(path)
+    assert second.player_rank('ada') == (1, 120)
+    second.close()
+
+def test_game_records_finished_snowmen(store, monkeypatch):
+    """A completed snowman is scored with its build time and queued"""
+    main.init_game()
+    monkeypatch.setattr(main, 'score_store', store)
+    snowman = build_snowman(50, 35, 24.5)
+    main.snowman_started[snowman] = 0
+    monkeypatch.setattr(main, 'game_tick', 10 * main.args.tick_rate)
+    score = main.record_snowman(snowman)
+    assert score.build_seconds == 10
+    assert score.points == score_snowman(snowman, 10)
+    store.flush()
+    assert store.player_rank(main.args.player) == (1, score.points)
+    main.init_game()
+
+def test_rebuilding_a_rewound_snowman_scores_it_once(store, monkeypatch):
+    """Rewinding past a finished snowman takes its score back, so finishing it again counts once"""
+    main.init_game()
+    for name, value in (('score_store', store), ('session_points', 0), ('session_snowmen', 0), ('pending_scores', [])):
+        monkeypatch.setattr(main, name, value)
+    main.start_game()
+    bot = BotInput(main.world, main.player.position, seed=4)
+    inputs = []
+    while main.session_snowmen == 0:
+        inputs.append(bot.poll())
+        main.handle_input(ScriptedInput(inputs[-1:]))
+    assert main.rewind_game(60 / main.args.tick_rate)
+    assert main.session_snowmen == 0 and main.session_points == 0
+    main.set_game_state(main.PLAYING)
+    main.run_simulation(ScriptedInput(inputs[-60:]), main.NullRenderer(), keep_playing=True)
+    assert main.session_snowmen == 1
+    points = main.session_points
+
+    main.init_game()
+    store.flush()
+    assert [row[1] for row in store.top(10)] == [points]
+
+def test_http_leaderboard(store):
+    server = LeaderboardServer(store).start()
+    try:
+        post_score(server.url, SnowmanScore('ada', 150, (50, 35, 24)))
+        post_score(server.url, SnowmanScore('bob', 90, (40, 28, 20)))
+        store.flush()
+        assert [row['player'] for row in fetch(server.url + '/top?k=5')] == ['ada', 'bob']
+        assert fetch(server.url + '/rank?player=bob') == {'player': 'bob', 'rank': 2, 'best': 90}
+        with pytest.raises(urllib.error.HTTPError):
+            fetch(server.url + '/rank?player=nobody')
+    finally:
+        server.stop()
+
+def test_query_benchmark_runs():
+    """A small run of the query benchmark; its latency budget is checked there"""
+    results = bench_scores.bench(scores=10000, players=1000, repeat=10)
+    assert set(results) == {'top_10', 'top_100', 'top_players_10', 'player_rank', 'player_scores'}
+    assert all(0 < median <= worst for median, worst in results.values())
@@ -0,0 +1,76 @@
+"""
+Tests for background screenshot capture and golden-image comparison
+"""
+import os
+import sys
+
+import numpy as np
+import pygame
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from graphics.screenshots import ScreenshotWriter, capture, compare_images, load_pixels, save_pixels
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), '..', 'test_screenshots')
+# Set UPDATE_GOLDENS=1 to rewrite the reference images after an intended change
+UPDATE_GOLDENS = os.environ.get('UPDATE_GOLDENS') == '1'
+
+def render(state):
+    """Draw one frame of the given state onto a fresh surface"""
+    main.init_game()
+    if state == main.PLAYING:
+        main.set_game_state(main.PLAYING)
+        main.player = main.Player(main.WIDTH // 2, main.HEIGHT // 2)
+    surface = pygame.Surface((main.WIDTH, main.HEIGHT))
+    surface.fill(main.BLACK)
+    main.draw_screen(surface)
+    main.init_game()
+    return surface
+
+def test_frames_match_golden_images(tmp_path):
+    """Menu and game start still look like the reference screenshots"""
+    for state, name in [(main.MENU, 'menu.png'), (main.PLAYING, 'game_start.png')]:
+        pixels = capture(render(state))
+        golden = os.path.join(GOLDEN_DIR, name)
+        if UPDATE_GOLDENS:
+            save_pixels(pixels, golden)
+        # Allow a little font rasterization drift between platforms
+        diff = compare_images(pixels, golden, tolerance=8, max_mismatch=0.002)
+        if not diff:
+            diff.save(str(tmp_path / f'diff_{name}'))
+        assert diff, f"{name}: {diff.mismatched} pixels differ (max delta {diff.max_delta}), see {tmp_path}"
+
+def test_writer_saves_exact_pixels(tmp_path):
+    """Frames written by the background thread load back unchanged"""
+    surface = render(main.PLAYING)
+    writer = ScreenshotWriter(max_pending=4)
+    paths = [str(tmp_path / f'frame_{i}.png') for i in range(3)]
+    for path in paths:
+        assert writer.submit(surface, path, block=True)
+    writer.close()
+    assert writer.written == 3 and not writer.errors
+    for path in paths:
+        assert compare_images(load_pixels(path), capture(surface)).max_delta == 0
+
+def test_capture_is_a_snapshot():
+    """Drawing after capture does not change the captured pixels"""
+    surface = pygame.Surface((20, 10))
+    surface.fill((10, 20, 30))
+    pixels = capture(surface)
+    surface.fill((255, 255, 255))
+    assert pixels.shape == (20, 10, 3)
+    assert (pixels == (10, 20, 30)).all()
+
+def test_compare_tolerance_and_diff_image():
+    """Small differences pass within tolerance; the diff marks changed pixels"""
+    expected = np.zeros((10, 10, 3), dtype=np.uint8)
+    actual = expected.copy()
+    actual[2, 3] = (5, 0, 0)
+    actual[7, 7] = (0, 200, 0)
+    diff = compare_images(actual, expected, tolerance=10)
+    assert diff.mismatched == 1 and diff.max_delta == 200 and not diff
+    assert compare_images(actual, expected, tolerance=10, max_mismatch=0.02)
+    marked = diff.diff_image()[..., 0]
+    assert marked[7, 7] == 200 and marked[2, 3] > 0 and marked[0, 0] == 0
+    assert not compare_images(actual[:5], expected)
@@ -0,0 +1,57 @@
+"""
+Tests for the snowball spatial index
+"""
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.snowman import Snowball
+from game.spatial import SnowballIndex
+import main
+
+def make_ball(x, y, size):
+    ball = Snowball(x, y)
+    ball.size = size
+    return ball
+
+def test_index_matches_linear_scan():
+    """Indexed lookup should give the same answer as sorting every ball"""
+    rng = random.Random(1234)
+    placed = []
+    index = SnowballIndex()
+    for _ in range(400):
+        ball = make_ball(rng.uniform(400, 800), rng.uniform(0, 600), rng.randint(20, 60))
+        placed.append(ball)
+        index.track(ball)
+
+    for _ in range(200):
+        probe = make_ball(rng.uniform(400, 800), rng.uniform(0, 600), rng.randint(20, 60))
+        expected = main.find_stackable_snowball(probe, placed, [])
+        assert main.find_stackable_snowball(probe, placed, [], index) is expected
+
+def test_index_follows_stacking():
+    """Stacked balls leave the index and come back when unstacked"""
+    index = SnowballIndex()
+    base = make_ball(600, 300, 50)
+    top = make_ball(600, 250, 30)
+    index.track(base)
+    index.track(top)
+    assert base in index and top in index
+
+    assert top.stack_on(base)
+    assert base not in index and top not in index
+
+    top.unstack()
+    assert base in index and top in index
+
+def test_index_prefers_largest_then_oldest():
+    """Ties in size fall back to placement order"""
+    index = SnowballIndex()
+    first = make_ball(600, 300, 40)
+    second = make_ball(610, 300, 40)
+    index.track(first)
+    index.track(second)
+    probe = make_ball(605, 260, 20)
+    assert index.find_base(probe) is first
@@ -0,0 +1,49 @@
+"""
+Tests for the pre-rendered snowball sprite cache
+"""
+import os
+import sys
+
+import pygame
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graphics.sprites import SnowballSpriteCache, PLAIN, COMPLETE
+
+def draw_circles(surface, center, radius, complete):
+    """The draw.circle calls a sprite replaces"""
+    pygame.draw.circle(surface, (255, 255, 255), center, radius)
+    pygame.draw.circle(surface, (0, 0, 0), center, radius, 1)
+    if complete:
+        pygame.draw.circle(surface, (200, 255, 200), center, radius + 2, 1)
+
+def test_sprites_match_draw_circle():
+    """Blitting a sprite gives the same pixels as drawing the circles"""
+    cache = SnowballSpriteCache()
+    for size in (20, 20.7, 33.4, 60):
+        for variant in (PLAIN, COMPLETE):
+            drawn = pygame.Surface((200, 200))
+            blitted = pygame.Surface((200, 200))
+            drawn.fill((220, 255, 220))
+            blitted.fill((220, 255, 220))
+            draw_circles(drawn, (100, 90), int(size), variant == COMPLETE)
+            surface, offset = cache.get(size, variant)
+            blitted.blit(surface, (100 - offset, 90 - offset))
+            assert pygame.image.tobytes(drawn, 'RGB') == pygame.image.tobytes(blitted, 'RGB')
+
+def test_sprites_are_shared_per_radius():
+    """Sizes that round to the same radius share one sprite"""
+    cache = SnowballSpriteCache()
+    assert cache.get(30.2)[0] is cache.get(30.9)[0]
+    assert cache.get(30.2)[0] is not cache.get(31.0)[0]
+    coarse = SnowballSpriteCache(step=4)
+    assert coarse.get(29)[0] is coarse.get(31)[0]
+
+def test_prewarm_covers_size_range():
+    """Prewarming renders every radius a growing ball can reach"""
+    cache = SnowballSpriteCache()
+    cache.prewarm(20, 60)
+    count = len(cache.sprites)
+    for tenth in range(200, 601):
+        cache.get(tenth / 10, COMPLETE)
+    assert len(cache.sprites) == count
@@ -0,0 +1,35 @@
+"""
+Tests that importing the game stays cheap; the startup budgets are checked by bench_startup
+"""
+import os
+import subprocess
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_startup
+
+CHECK_SDL = """
+import pygame
+import game.controls, game.player, game.pool, game.rewind, game.snowman
+import game.spatial, game.store, game.temperature, game.terrain, game.world
+game_only = (pygame.get_init(), pygame.display.get_init())
+import main
+print(game_only, (pygame.get_init(), pygame.display.get_init(), pygame.display.get_surface() is None))
+"""
+
+def test_imports_do_not_initialize_sdl():
+    """game.* and main can be imported without starting SDL or opening a window"""
+    result = subprocess.run(
+        [sys.executable, '-c', CHECK_SDL], env=bench_startup._env(),
+        capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == '(False, False) (False, False, True)'
+
+def test_import_time_report_covers_the_game():
+    """-X importtime output is parsed into per-module timings"""
+    times = bench_startup.import_times('main')
+    assert {'main', 'game.world', 'numpy', 'pygame'} <= set(times)
+    own, cumulative = times['main']
+    assert 0 < own <= cumulative
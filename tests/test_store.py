@@ -0,0 +1,94 @@
+"""
+Tests for the array-backed snowball store
+"""
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.snowman import Snowball, Snowman
+from game.store import SnowballStore
+
+def build_scene(seed):
+    """Place random balls and stack some of them into snowmen"""
+    rng = random.Random(seed)
+    balls = []
+    for _ in range(60):
+        ball = Snowball(rng.uniform(400, 800), rng.uniform(0, 600))
+        ball.size = rng.uniform(20, 60)
+        ball.is_rolling = rng.random() < 0.7  # Placed balls keep their rolling flag
+        balls.append(ball)
+    for base, middle, head in zip(balls[0:30:3], balls[1:30:3], balls[2:30:3]):
+        base.size, middle.size, head.size = 58, 40, 22
+        middle.position = base.position + (0, -base.size - middle.size)
+        head.position = middle.position + (0, -middle.size - head.size)
+        snowman = Snowman(base)
+        snowman.add_ball(middle)
+        snowman.add_ball(head)
+    return balls
+
+def test_vectorized_update_matches_objects():
+    """One store update equals calling Snowball.update on every ball"""
+    expected = build_scene(7)
+    actual = build_scene(7)
+    store = SnowballStore(capacity=8)  # Force the arrays to grow
+    for ball in actual:
+        store.add(ball)
+
+    for _ in range(250):
+        for ball in expected:
+            ball.update(ball.position)
+        store.update()
+
+    for want, got in zip(expected, actual):
+        assert abs(want.size - got.size) < 1e-9
+        assert (want.position - got.position).length() < 1e-9
+        assert want.is_rolling == got.is_rolling
+
+def test_balls_are_views():
+    """Attribute writes on an attached ball go straight to the arrays"""
+    store = SnowballStore()
+    ball = Snowball(10, 20)
+    slot = store.add(ball)
+    ball.size = 42
+    ball.position = (30, 40)
+    assert store.size[slot] == 42
+    assert (store.x[slot], store.y[slot]) == (30, 40)
+    assert ball.position.x == 30 and ball.size == 42
+
+def test_position_changed_in_place_moves_the_ball():
+    """In-place changes to a stored ball's position reach the arrays, as on a detached ball"""
+    store = SnowballStore()
+    ball = Snowball(10, 20)
+    slot = store.add(ball)
+    ball.position.x += 1
+    ball.position.update(ball.position.x, 25)
+    position = ball.position
+    position += (1, 1)
+    assert (store.x[slot], store.y[slot]) == (12, 26)
+    moved = ball.position + (100, 100)  # A new vector, not the ball
+    moved.x = 0
+    assert ball.position == (12, 26)
+    store.remove(ball)
+    assert ball.position == (12, 26)
+
+def test_remove_keeps_links():
+    """Removing a ball moves the last slot without breaking stacks"""
+    store = SnowballStore()
+    loose = Snowball(0, 0)
+    base = Snowball(600, 300)
+    top = Snowball(600, 260)
+    base.size, top.size = 50, 30
+    for ball in (loose, base, top):
+        store.add(ball)
+    assert top.stack_on(base)
+
+    store.remove(loose)
+    assert loose.position == (0, 0) and loose.size == 20
+    assert len(store) == 2
+    assert store.balls[base._slot] is base
+    assert store.stacked_on[top._slot] == base._slot
+
+    store.update()
+    assert top.position.y == base.position.y - base.size - top.size
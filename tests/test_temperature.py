@@ -0,0 +1,124 @@
+"""
+Tests for the temperature field and batched melting
+"""
+import os
+import sys
+
+import numpy as np
+from pygame import Rect
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from game.controls import InputState, ScriptedInput
+from game.snowman import Snowball, Snowman
+from game.store import SnowballStore
+from game.temperature import TemperatureField, MELTED_SIZE
+
+def test_source_warms_its_surroundings():
+    """Heat spreads out from a source and fades towards ambient further away"""
+    field = TemperatureField(Rect(0, 0, 800, 600), cell_size=32, ambient=-4.0)
+    field.add_source((400, 300), power=8.0, radius=48)
+    for _ in range(300):
+        field.step(0.1)
+    near = field.temperature_at((400, 300))
+    middle = field.temperature_at((500, 300))
+    far = field.temperature_at((10, 10))
+    assert near > 0 > far
+    assert near > middle > far
+    assert abs(far - field.ambient) < 0.5
+
+def test_field_cools_back_to_ambient():
+    """Without sources every cell relaxes towards ambient and stays finite"""
+    field = TemperatureField(Rect(0, 0, 320, 320), cell_size=32, ambient=-2.0, diffusion=50000.0)
+    field.temperature[3, 3] = 40.0
+    for _ in range(1000):
+        field.step(0.1)
+    assert np.isfinite(field.temperature).all()
+    assert np.abs(field.temperature - field.ambient).max() < 0.05
+
+def test_step_runs_at_a_fixed_rate():
+    """Short ticks are banked until a whole step is due"""
+    field = TemperatureField(Rect(0, 0, 64, 64), step_interval=0.125)
+    for _ in range(3):
+        assert field.step(1 / 32) == 0.0
+    assert field.step(1 / 32) == 0.125
+
+def test_step_only_touches_the_given_area():
+    """Cells outside the stepped area keep their temperature"""
+    field = TemperatureField(Rect(0, 0, 640, 640), cell_size=32)
+    field.add_source((100, 100), power=8.0)
+    field.add_source((600, 600), power=8.0)
+    for _ in range(20):
+        field.step(0.25, Rect(0, 0, 320, 320))
+    assert field.temperature_at((100, 100)) > field.ambient
+    assert field.temperature_at((600, 600)) == field.ambient
+
+def test_melt_shrinks_warm_balls_in_one_pass():
+    """Balls in warm cells shrink in proportion to the warmth, cold ones keep their size"""
+    field = TemperatureField(Rect(0, 0, 320, 320), cell_size=32)
+    field.temperature[0, 0] = 10.0
+    field.temperature[5, 5] = 5.0
+    store = SnowballStore()
+    warm, warmer, cold = Snowball(170, 170), Snowball(10, 10), Snowball(300, 10)
+    for ball in (warm, warmer, cold):
+        ball.size = 30
+        store.add(ball)
+    assert field.melt(store, 2.0, rate=0.1) == []
+    assert warm.size == 29 and warmer.size == 28 and cold.size == 30
+    field.melt(store, 100.0, rate=0.1)
+    assert warmer.size == MELTED_SIZE
+
+def test_melted_snowman_is_dismantled():
+    """A stack whose lower ball melts to the size of the one above breaks apart"""
+    main.init_game()
+    main.start_game()
+    base = Snowball(700, 500)
+    base.size = 30
+    middle = Snowball(700, 440)
+    middle.size = 25
+    snowman = Snowman(base)
+    snowman.add_ball(middle)
+    for ball in (base, middle):
+        main.add_placed_snowball(ball)
+    main.snowmen.append(snowman)
+    # Only the base sits in warm air
+    main.temperature.temperature.fill(-5.0)
+    main.temperature.temperature[main.temperature._cell(base.position)] = 10.0
+    main.melt_snowballs(10.0)
+    assert base.size == 25
+    assert middle.stacked_on is None and base.stacked_by is None
+    assert middle.snowman is None and base.snowman is None
+    assert snowman not in main.snowmen
+    assert base in main.snowball_index and middle in main.snowball_index  # Free to restack
+    main.init_game()
+
+def test_ball_placed_in_play_melts():
+    """A ball rolled and placed through the input path shrinks in warm air"""
+    main.init_game()
+    main.start_game()
+    script = [InputState(-1, 0, roll=True)] * 20 + [InputState(1, 0, roll=True)] * 30 + [InputState()]
+    controls = ScriptedInput(script)
+    for _ in script:
+        assert main.handle_input(controls)
+    ball = main.placed_snowballs[0]
+    placed_size = ball.size
+    field = main.temperature
+    ambient = field.ambient
+    field.ambient = 20.0
+    field.temperature.fill(20.0)
+    idle = ScriptedInput([InputState()] * 600)
+    try:
+        for _ in range(600):
+            main.handle_input(idle)
+        assert ball.size < placed_size
+    finally:
+        field.ambient = ambient
+        main.init_game()
+
+def test_campfires_are_opt_in(monkeypatch):
+    """The default world has no heat; --campfires lights one per building zone"""
+    assert main.create_temperature().sources == []
+    monkeypatch.setattr(main.args, 'campfires', True)
+    sources = main.create_temperature().sources
+    assert len(sources) == 1 and main.world.building_zone.collidepoint(sources[0][0])
@@ -0,0 +1,138 @@
+"""
+Tests for the snow-depth terrain and its incremental rendering
+"""
+import os
+import sys
+
+import numpy as np
+import pygame
+from pygame import Rect
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_terrain
+import main
+from game.controls import InputState, ScriptedInput
+from game.terrain import SnowTerrain, growth_from_snow
+from graphics.terrain import TerrainSurface
+
+def test_collect_scoops_snow_under_the_ball():
+    """Collecting lowers depth under the disc only and returns the volume taken"""
+    terrain = SnowTerrain(Rect(100, 0, 40, 40), tile_size=4)
+    volume = terrain.collect((120, 20), 6, bite=0.5)
+    assert volume > 0
+    assert terrain.depth_at((120, 20)) == 0.5
+    assert terrain.depth_at((101, 1)) == 1.0
+    assert volume == (terrain.max_depth * 40 * 40 - terrain.depth.sum() * 16)
+    # Scooping the same spot again finds less snow
+    assert terrain.collect((120, 20), 6, bite=0.5) < volume
+    assert terrain.collect((0, 0), 6) == 0.0
+
+def test_growth_follows_snow_collected():
+    """Growth is proportional to volume and the same rate for any ball on fresh snow"""
+    assert growth_from_snow(200.0, 10) == 2 * growth_from_snow(100.0, 10)
+    assert growth_from_snow(0.0, 10) == 0.0
+    assert growth_from_snow(100.0, 0) == 0.0
+    # Sweeping a strip 2r wide over fresh snow gives volume proportional to r
+    small = growth_from_snow(2 * 10 * 5, 10)
+    large = growth_from_snow(2 * 40 * 5, 40)
+    assert abs(small - large) < 1e-9
+
+def test_regeneration_refills_scooped_snow():
+    """Snow grows back in batched passes until the terrain is full again"""
+    terrain = SnowTerrain(Rect(0, 0, 40, 40), tile_size=4, regen_per_second=1.0, regen_interval=0.1)
+    terrain.collect((20, 20), 8, bite=1.0)
+    assert terrain.depth_at((20, 20)) == 0.0
+    terrain.regenerate(0.05)
+    assert terrain.depth_at((20, 20)) == 0.0  # Not due yet
+    terrain.regenerate(0.05)
+    assert abs(terrain.depth_at((20, 20)) - 0.1) < 1e-6
+    for _ in range(20):
+        terrain.regenerate(0.1)
+    assert terrain.depth.min() == terrain.max_depth
+    assert terrain._low_box is None
+
+def test_only_changed_tiles_are_dirty():
+    """take_dirty reports the scooped tiles once and refresh repaints only them"""
+    terrain = SnowTerrain(Rect(200, 100, 80, 80), tile_size=4)
+    field = TerrainSurface(terrain, (200, 255, 200))
+    assert field.refresh() is None
+    terrain.collect((240, 140), 5)
+    area = field.refresh()
+    assert area is not None and area.w <= 16 and area.h <= 16
+    assert area.collidepoint(240, 140)
+    assert field.surface.get_at((40, 40))[:3] != (200, 255, 200)
+    assert field.surface.get_at((0, 0))[:3] == (200, 255, 200)
+    assert field.refresh() is None  # Nothing changed since
+    xs, _ = terrain.take_dirty()
+    assert len(xs) == 0
+
+def test_untouched_terrain_matches_the_zone_colour():
+    """Fresh snow draws exactly like the plain zone did"""
+    terrain = SnowTerrain(Rect(0, 0, 30, 30), tile_size=4)  # Edge tiles cut off
+    field = TerrainSurface(terrain, (200, 255, 200))
+    terrain.collect((28, 28), 3, bite=1.0)
+    field.refresh()
+    terrain.reset()
+    field.refresh()
+    plain = pygame.Surface((30, 30), 0, 32)
+    plain.fill((200, 255, 200))
+    assert pygame.image.tobytes(field.surface, 'RGB') == pygame.image.tobytes(plain, 'RGB')
+
+def test_per_pixel_terrain_repaints_what_was_scooped():
+    """A short run of the terrain benchmark; its per-tick budget is checked there"""
+    results = bench_terrain.bench(ticks=60)
+    assert results['collected'] > 0
+    assert results['repainted'] == 60
+    assert results['field'].surface.get_at((0, 0))[:3] == bench_terrain.SNOW_COLOR  # Never scooped
+
+def run_ticks(state, n):
+    controls = ScriptedInput([state] * n)
+    for _ in range(n):
+        main.handle_input(controls)
+
+def test_rolling_grows_by_snow_collected():
+    """In the game the rolling ball only grows where there is snow to pick up"""
+    main.init_game()
+    main.start_game()
+    main.player.position.update(200, 300)
+    run_ticks(InputState(roll=True), 1)
+    ball = main.player.rolling_snowball
+    start = ball.size
+    run_ticks(InputState(1, 0, roll=True), 30)
+    grown = ball.size - start
+    assert grown > 0
+    terrain = main.snow_terrain_at(main.player.position)
+    assert terrain.depth_at(main.player.position) < terrain.max_depth
+
+    # Scraping the same spot bare stops the growth
+    run_ticks(InputState(roll=True), 100)
+    before = ball.size
+    run_ticks(InputState(roll=True), 1)
+    assert ball.size - before < grown / 30
+
+    # The dirty renderer repaints the scooped snow into its background
+    screen = pygame.Surface((main.WIDTH, main.HEIGHT))
+    full = pygame.Surface((main.WIDTH, main.HEIGHT))
+    main.draw_game_dirty(screen)
+    run_ticks(InputState(0, 1, roll=True), 10)
+    main.draw_game_dirty(screen)
+    main.draw_game(full)
+    assert pygame.image.tobytes(screen, 'RGB') == pygame.image.tobytes(full, 'RGB')
+    main.init_game()
+    assert not main.snow_fields
+
+def test_placed_balls_stop_growing():
+    """Once placed a ball picks up no snow, so it keeps its size"""
+    main.init_game()
+    main.start_game()
+    run_ticks(InputState(-1, 0, roll=True), 20)
+    run_ticks(InputState(1, 0, roll=True), 30)
+    run_ticks(InputState(), 1)
+    ball = main.placed_snowballs[0]
+    placed_size = ball.size
+    assert not ball.is_rolling
+    run_ticks(InputState(), 300)
+    assert ball.size == placed_size
+    main.init_game()
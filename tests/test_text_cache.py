@@ -0,0 +1,48 @@
+"""
+Tests for the font registry and text surface cache
+"""
+import os
+import sys
+
+import pygame
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from graphics.text import TextCache, get_font
+
+def test_font_registry_reuses_fonts():
+    """The same (name, size) gives back the same Font"""
+    assert get_font(None, 36) is get_font(None, 36)
+    assert get_font(None, 36) is not get_font(None, 64)
+
+def test_hits_and_misses():
+    """Repeated renders come from the cache"""
+    cache = TextCache()
+    first = cache.render("SNOWBALL", 36, (255, 0, 0))
+    assert cache.render("SNOWBALL", 36, (255, 0, 0)) is first
+    cache.render("SNOWBALL", 36, (0, 100, 0))  # Different color is a new entry
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.stats()['hit_rate'] == 1 / 3
+
+def test_matches_direct_render():
+    """Cached surfaces have the same pixels as rendering directly"""
+    cache = TextCache()
+    cached = cache.render("SNOWMAN", 36, (0, 100, 0))
+    direct = pygame.font.Font(None, 36).render("SNOWMAN", True, (0, 100, 0))
+    assert pygame.image.tobytes(cached, 'RGBA') == pygame.image.tobytes(direct, 'RGBA')
+
+def test_lru_eviction_respects_budgets():
+    """Least recently used entries go first and memory stays bounded"""
+    cache = TextCache(max_entries=3)
+    for text in ("a", "b", "c"):
+        cache.render(text, 20, (0, 0, 0))
+    cache.render("a", 20, (0, 0, 0))  # Make "a" most recently used
+    cache.render("d", 20, (0, 0, 0))
+    keys = [key[2] for key in cache.entries]
+    assert keys == ["c", "a", "d"]
+    assert cache.evictions == 1
+
+    small = TextCache(max_bytes=20000)
+    for score in range(100):
+        small.render(f"Score: {score}", 36, (255, 255, 255))
+    assert 0 < small.bytes <= 20000
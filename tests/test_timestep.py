@@ -0,0 +1,39 @@
+"""
+Tests for the fixed-timestep scheduler
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from game.player import Player
+from utils.timestep import FixedTimestep
+
+def test_ticks_independent_of_frame_rate():
+    """One second of frames runs the same number of ticks at any FPS"""
+    for fps in (20, 30, 60, 144):
+        timestep = FixedTimestep(tick_rate=60)
+        ticks = sum(timestep.advance(1.0 / fps) for _ in range(fps))
+        assert abs(ticks - 60) <= 1, f"{fps} fps ran {ticks} ticks"
+
+def test_catch_up_limit():
+    """A long stall runs at most max_steps ticks and drops the rest"""
+    timestep = FixedTimestep(tick_rate=60, max_steps=5)
+    assert timestep.advance(2.0) == 5
+    assert timestep.dropped_time > 1.5
+    assert 0.0 <= timestep.alpha <= 1.0
+
+def test_alpha_tracks_leftover_time():
+    """Half a tick of leftover time gives alpha of one half"""
+    timestep = FixedTimestep(tick_rate=50)
+    assert timestep.advance(0.03) == 1
+    assert abs(timestep.alpha - 0.5) < 1e-6
+
+def test_player_interpolation():
+    """Interpolated player position lies between the last two ticks"""
+    player = Player(100, 100)
+    player.previous_position.update(player.position)
+    player.move(1, 0)
+    middle = player.interpolated_position(0.5)
+    assert middle.x == 100 + player.speed / 2
+    assert player.interpolated_position(1.0) == player.position
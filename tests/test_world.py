@@ -0,0 +1,162 @@
+"""
+Tests for the chunked world, camera and viewport culling
+"""
+import os
+import random
+import sys
+
+from pygame import Rect
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import main
+from game.controls import BotInput, InputState, ScriptedInput
+from game.snowman import Snowball, Snowman
+from game.world import BUILDING, ROLLING, Camera, ChunkedWorld, World, generate_world
+from graphics.renderer import NullRenderer
+
+BIG = 50000
+
+def setup_function():
+    global _world, _camera
+    _world, _camera = main.world, main.camera
+    main.init_game()
+
+def teardown_function():
+    main.world, main.camera = _world, _camera
+    main.init_game()
+
+def use_world(world):
+    main.world = world
+    main.camera = Camera(main.WIDTH, main.HEIGHT, world)
+
+def test_zone_lookup_matches_brute_force():
+    """zone_at agrees with checking every zone"""
+    world = generate_world(BIG, BIG, seed=3)
+    assert len(world.zones) > 1000
+    rng = random.Random(0)
+    for _ in range(500):
+        point = (rng.uniform(0, BIG), rng.uniform(0, BIG))
+        expected = [zone for zone in world.zones if zone.rect.collidepoint(point)]
+        assert world.zone_at(point) is (expected[0] if expected else None)
+        kind = expected[0].kind if expected else None
+        assert world.rolling_zone.collidepoint(point) == (kind == ROLLING)
+        assert world.building_zone.collidepoint(point) == (kind == BUILDING)
+
+def test_nearest_zone():
+    """nearest_zone finds the closest zone of a kind"""
+    world = ChunkedWorld(10000, 10000, chunk_size=500)
+    near = world.add_zone(ROLLING, (1000, 1000, 100, 100))
+    world.add_zone(ROLLING, (8000, 8000, 100, 100))
+    world.add_zone(BUILDING, (1100, 1000, 100, 100))
+    assert world.nearest_zone(ROLLING, (1500, 1500)) is near
+    assert world.nearest_zone(BUILDING, (9000, 9000)).rect.topleft == (1100, 1000)
+    assert ChunkedWorld(100, 100).nearest_zone(ROLLING, (0, 0)) is None
+
+def test_single_screen_world_keeps_its_zones():
+    """World is a one-chunk ChunkedWorld with the two classic zones"""
+    world = World(800, 600)
+    assert len(world.chunks) == 1
+    assert world.nearest_zone(ROLLING, (700, 300)).rect is world.rolling_zone
+    assert world.nearest_zone(BUILDING, (100, 300)).rect is world.building_zone
+    assert [zone.label for zone in world.zones_in(Rect(0, 0, 800, 600))] == ["SNOWBALL", "SNOWMAN"]
+
+def test_balls_in_culls_to_view():
+    """Only balls near the view are returned, in placement order"""
+    world = ChunkedWorld(BIG, BIG, chunk_size=1024)
+    rng = random.Random(1)
+    balls = []
+    for _ in range(5000):
+        ball = Snowball(rng.uniform(0, 4000), rng.uniform(0, 4000))
+        world.add_ball(ball)
+        balls.append(ball)
+    view = Rect(1500, 1500, 800, 600)
+    area = view.inflate(100, 100)
+    expected = [ball for ball in balls if area.collidepoint(ball.position)]
+    assert world.balls_in(view, 50) == expected
+    world.remove_ball(expected[0])
+    assert world.balls_in(view, 50) == expected[1:]
+
+def test_snowman_shares_its_base_chunk():
+    """Stacked balls are filed with their base, across chunk borders"""
+    world = ChunkedWorld(4000, 4000, chunk_size=100)
+    base = Snowball(150, 105)
+    base.size = 50
+    top = Snowball(150, 40)
+    Snowman(base).add_ball(top)
+    world.add_ball(base)
+    world.add_ball(top, top.stacked_on)
+    assert world.chunk_of[top] is world.chunk_of[base]
+
+def test_camera_follows_within_world():
+    """The camera centres on a point but never shows outside the world"""
+    world = ChunkedWorld(BIG, BIG)
+    camera = Camera(800, 600, world)
+    camera.follow((20000, 30000))
+    assert camera.rect.center == (20000, 30000)
+    assert camera.to_screen((20000, 30000)) == (400, 300)
+    assert camera.to_world((400, 300)) == (20000, 30000)
+    camera.follow((10, BIG - 10))
+    assert camera.rect.topleft == (0, BIG - 600)
+    classic = Camera(800, 600, World(800, 600))
+    classic.follow((700, 50))
+    assert classic.offset == (0, 0)
+
+def test_far_chunks_stop_simulating():
+    """Balls leave the store when the player walks away and return on the way back"""
+    world = ChunkedWorld(BIG, BIG, chunk_size=1024)
+    world.add_zone(ROLLING, (0, 0, BIG, BIG))
+    use_world(world)
+    main.start_game()
+    main.player.position.update(1000, 1000)
+    ball = Snowball(1100, 1000)
+    main.add_placed_snowball(ball)
+    assert ball._store is main.snowball_store
+    main.player.speed = 500
+    main.run_simulation(ScriptedInput([InputState(dx=1)] * 10), NullRenderer())
+    assert ball._store is None
+    assert main.placed_snowballs == [ball]
+    main.run_simulation(ScriptedInput([InputState(dx=-1)] * 10), NullRenderer())
+    assert ball._store is main.snowball_store
+
+def test_draw_cost_follows_view_not_world():
+    """A full world draws no more than what is on screen"""
+    use_world(generate_world(BIG, BIG, seed=2))
+    main.start_game()
+    main.player.position.update(25000, 25000)
+    rng = random.Random(4)
+    for _ in range(20000):
+        main.add_placed_snowball(Snowball(rng.uniform(0, BIG), rng.uniform(0, BIG)))
+    for _ in range(50):
+        main.add_placed_snowball(Snowball(rng.uniform(24700, 25300), rng.uniform(24800, 25200)))
+    items = main.game_drawables()
+    balls = [key for key, _, _ in items if isinstance(key, Snowball)]
+    assert 50 <= len(balls) < 100
+    margin = main.VIEW_MARGIN + 70
+    assert all(rect.colliderect(Rect(0, 0, 800, 600).inflate(2 * margin, 2 * margin)) for _, rect, _ in items)
+    assert len(main.snowball_store) < 100  # Only the chunks around the camera are simulated
+
+def test_bot_plays_a_large_world():
+    """The headless bot works the zones nearest to it on a generated world"""
+    use_world(generate_world(BIG, BIG, seed=5))
+    main.start_game()
+    main.player.position.update(20000, 20000)
+    bot = BotInput(main.world, main.player.position, seed=5)
+    main.run_simulation(bot, NullRenderer(), 5000, keep_playing=True)
+    assert len(main.placed_snowballs) > 5
+    for ball in main.placed_snowballs:
+        assert main.world.building_zone.collidepoint(ball.position) or ball.stacked_on
+
+def test_snow_is_kept_only_near_the_camera():
+    """Rolling zones left behind lose their snow fields, so exploring costs no more memory"""
+    use_world(generate_world(BIG, BIG, seed=5))
+    main.start_game()
+    visited = 0
+    for x in range(1000, 20000, 1600):
+        main.player.position.update(x, 600)
+        main.run_simulation(ScriptedInput([InputState(dy=1, roll=True)] * 5), NullRenderer())
+        visited += main.snow_terrain_at(main.player.position) is not None
+    assert visited > 3
+    area = main.camera.rect.inflate(2 * main.world.active_margin, 2 * main.world.active_margin)
+    assert 0 < len(main.snow_fields) < visited
+    assert all(zone.rect.colliderect(area) for zone in main.snow_fields)